@@ -0,0 +1,117 @@
+"""
+Micro-benchmark of the inventory diff used by get-data-to-pull and get-game-data.
+
+Compares the original list based `not in` filtering with InventoryIndex, and
+the per-season player arrays merged with unique_ids, at roughly the current
+inventory size (40k games, 5k players).
+
+Run with: python scripts/benchmark_inventory_diff.py
+"""
+
+import random
+from timeit import timeit
+
+import numpy as np
+
+from nba_data_pull.inventory.inventory_index import InventoryIndex, unique_ids
+
+N_GAMES = 40_000
+N_PLAYERS = 5_000
+N_SEASONS = 35
+REPEAT = 5
+
+
+def build_data(seed: int = 0):
+    random.seed(seed)
+    game_ids = [f"002{90 + i // 1230 % 100:02d}{i % 1230:05d}" for i in range(N_GAMES)]
+    player_ids = [str(1_600_000 + i) for i in range(N_PLAYERS)]
+
+    inventory = {
+        "GAME": {"REGULAR_SEASON": game_ids[:-1230], "PLAYOFFS": []},
+        "PLAYER": player_ids[:-500],
+    }
+
+    # One season of candidate games and one player list per season, as returned
+    # by process_seasons, with players repeating across seasons
+    season_games = game_ids[-1230:]
+    season_players = [
+        player_id
+        for _ in range(N_SEASONS)
+        for player_id in random.sample(player_ids, 450)
+    ]
+    return inventory, season_games, season_players
+
+
+def list_diff(inventory, season_games, season_players):
+    games = [
+        game_id
+        for game_id in season_games
+        if game_id not in inventory["GAME"]["REGULAR_SEASON"]
+    ]
+    players = [
+        player_id
+        for player_id in season_players
+        if player_id not in inventory["PLAYER"]
+    ]
+    return games, players
+
+
+def index_diff(inventory, season_games, season_players):
+    index = InventoryIndex(inventory)
+    games = index.missing(("GAME", "REGULAR_SEASON"), season_games)
+    players = index.missing(("PLAYER",), season_players)
+    return games, players
+
+
+def season_arrays(season_players):
+    """Per-season int64 player arrays, as returned by process_seasons"""
+    return {
+        str(season): np.asarray(
+            season_players[season * 450 : (season + 1) * 450], dtype=np.int64
+        )
+        for season in range(N_SEASONS)
+    }
+
+
+def array_diff(inventory, season_games, players_by_season):
+    index = InventoryIndex(inventory)
+    games = index.missing(("GAME", "REGULAR_SEASON"), season_games)
+    players = index.missing_ids(("PLAYER",), unique_ids(players_by_season))
+    return games, players
+
+
+def main():
+    inventory, season_games, season_players = build_data()
+
+    list_games, list_players = list_diff(inventory, season_games, season_players)
+    index_games, index_players = index_diff(inventory, season_games, season_players)
+    assert list_games == index_games
+    assert sorted(set(list_players)) == sorted(index_players)
+    players_by_season = season_arrays(season_players)
+    array_games, array_players = array_diff(inventory, season_games, players_by_season)
+    assert index_games == array_games
+    assert index_players == array_players
+
+    list_time = timeit(
+        lambda: list_diff(inventory, season_games, season_players), number=REPEAT
+    )
+    index_time = timeit(
+        lambda: index_diff(inventory, season_games, season_players), number=REPEAT
+    )
+
+    array_time = timeit(
+        lambda: array_diff(inventory, season_games, players_by_season), number=REPEAT
+    )
+
+    print(f"{N_GAMES} games / {N_PLAYERS} players, {len(season_players)} candidates")
+    print(f"list diff:  {list_time / REPEAT * 1000:10.1f} ms")
+    print(f"index diff: {index_time / REPEAT * 1000:10.1f} ms (includes building)")
+    print(f"array diff: {array_time / REPEAT * 1000:10.1f} ms (includes building)")
+    print(
+        f"speedup:    {list_time / index_time:10.1f}x index, "
+        f"{list_time / array_time:.1f}x array"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
+import hashlib
 import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from time import monotonic
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from dotenv import load_dotenv
+from loguru import logger
 from tqdm import tqdm
+from typing_extensions import Optional
 
 load_dotenv()
 
@@ -12,33 +19,155 @@ BUCKET_NAME = os.getenv("BUCKET_NAME")
 LOCAL_FOLDER = Path("data/")  # Path to the local folder
 S3_PREFIX = "data/"  # Path in S3 (acts like a root "folder")
 
-s3 = boto3.client("s3")
+WORKERS = 16  # Files uploading at the same time
+WINDOW = 64  # Files queued or uploading before the walk waits
+CHUNK_SIZE = 8 * 1024**2  # Multipart threshold and part size, also used for ETags
 
+s3 = boto3.client("s3", config=Config(max_pool_connections=WORKERS))
+transfer_config = TransferConfig(
+    multipart_threshold=CHUNK_SIZE, multipart_chunksize=CHUNK_SIZE, use_threads=False
+)
 
-def upload_folder_to_s3(local_folder: Path, bucket_name: str, s3_prefix: str = ""):
+
+def walk_folders(folder: Path):
+    """
+    Yields each folder under a folder (itself included) with the files
+    directly in it, in a single pass, skipping hidden files.
+
+    :return: Iterator of (folder, [(file, size), ...]).
+    """
+    files = []
+    sub_folders = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                sub_folders.append(Path(entry.path))
+            elif entry.is_file() and not entry.name.startswith("."):
+                files.append((Path(entry.path), entry.stat().st_size))
+
+    yield folder, files
+    for sub_folder in sub_folders:
+        yield from walk_folders(sub_folder)
+
+
+def list_existing(bucket_name: str, s3_prefix: str) -> dict:
+    """
+    Lists the size and ETag of the objects directly under a prefix (not in its
+    sub folders).
+    """
+    existing = {}
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=s3_prefix, Delimiter="/"):
+        for obj in page.get("Contents", []):
+            existing[obj["Key"]] = (obj["Size"], obj["ETag"].strip('"'))
+    return existing
+
+
+def local_etag(file: Path, size: int) -> str:
+    """
+    Computes the ETag S3 gives a file uploaded with `transfer_config`.
+    Multipart ETags are the md5 of the part md5s followed by the part count.
+    """
+    part_hashes = []
+    with open(file, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            part_hashes.append(hashlib.md5(chunk).digest())
+
+    if size < CHUNK_SIZE:
+        return part_hashes[0].hex() if part_hashes else hashlib.md5().hexdigest()
+    return f"{hashlib.md5(b''.join(part_hashes)).hexdigest()}-{len(part_hashes)}"
+
+
+def upload_file(
+    file: Path, size: int, bucket_name: str, s3_key: str, remote: Optional[tuple] = None
+) -> bool:
+    """
+    Uploads a file unless an object with the same size and ETag is already in S3.
+
+    :param remote: (size, ETag) of the object already at the key, if any.
+    :return: True if the file was uploaded, False if it was skipped.
+    """
+    if remote is not None and remote[0] == size and remote[1] == local_etag(file, size):
+        return False
+
+    s3.upload_file(str(file), bucket_name, s3_key, Config=transfer_config)
+    return True
+
+
+def upload_folder_to_s3(
+    local_folder: Path,
+    bucket_name: str,
+    s3_prefix: str = "",
+    workers: int = WORKERS,
+    window: int = WINDOW,
+):
     """
     Uploads all files in a folder to S3, preserving directory structure.
 
+    Files are streamed from a single walk of the folder to a pool of upload
+    threads, and at most `window` files are queued or in flight. Existing
+    objects are listed one folder at a time as the walk reaches it, so memory
+    grows with the largest folder rather than with the whole bucket. Files
+    already in S3 with the same size and ETag are skipped.
+
     :param local_folder: Path object pointing to the local folder.
     :param bucket_name: Name of the S3 bucket.
     :param s3_prefix: Folder path inside S3.
+    :param workers: Number of files uploading at the same time.
+    :param window: Maximum number of files queued or uploading.
     """
+    stats = {"uploaded": 0, "skipped": 0, "failed": 0, "bytes": 0}
+    progress_bar = tqdm(desc="Progress", unit="B", unit_scale=True)
+    start = monotonic()
 
-    total_tasks = len(list(local_folder.rglob("*")))
-    progress_bar = tqdm(total=total_tasks, desc="Progress", unit="task")
+    def collect(done):
+        for future in done:
+            file, size = in_flight.pop(future)
+            try:
+                uploaded = future.result()
+            except Exception as e:
+                logger.error(f"Upload failed for {file} - {e}")
+                stats["failed"] += 1
+                continue
+            if uploaded:
+                stats["uploaded"] += 1
+                stats["bytes"] += size
+            else:
+                stats["skipped"] += 1
+            progress_bar.update(size)
 
-    for file in local_folder.rglob("*"):  # Recursively find all files
-        if file.is_file():  # Ignore directories
-            if file.name.startswith("."):
-                progress_bar.update(1)
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for folder, files in walk_folders(local_folder):
+            if not files:
                 continue
-            # Generate S3 key (relative path in S3)
-            s3_key = f"{s3_prefix}{file.relative_to(local_folder).as_posix()}"
+            relative = folder.relative_to(local_folder).as_posix()
+            folder_prefix = s3_prefix if relative == "." else f"{s3_prefix}{relative}/"
+            existing = list_existing(bucket_name, folder_prefix)
+
+            for file, size in files:
+                if len(in_flight) >= window:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+                # Generate S3 key (relative path in S3)
+                s3_key = f"{folder_prefix}{file.name}"
+                future = executor.submit(
+                    upload_file, file, size, bucket_name, s3_key, existing.get(s3_key)
+                )
+                in_flight[future] = (file, size)
+
+        collect(wait(in_flight).done)
 
-            # Upload the file to S3
-            s3.upload_file(str(file), bucket_name, s3_key)
-            progress_bar.set_description(f"Uploaded {file.name}")
-            progress_bar.update(1)
+    progress_bar.close()
+    elapsed = monotonic() - start
+    logger.info(
+        f"Uploaded {stats['uploaded']} files ({stats['bytes'] / 1024**2:.1f} MB), "
+        f"skipped {stats['skipped']}, failed {stats['failed']} in {elapsed:.1f}s "
+        f"({stats['bytes'] / 1024**2 / max(elapsed, 1e-9):.1f} MB/s, "
+        f"{stats['uploaded'] / max(elapsed, 1e-9):.1f} files/s)"
+    )
+    return stats
 
 
 if __name__ == "__main__":
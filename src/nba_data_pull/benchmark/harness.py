@@ -0,0 +1,367 @@
+import json
+import tempfile
+from pathlib import Path
+from time import monotonic
+
+import typer
+from loguru import logger
+from nba_api.stats.static import players as static_players
+from typing_extensions import Annotated, Dict, List, Optional
+
+from nba_data_pull.benchmark.replay import (
+    LocalS3Client,
+    RecordingSession,
+    ReplaySession,
+    use_session,
+)
+from nba_data_pull.data_pull.dataingest import PlayerIngest, SeasonIngest
+from nba_data_pull.data_pull.get_data import pull_games
+from nba_data_pull.data_pull.metrics import MetricsCollector
+from nba_data_pull.data_pull.pacing import Pacer, PacingPolicy, build_pacer
+from nba_data_pull.data_pull.s3_writer import S3Writer
+from nba_data_pull.data_pull.scheduler import TaskScheduler
+from nba_data_pull.data_pull.schemas import OutputFormat
+from nba_data_pull.inventory.endpoint_inventory import build_endpoint_inventory
+
+app = typer.Typer()
+
+BUCKET = "benchmark"
+RECORDINGS_PATH = Path("data/benchmark/recordings")
+STAGES = ("game", "season", "player", "inventory")
+# Recorded by `record` and replayed by `run` when no ids are passed
+RECORD_GAME_IDS = ("0022400001",)
+RECORD_SEASONS = ("2024",)
+RECORD_PLAYER_IDS = (2544,)
+REPLAY_SEASONS = ("2022", "2023", "2024")
+
+
+def synthetic_game_ids(count: int, season_year: int = 2024) -> List[str]:
+    """Regular season game ids, e.g. 0022400001, served by substituted recordings"""
+    return [f"002{str(season_year)[-2:]}{i:05d}" for i in range(1, count + 1)]
+
+
+def stage_report(
+    wall_seconds: float,
+    entities: int,
+    writer: S3Writer,
+    metrics: Optional[MetricsCollector] = None,
+) -> Dict:
+    """
+    Throughput of a stage, plus time per step summed over every endpoint when
+    the stage has metrics.
+    """
+    uploads = writer.stats()
+    report = {
+        "wall_seconds": round(wall_seconds, 3),
+        "entities": entities,
+        "files": uploads["files"],
+        "bytes": uploads["bytes"],
+        "entities_per_second": round(entities / max(wall_seconds, 1e-9), 3),
+        "files_per_second": round(uploads["files"] / max(wall_seconds, 1e-9), 3),
+        "mb_per_second": round(uploads["bytes"] / 1024**2 / max(wall_seconds, 1e-9), 3),
+        "failed_uploads": uploads["failed"],
+    }
+    if metrics is not None:
+        run = metrics.report(writer.upload_times, writer.failed)
+        endpoints = run["endpoints"].values()
+        for key in ("api_seconds", "serialize_seconds", "upload_seconds"):
+            report[key] = round(sum(row[key] for row in endpoints), 3)
+        report["errors"] = sum(
+            count
+            for row in endpoints
+            for outcome, count in row["outcomes"].items()
+            if outcome != "ok"
+        )
+    return report
+
+
+def run_game_stage(
+    game_ids: List[str],
+    s3_client,
+    pacer: Pacer,
+    output_format: OutputFormat,
+    workers: int,
+    upload_workers: int,
+) -> Dict:
+    metrics = MetricsCollector("GAME")
+    writer = S3Writer(s3_client=s3_client, workers=upload_workers)
+    start = monotonic()
+    pull_games(
+        game_ids,
+        save_folder=f"s3://{BUCKET}/data/nba/GAME/REGULAR_SEASON",
+        workers=workers,
+        pacer=pacer,
+        output_format=output_format,
+        writer=writer,
+        metrics=metrics,
+    )
+    writer.flush()
+    report = stage_report(monotonic() - start, len(game_ids), writer, metrics)
+    writer.close()
+    return report
+
+
+def run_season_stage(
+    season_years: List[str],
+    s3_client,
+    pacer: Pacer,
+    output_format: OutputFormat,
+    workers: int,
+    upload_workers: int,
+    endpoints: Optional[List[str]] = None,
+) -> Dict:
+    metrics = MetricsCollector("SEASON")
+    writer = S3Writer(s3_client=s3_client, workers=upload_workers)
+    start = monotonic()
+    tasks = []
+    for season_year in season_years:
+        season_ingest = SeasonIngest(
+            season_year=season_year,
+            save_folder=f"s3://{BUCKET}/data/nba/SEASON/PER_GAME/REGULAR_SEASON",
+            pacer=pacer,
+            output_format=output_format,
+            writer=writer,
+            endpoints=endpoints,
+            metrics=metrics,
+        )
+        tasks.extend(season_ingest.endpoint_tasks())
+    TaskScheduler(workers=workers).run(tasks, description="Replaying seasons")
+    writer.flush()
+    report = stage_report(monotonic() - start, len(season_years), writer, metrics)
+    writer.close()
+    return report
+
+
+def run_player_stage(
+    player_ids: List[int],
+    s3_client,
+    pacer: Pacer,
+    output_format: OutputFormat,
+    upload_workers: int,
+) -> Dict:
+    metrics = MetricsCollector("PLAYER")
+    writer = S3Writer(s3_client=s3_client, workers=upload_workers)
+    start = monotonic()
+    for player_id in player_ids:
+        PlayerIngest(
+            player=player_id,
+            save_folder=f"s3://{BUCKET}/data/nba/PLAYER",
+            pacer=pacer,
+            output_format=output_format,
+            writer=writer,
+            metrics=metrics,
+        ).save_all()
+    writer.flush()
+    report = stage_report(monotonic() - start, len(player_ids), writer, metrics)
+    writer.close()
+    return report
+
+
+def run_inventory_stage(s3_client) -> Dict:
+    start = monotonic()
+    inventory = build_endpoint_inventory(BUCKET, "data/nba/", s3_client)
+    wall_seconds = monotonic() - start
+
+    def count(node):
+        if isinstance(node, list):
+            return 1
+        return sum(count(value) for value in node.values())
+
+    entities = count(inventory)
+    return {
+        "wall_seconds": round(wall_seconds, 3),
+        "entities": entities,
+        "entities_per_second": round(entities / max(wall_seconds, 1e-9), 3),
+    }
+
+
+def compare(report: Dict, baseline: Dict, max_slowdown: float) -> List[str]:
+    """
+    Returns the stages whose throughput dropped more than `max_slowdown`
+    (a fraction) below the baseline report.
+    """
+    regressions = []
+    for stage, row in report["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before or not before.get("entities_per_second"):
+            continue
+        ratio = row["entities_per_second"] / before["entities_per_second"]
+        if ratio < 1 - max_slowdown:
+            regressions.append(
+                f"{stage}: {row['entities_per_second']} entities/s, "
+                f"baseline {before['entities_per_second']} ({ratio:.0%})"
+            )
+    return regressions
+
+
+@app.command()
+def record(
+    game_ids: Annotated[
+        Optional[List[str]],
+        typer.Option(
+            "--game-id", help=f"Games to record. Defaults to {RECORD_GAME_IDS[0]}"
+        ),
+    ] = None,
+    season_years: Annotated[
+        Optional[List[str]],
+        typer.Option(
+            "--season", help=f"Seasons to record. Defaults to {RECORD_SEASONS[0]}"
+        ),
+    ] = None,
+    player_ids: Annotated[
+        Optional[List[int]],
+        typer.Option(
+            "--player-id", help=f"Players to record. Defaults to {RECORD_PLAYER_IDS[0]}"
+        ),
+    ] = None,
+    recordings_path: Annotated[
+        Path, typer.Option(help="Folder to save recorded responses in")
+    ] = RECORDINGS_PATH,
+    requests_per_second: Annotated[
+        float, typer.Option(help="Request rate against the live API")
+    ] = 1.0,
+):
+    """
+    Records live API responses for a few games, seasons and players so the
+    benchmark can replay them offline.
+    """
+    game_ids = game_ids or list(RECORD_GAME_IDS)
+    season_years = season_years or list(RECORD_SEASONS)
+    player_ids = player_ids or list(RECORD_PLAYER_IDS)
+    session = RecordingSession(recordings_path)
+    pacer = build_pacer(PacingPolicy.aimd, requests_per_second)
+    with tempfile.TemporaryDirectory() as s3_root, use_session(session):
+        s3 = LocalS3Client(s3_root)
+        run_game_stage(game_ids, s3, pacer, OutputFormat.csv, 1, 1)
+        run_season_stage(season_years, s3, pacer, OutputFormat.csv, 1, 1)
+        run_player_stage(player_ids, s3, pacer, OutputFormat.csv, 1)
+    logger.info(f"Recorded {session.recorded} responses to {recordings_path}")
+
+
+@app.command()
+def run(
+    recordings_path: Annotated[
+        Path, typer.Option(help="Folder of recorded responses")
+    ] = RECORDINGS_PATH,
+    games: Annotated[int, typer.Option(help="Number of games to replay")] = 50,
+    season_years: Annotated[
+        Optional[List[str]],
+        typer.Option(
+            "--season",
+            help=f"Seasons to replay. Defaults to {', '.join(REPLAY_SEASONS)}",
+        ),
+    ] = None,
+    players: Annotated[int, typer.Option(help="Number of players to replay")] = 20,
+    stages: Annotated[
+        Optional[List[str]],
+        typer.Option(
+            "--stage", help=f"Stages to run: {', '.join(STAGES)}. Defaults to all"
+        ),
+    ] = None,
+    latency_ms: Annotated[
+        float, typer.Option(help="Synthetic API latency per request")
+    ] = 0.0,
+    jitter_ms: Annotated[
+        float, typer.Option(help="Random extra API latency, up to this much")
+    ] = 0.0,
+    s3_latency_ms: Annotated[
+        float, typer.Option(help="Synthetic S3 latency per request")
+    ] = 0.0,
+    requests_per_second: Annotated[
+        float, typer.Option(help="Pacing budget shared by all workers")
+    ] = 1000.0,
+    workers: Annotated[
+        int, typer.Option(help="Games or season endpoints pulled at the same time")
+    ] = 4,
+    upload_workers: Annotated[
+        int, typer.Option(help="Number of background upload threads")
+    ] = 4,
+    output_format: Annotated[
+        OutputFormat, typer.Option("--format", help="File format to save data in")
+    ] = OutputFormat.csv,
+    output: Annotated[
+        Path, typer.Option(help="Path to save the benchmark report")
+    ] = Path("data/benchmark/report.json"),
+    baseline: Annotated[
+        Optional[Path],
+        typer.Option(help="Earlier report to compare throughput against"),
+    ] = None,
+    max_slowdown: Annotated[
+        float,
+        typer.Option(help="Fail if a stage is this much slower than the baseline"),
+    ] = 0.2,
+):
+    """
+    Replays recorded responses through the real ingest code against a local
+    S3 stand-in and reports throughput and time per step for each stage.
+    """
+    season_years = season_years or list(REPLAY_SEASONS)
+    stages = stages or list(STAGES)
+    session = ReplaySession(
+        recordings_path, latency=latency_ms / 1000, jitter=jitter_ms / 1000
+    )
+    pacer = build_pacer(PacingPolicy.bucket, requests_per_second)
+    # Static player list shipped with nba_api, so no request is made
+    player_ids = [player["id"] for player in static_players.get_active_players()]
+    player_ids = player_ids[:players]
+
+    report = {"stages": {}}
+    report["settings"] = {
+        "games": games,
+        "seasons": season_years,
+        "players": len(player_ids),
+        "latency_ms": latency_ms,
+        "jitter_ms": jitter_ms,
+        "s3_latency_ms": s3_latency_ms,
+        "workers": workers,
+        "upload_workers": upload_workers,
+        "format": output_format.value,
+    }
+
+    with tempfile.TemporaryDirectory() as s3_root, use_session(session):
+        s3 = LocalS3Client(s3_root, latency=s3_latency_ms / 1000)
+        if "game" in stages:
+            logger.info(f"Replaying {games} games")
+            report["stages"]["game"] = run_game_stage(
+                synthetic_game_ids(games),
+                s3,
+                pacer,
+                output_format,
+                workers,
+                upload_workers,
+            )
+        if "season" in stages:
+            logger.info(f"Replaying {len(season_years)} seasons")
+            report["stages"]["season"] = run_season_stage(
+                season_years, s3, pacer, output_format, workers, upload_workers
+            )
+        if "player" in stages:
+            logger.info(f"Replaying {len(player_ids)} players")
+            report["stages"]["player"] = run_player_stage(
+                player_ids, s3, pacer, output_format, upload_workers
+            )
+        if "inventory" in stages:
+            logger.info("Listing the replayed files")
+            report["stages"]["inventory"] = run_inventory_stage(s3)
+
+    report["replay"] = session.stats()
+    report["pacing"] = pacer.stats()
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    for stage, row in report["stages"].items():
+        logger.info(f"{stage}: {row}")
+    logger.info(f"Saved benchmark report to {output}")
+
+    if baseline is not None:
+        regressions = compare(
+            report, json.loads(Path(baseline).read_text()), max_slowdown
+        )
+        for regression in regressions:
+            logger.error(f"Throughput regression - {regression}")
+        if regressions:
+            raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,277 @@
+import gzip
+import hashlib
+import io
+import json
+import random
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from time import sleep
+from urllib.parse import urlencode, urlparse
+
+import nbastatpy.season
+import requests
+from typing_extensions import Dict, List, Optional
+
+from nba_data_pull.data_pull.http_session import install_session
+
+
+def endpoint_name(url: str) -> str:
+    """
+    Name recordings are grouped under, e.g. leaguegamelog for
+    https://stats.nba.com/stats/leaguegamelog or hoopshype.com_salaries.
+    """
+    parsed = urlparse(url)
+    parts = [part for part in parsed.path.split("/") if part]
+    if parsed.netloc.endswith("nba.com"):
+        return parts[-1].lower()
+    return f"{parsed.netloc}_{parts[0] if parts else ''}"
+
+
+def recording_key(url: str, params=None) -> str:
+    """
+    File name of the recording of one request: endpoint name plus a hash of the
+    url path and sorted parameters.
+    """
+    parsed = urlparse(url)
+    items = sorted(dict(params or {}).items())
+    digest = hashlib.md5(
+        f"{parsed.path}?{urlencode(items)}".encode("utf-8")
+    ).hexdigest()
+    return f"{endpoint_name(url)}-{digest[:16]}"
+
+
+class ReplayResponse:
+    """The parts of requests.Response read by nba_api and nbastatpy"""
+
+    def __init__(self, url: str, text: str, status_code: int = 200):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+
+    @property
+    def content(self) -> bytes:
+        return self.text.encode("utf-8")
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class RecordingSession:
+    """
+    Passes requests through to a real session and saves every response as
+    <recordings_dir>/<recording_key>.json.gz so it can be replayed later.
+    """
+
+    def __init__(
+        self, recordings_dir: Path, session: Optional[requests.Session] = None
+    ):
+        self.recordings_dir = Path(recordings_dir)
+        self.recordings_dir.mkdir(parents=True, exist_ok=True)
+        self.session = session or requests.Session()
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, **kwargs):
+        response = self.session.get(url, params=params, **kwargs)
+        if response.status_code == 200:
+            record = {"url": response.url, "text": response.text}
+            path = self.recordings_dir / f"{recording_key(url, params)}.json.gz"
+            path.write_bytes(gzip.compress(json.dumps(record).encode("utf-8")))
+            with self._lock:
+                self.recorded += 1
+        return response
+
+
+class ReplaySession:
+    """
+    Serves recorded responses instead of calling the API.
+
+    A request without an exact recording gets a recording of the same endpoint
+    for other parameters, so one recorded game or season can stand in for any
+    number of ids.
+
+    :param recordings_dir: Folder written by RecordingSession.
+    :param latency: Seconds every request sleeps, to mimic the API.
+    :param jitter: Extra random seconds added to the latency, up to this much.
+    :param seed: Seed for the jitter.
+    """
+
+    def __init__(
+        self,
+        recordings_dir: Path,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: int = 0,
+    ):
+        self.recordings_dir = Path(recordings_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+
+        self.by_endpoint: Dict[str, List[Path]] = {}
+        for path in sorted(self.recordings_dir.glob("*.json.gz")):
+            endpoint = path.name[: -len(".json.gz")].rsplit("-", 1)[0]
+            self.by_endpoint.setdefault(endpoint, []).append(path)
+        if not self.by_endpoint:
+            raise FileNotFoundError(f"No recordings in {self.recordings_dir}")
+
+        self.exact = 0
+        self.substituted = 0
+        self._lock = threading.Lock()
+        self._loaded: Dict[Path, str] = {}
+
+    def _load(self, path: Path) -> str:
+        with self._lock:
+            if path not in self._loaded:
+                record = json.loads(gzip.decompress(path.read_bytes()))
+                self._loaded[path] = record["text"]
+            return self._loaded[path]
+
+    def get(self, url, params=None, **kwargs):
+        key = recording_key(url, params)
+        path = self.recordings_dir / f"{key}.json.gz"
+        if path.exists():
+            with self._lock:
+                self.exact += 1
+        else:
+            candidates = self.by_endpoint.get(endpoint_name(url))
+            if not candidates:
+                raise KeyError(f"No recording for {endpoint_name(url)}")
+            with self._lock:
+                self.substituted += 1
+                path = candidates[self.substituted % len(candidates)]
+
+        with self._lock:
+            delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay:
+            sleep(delay)
+        return ReplayResponse(url, self._load(path))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "endpoints": len(self.by_endpoint),
+                "exact": self.exact,
+                "substituted": self.substituted,
+            }
+
+
+class _SessionRequests:
+    """Stands in for the requests module nbastatpy.season calls get on"""
+
+    def __init__(self, session):
+        self.get = session.get
+
+
+@contextmanager
+def use_session(session):
+    """
+    Routes nba_api requests, and the plain requests.get nbastatpy uses for
+    salaries, through a recording or replay session.
+    """
+    previous = install_session(session)
+    previous_requests = nbastatpy.season.requests
+    nbastatpy.season.requests = _SessionRequests(session)
+    try:
+        yield session
+    finally:
+        nbastatpy.season.requests = previous_requests
+        install_session(previous)
+
+
+class NoSuchKey(KeyError):
+    pass
+
+
+class _Exceptions:
+    """The client.exceptions classes the pipeline catches"""
+
+    NoSuchKey = NoSuchKey
+
+
+class _Paginator(ABC):
+    def __init__(self, client: "LocalS3Client"):
+        self.client = client
+
+    @abstractmethod
+    def paginate(self, **kwargs):
+        pass
+
+
+class _ListObjectsPaginator(_Paginator):
+    def paginate(self, Bucket: str, Prefix: str = "", PaginationConfig=None):
+        page_size = (PaginationConfig or {}).get("PageSize", 1000)
+        keys = self.client.list_keys(Bucket, Prefix)
+        for start in range(0, len(keys), page_size):
+            contents = [
+                {"Key": key, "Size": self.client.path(Bucket, key).stat().st_size}
+                for key in keys[start : start + page_size]
+            ]
+            sleep(self.client.latency)
+            yield {"Contents": contents, "KeyCount": len(contents)}
+        if not keys:
+            yield {"KeyCount": 0}
+
+
+PAGINATORS = {"list_objects_v2": _ListObjectsPaginator}
+
+
+class LocalS3Client:
+    """
+    Stand-in for a boto3 S3 client that keeps objects under a local folder
+    (<root>/<bucket>/<key>). Covers the calls the pipeline makes: uploads,
+    put/get object and list_objects_v2 pagination.
+
+    :param root: Folder objects are stored under.
+    :param latency: Seconds every request sleeps, to mimic S3.
+    """
+
+    def __init__(self, root: Path, latency: float = 0.0):
+        self.root = Path(root)
+        self.latency = latency
+        self.exceptions = _Exceptions
+
+    def path(self, bucket: str, key: str) -> Path:
+        return self.root / bucket / key
+
+    def _write(self, bucket: str, key: str, body: bytes) -> None:
+        sleep(self.latency)
+        path = self.path(bucket, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+
+    def upload_fileobj(self, fileobj, bucket: str, key: str, Config=None, **kwargs):
+        self._write(bucket, key, fileobj.read())
+
+    def put_object(self, Bucket: str, Key: str, Body, **kwargs):
+        if isinstance(Body, str):
+            Body = Body.encode("utf-8")
+        elif not isinstance(Body, bytes):
+            Body = Body.read()
+        self._write(Bucket, Key, Body)
+        return {}
+
+    def get_object(self, Bucket: str, Key: str, **kwargs):
+        sleep(self.latency)
+        path = self.path(Bucket, Key)
+        if not path.is_file():
+            raise NoSuchKey(Key)
+        return {"Body": io.BytesIO(path.read_bytes())}
+
+    def list_keys(self, bucket: str, prefix: str = "") -> List[str]:
+        bucket_root = self.root / bucket
+        if not bucket_root.exists():
+            return []
+        keys = (
+            path.relative_to(bucket_root).as_posix()
+            for path in bucket_root.rglob("*")
+            if path.is_file()
+        )
+        return sorted(key for key in keys if key.startswith(prefix))
+
+    def get_paginator(self, operation: str) -> _Paginator:
+        if operation not in PAGINATORS:
+            raise ValueError(f"Operation cannot be paginated: {operation}")
+        return PAGINATORS[operation](self)
@@ -0,0 +1,235 @@
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import typer
+from dotenv import load_dotenv
+from loguru import logger
+from typing_extensions import TYPE_CHECKING, Annotated, Dict, List, Optional
+
+from nba_data_pull.data_pull.schemas import OutputFormat, apply_schema, serialize_table
+from nba_data_pull.inventory.endpoint_inventory import table_from_key
+from nba_data_pull.inventory.inventory_index import season_year_from_game_id
+from nba_data_pull.inventory.metadata_store import MetadataStore, MetaFormat
+from nba_data_pull.lazy_imports import lazy_import
+
+boto3 = lazy_import("boto3")
+pd = lazy_import("pandas")
+
+if TYPE_CHECKING:
+    from nba_data_pull.data_pull.s3_writer import S3Writer
+
+load_dotenv()
+
+app = typer.Typer()
+
+GAME_PREFIX = "data/nba/GAME/"
+COMPACT_PREFIX = "data/nba/COMPACT/GAME/"
+STATE_PATH = "data/meta/compaction_state.yaml"
+GAME_TYPES = ("REGULAR_SEASON", "PLAYOFFS")
+
+
+def season_prefix(game_type: str, season_year: int) -> str:
+    """
+    Prefix shared by every game folder of a season, e.g.
+    data/nba/GAME/REGULAR_SEASON/00224
+    """
+    # Game ids are 00 + game type digit + 2 digit season + game number
+    type_digit = "4" if game_type == "PLAYOFFS" else "2"
+    return f"{GAME_PREFIX}{game_type}/00{type_digit}{str(season_year)[-2:]}"
+
+
+def compacted_key(table: str, season_year: int, game_type: str) -> str:
+    """
+    Key of the compacted file for a table, partitioned hive style by season and
+    game type.
+    """
+    return (
+        f"{COMPACT_PREFIX}{table}/season={season_year}/game_type={game_type}/"
+        f"{table}.parquet"
+    )
+
+
+def list_season_files(
+    bucket: str, game_type: str, season_year: int, s3_client
+) -> Dict[str, Dict[str, str]]:
+    """
+    Lists every per-game file of a season in one flat listing.
+
+    :return: {table: {game_id: key}}
+    """
+    files: Dict[str, Dict[str, str]] = {}
+    paginator = s3_client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(
+        Bucket=bucket, Prefix=season_prefix(game_type, season_year)
+    ):
+        for obj in page.get("Contents", []):
+            parsed = table_from_key(obj["Key"], f"{GAME_PREFIX}{game_type}/")
+            if parsed is None:
+                continue
+            _, game_id, table = parsed
+            files.setdefault(table, {})[game_id] = obj["Key"]
+    return files
+
+
+def read_game_file(bucket: str, key: str, game_id: str, s3_client) -> "pd.DataFrame":
+    body = s3_client.get_object(Bucket=bucket, Key=key)["Body"].read()
+    if key.endswith(".parquet"):
+        df = pd.read_parquet(io.BytesIO(body))
+    else:
+        df = pd.read_csv(io.BytesIO(body))
+
+    # CSV drops the leading zeros of game ids, and every row belongs to this game
+    game_id_columns = [
+        c for c in df.columns if str(c).upper().replace("_", "") == "GAMEID"
+    ]
+    for column in game_id_columns:
+        df[column] = game_id
+    if not game_id_columns:
+        df.insert(0, "GAME_ID", game_id)
+    return df
+
+
+def compact_partition(
+    bucket: str,
+    table: str,
+    season_year: int,
+    game_type: str,
+    new_files: Dict[str, str],
+    compacted: bool,
+    s3_client,
+    writer: "S3Writer",
+    workers: int = 8,
+) -> int:
+    """
+    Appends newly ingested games to the compacted file of one table/season/game type.
+
+    Parquet files cannot be appended to, so the partition is rewritten with
+    the existing rows plus the new games.
+
+    :param new_files: {game_id: key} of per-game files not compacted yet.
+    :param compacted: Whether the partition already has a compacted file.
+    :return: Number of rows in the rewritten partition.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        frames = list(
+            executor.map(
+                lambda item: read_game_file(bucket, item[1], item[0], s3_client),
+                sorted(new_files.items()),
+            )
+        )
+
+    key = compacted_key(table, season_year, game_type)
+    if compacted:
+        body = s3_client.get_object(Bucket=bucket, Key=key)["Body"].read()
+        frames.insert(0, pd.read_parquet(io.BytesIO(body)))
+
+    df = apply_schema(pd.concat(frames, ignore_index=True), table)
+    writer.submit(
+        f"s3://{bucket}/{key}", serialize_table(df, table, OutputFormat.parquet)
+    )
+    return len(df)
+
+
+@app.command()
+def compact_games(
+    seasons: Annotated[
+        Optional[List[int]],
+        typer.Argument(help="Season years to compact. Defaults to every season"),
+    ] = None,
+    tables: Annotated[
+        Optional[List[str]],
+        typer.Option("--table", help="Tables to compact. Defaults to every game table"),
+    ] = None,
+    state_path: Annotated[
+        Path, typer.Option(help="Path to the compaction state")
+    ] = Path(STATE_PATH),
+    inventory_path: Annotated[Path, typer.Option(help="Path to inventory file")] = Path(
+        "data/meta/inventory.yaml"
+    ),
+    workers: Annotated[
+        int, typer.Option(help="Number of per-game files read at the same time")
+    ] = 8,
+    upload_workers: Annotated[
+        int, typer.Option(help="Number of background upload threads")
+    ] = 2,
+    meta_format: Annotated[
+        MetaFormat, typer.Option(help="Format metadata files are read and written in")
+    ] = MetaFormat.jsonl_gz,
+):
+    """
+    Merges per-game files into one parquet file per table, season and game type
+    under data/nba/COMPACT/GAME/. Only games not compacted by an earlier run are read.
+    """
+    # Imported here so --help skips nbastatpy and pandas
+    from nba_data_pull.data_pull.dataingest import GameIngest
+    from nba_data_pull.data_pull.s3_writer import S3Writer
+
+    bucket_name = os.getenv("BUCKET_NAME")
+    logger.info(f"Loaded bucket name: {bucket_name}")
+
+    tables = tables or list(GameIngest.endpoints)
+    s3 = boto3.client("s3")
+    store = MetadataStore(bucket_name, s3, fmt=meta_format)
+    writer = S3Writer(workers=upload_workers)
+
+    try:
+        state = store.load(state_path) or {}
+    except s3.exceptions.NoSuchKey:
+        logger.info("No compaction state found, compacting every game")
+        state = {}
+
+    if not seasons:
+        inventory = store.load(inventory_path)
+        seasons = sorted(
+            {
+                season_year_from_game_id(game_id)
+                for game_type in GAME_TYPES
+                for game_id in inventory.get("GAME", {}).get(game_type) or []
+            }
+        )
+
+    for season_year in seasons:
+        for game_type in GAME_TYPES:
+            files = list_season_files(bucket_name, game_type, season_year, s3)
+            for table in tables:
+                done = state.setdefault(table, {}).setdefault(str(season_year), {})
+                compacted_ids = set(done.get(game_type) or [])
+                new_files = {
+                    game_id: key
+                    for game_id, key in files.get(table, {}).items()
+                    if game_id not in compacted_ids
+                }
+                if not new_files:
+                    continue
+
+                rows = compact_partition(
+                    bucket_name,
+                    table,
+                    season_year,
+                    game_type,
+                    new_files,
+                    compacted=bool(compacted_ids),
+                    s3_client=s3,
+                    writer=writer,
+                    workers=workers,
+                )
+                logger.info(
+                    f"{table} {season_year} {game_type}: "
+                    f"{len(new_files)} new games, {rows} rows"
+                )
+                done[game_type] = sorted(compacted_ids | set(new_files))
+
+        # State is saved once the season's files are uploaded, so a failed run redoes it
+        writer.flush()
+        if writer.failed:
+            break
+        store.save(state, state_path)
+
+    logger.info(f"Upload stats: {writer.stats()}")
+    writer.close()
+
+
+if __name__ == "__main__":
+    app()
@@ -1,12 +1,33 @@
+import copy
+from abc import ABC, abstractmethod
+from functools import cached_property, partial
 from pathlib import Path
-from time import sleep
+from time import monotonic
 
+import nba_api.stats.endpoints as nba
 import pandas as pd
 from loguru import logger
+from nba_api.stats.static import players
 from nbastatpy.game import Game
 from nbastatpy.player import Player
 from nbastatpy.season import Season
+from nbastatpy.utils import Formatter, PlayTypes
 from tqdm import tqdm
+from typing_extensions import ClassVar, Dict, List, Optional
+
+from nba_data_pull.data_pull.journal import RunJournal
+from nba_data_pull.data_pull.metrics import MetricsCollector
+from nba_data_pull.data_pull.pacing import FixedPacer, Pacer
+from nba_data_pull.data_pull.response_cache import ResponseCache
+from nba_data_pull.data_pull.s3_writer import S3Writer
+from nba_data_pull.data_pull.scheduler import Task
+from nba_data_pull.data_pull.schemas import (
+    OutputFormat,
+    PlayerLayout,
+    serialize_table,
+    write_table,
+)
+from nba_data_pull.inventory.inventory_index import season_year_from_game_id
 
 
 class NBADataMappings:
@@ -48,7 +69,142 @@ class NBADataMappings:
     }
 
 
-class PlayerIngest(Player):
+class IngestMixin(ABC):
+    """
+    Shared helpers for the ingest classes. Every API call goes through `_fetch`
+    so caching, pacing, retries and latency tracking are handled in one place.
+    """
+
+    pacer: Optional[Pacer] = None
+    cache: Optional[ResponseCache] = None
+    output_format: OutputFormat = OutputFormat.csv
+    writer: Optional[S3Writer] = None
+    journal: Optional[RunJournal] = None
+    only_endpoints: Optional[set] = None
+    metrics: Optional[MetricsCollector] = None
+    # Metrics record of the save_* call in progress on this object
+    _metric: Optional[dict] = None
+
+    def _init_ingest(
+        self,
+        pacer: Optional[Pacer] = None,
+        cache: Optional[ResponseCache] = None,
+        output_format: OutputFormat = OutputFormat.csv,
+        writer: Optional[S3Writer] = None,
+        journal: Optional[RunJournal] = None,
+        endpoints: Optional[List[str]] = None,
+        metrics: Optional[MetricsCollector] = None,
+    ):
+        # Without a shared pacer, keep the original one second sleep per call
+        self.pacer = pacer if pacer is not None else FixedPacer()
+        self.cache = cache
+        self.output_format = OutputFormat(output_format)
+        self.writer = writer
+        self.journal = journal
+        # Set when only the endpoints missing from an existing folder are pulled
+        self.only_endpoints = set(endpoints) if endpoints else None
+        self.metrics = metrics
+
+    @abstractmethod
+    def _file_prefix(self) -> str:
+        """Id used as the prefix of every file saved for this entity"""
+
+    @abstractmethod
+    def _cache_params(self) -> tuple:
+        """Parameters that identify this entity's responses in the cache"""
+
+    def _cache_season_year(self):
+        """Season year used to pick the cache TTL. None means always expire."""
+        return None
+
+    def _fetch(self, getter, *args):
+        start = monotonic()
+        try:
+            if self.cache is None:
+                return self.pacer.call(getter, *args)
+
+            return self.cache.get_or_fetch(
+                endpoint=getter.__name__,
+                params=self._cache_params() + args,
+                fetch=lambda: self.pacer.call(getter, *args),
+                ttl=self.cache.ttl_for_season(self._cache_season_year()),
+            )
+        finally:
+            if self._metric is not None:
+                self._metric["api_seconds"] += monotonic() - start
+
+    def _measure(self, table: str, func, *args):
+        """
+        Runs a save_* method and records its timings and outcome. Errors are
+        recorded and re-raised so callers handle them as before. Returns what
+        the method returns.
+        """
+        if self.metrics is None:
+            return func(*args)
+
+        self._metric = MetricsCollector.new_record(self.save_folder, table)
+        try:
+            result = func(*args)
+            self._metric["outcome"] = "ok"
+            return result
+        except Exception as e:
+            self._metric["outcome"] = "error"
+            self._metric["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.metrics.record(self._metric)
+            self._metric = None
+
+    def _skip_endpoint(self, table: str) -> bool:
+        """Whether the table is not requested or a resumed run already saved it"""
+        if self.only_endpoints is not None and table not in self.only_endpoints:
+            return True
+        return self.journal is not None and self.journal.is_done(
+            self.save_folder, table
+        )
+
+    def _save(self, df: pd.DataFrame, table: str):
+        file_name = f"{self._file_prefix()}_{table}.{self.output_format.value}"
+        path = f"{self.save_folder}/{file_name}"
+        on_success = None
+        if self.journal is not None:
+            on_success = partial(self.journal.record, self.save_folder, table)
+
+        metric = self._metric
+        if metric is not None:
+            metric["rows"] = len(df)
+            metric["path"] = path
+
+        start = monotonic()
+        if self.writer is not None and self.writer.serializer is not None:
+            # Timed in the serializer process and filled in once encoded
+            self.writer.submit_frame(
+                path, df, table, self.output_format, on_success, metric
+            )
+        elif self.writer is None:
+            write_table(df, path, table, self.output_format)
+            if metric is not None:
+                # Includes the write itself, which is not timed separately
+                metric["serialize_seconds"] = monotonic() - start
+            if on_success is not None:
+                on_success()
+        else:
+            body = serialize_table(df, table, self.output_format)
+            if metric is not None:
+                metric["serialize_seconds"] = monotonic() - start
+                metric["bytes"] = len(body)
+            self.writer.submit(path, body, on_success=on_success)
+
+
+class PlayerIngest(IngestMixin, Player):
+    """
+    Pulls the files of one player.
+
+    A numeric player id is used as is. The name lookup Player does on
+    construction only runs when a name attribute is first read, so players
+    missing from nba_api's static list can still be pulled by id.
+    """
+
     def __init__(
         self,
         player: str,
@@ -56,45 +212,310 @@ class PlayerIngest(Player):
         season_year: str = None,
         playoffs: bool = False,
         permode: str = "PERGAME",
+        pacer: Optional[Pacer] = None,
+        cache: Optional[ResponseCache] = None,
+        output_format: OutputFormat = OutputFormat.csv,
+        writer: Optional[S3Writer] = None,
+        journal: Optional[RunJournal] = None,
+        metrics: Optional[MetricsCollector] = None,
     ):
-        super().__init__(
-            player=player, season_year=season_year, playoffs=playoffs, permode=permode
-        )
+        if str(player).isdigit():
+            self.id = int(player)
+            self.permode = PlayTypes.PERMODE[
+                permode.replace("_", "").replace("-", "").upper()
+            ]
+            self.season_year = season_year or Formatter.get_current_season_year()
+            self.season = Formatter.format_season(self.season_year)
+            self.season_type = "Playoffs" if playoffs else "Regular Season"
+        else:
+            super().__init__(
+                player=player,
+                season_year=season_year,
+                playoffs=playoffs,
+                permode=permode,
+            )
+        self._init_ingest(pacer, cache, output_format, writer, journal, metrics=metrics)
         self.base_folder = str(save_folder)
 
         self.save_folder = f"{save_folder}/{self.id}"
 
+    @cached_property
+    def name_meta(self) -> List[dict]:
+        meta = players.find_player_by_id(self.id)
+        return [meta] if meta else []
+
+    @cached_property
+    def name(self) -> str:
+        return self.name_meta[0]["full_name"] if self.name_meta else None
+
+    @cached_property
+    def first_name(self) -> str:
+        return self.name_meta[0]["first_name"] if self.name_meta else None
+
+    @cached_property
+    def last_name(self) -> str:
+        return self.name_meta[0]["last_name"] if self.name_meta else None
+
+    @cached_property
+    def is_active(self) -> bool:
+        return self.name_meta[0]["is_active"] if self.name_meta else None
+
+    def _file_prefix(self) -> str:
+        return str(self.id)
+
+    def _cache_params(self) -> tuple:
+        return (self.id, self.season, self.season_type, self.permode)
+
     def save_combine_stats(self):
-        df = self.get_combine_stats()[0]
-        df.to_csv(f"{self.save_folder}/{self.id}_combine_stats.csv", index=False)
+        df = self._fetch(self.get_combine_stats)[0]
+        self._save(df, "combine_stats")
 
     def save_common_info(self):
-        df = pd.DataFrame(self.get_common_info(), index=[self.id])
-        df.to_csv(f"{self.save_folder}/{self.id}_common_info.csv", index=False)
+        common_info = self._fetch(self.get_common_info)
+        # A cached response skips get_common_info, so set the attributes it would have
+        for attr_name, value in common_info.items():
+            setattr(self, attr_name.lower(), value)
+
+        df = pd.DataFrame(common_info, index=[self.id])
+        self._save(df, "common_info")
 
-    def save_all(self, verbose: bool = False):
+    def save_all(self, verbose: bool = False) -> int:
         total_tasks = 2
+        saved = 0
         progress_bar = tqdm(total=total_tasks, desc="Progress", unit="task")
         try:
             progress_bar.set_description("Getting Common Info")
-            self.save_common_info()
+            self._measure("common_info", self.save_common_info)
+            saved += 1
             progress_bar.update(1)
-            sleep(1)
         except Exception as e:
             logger.error(f"common_info: {str(e)}")
 
         try:
             progress_bar.set_description("Getting Combine Stats")
-            self.save_combine_stats()
+            self._measure("combine_stats", self.save_combine_stats)
+            saved += 1
             progress_bar.update(1)
         except Exception as e:
             if verbose:
                 logger.error(f"combine: {str(e)}")
 
         progress_bar.close()
+        return saved
+
+
+class PlayerBulkIngest(IngestMixin):
+    """
+    Pulls common info and draft combine stats for many players with
+    league-wide calls: one player index call for every player, and one draft
+    combine call per draft year, instead of three or more calls per player.
+
+    Results are fanned out to the PlayerIngest layout (one folder per player)
+    or saved as one table per endpoint in `tables_folder`.
+
+    The player index has most but not all CommonPlayerInfo columns (no
+    birthdate, season experience or flags), so common_info files written in
+    bulk have fewer columns than those written by PlayerIngest.
+    """
+
+    # PlayerIndex column -> CommonPlayerInfo column used in common_info files
+    COMMON_INFO_COLUMNS: ClassVar[Dict[str, str]] = {
+        "PERSON_ID": "PERSON_ID",
+        "PLAYER_FIRST_NAME": "FIRST_NAME",
+        "PLAYER_LAST_NAME": "LAST_NAME",
+        "PLAYER_SLUG": "PLAYER_SLUG",
+        "COLLEGE": "SCHOOL",
+        "COUNTRY": "COUNTRY",
+        "HEIGHT": "HEIGHT",
+        "WEIGHT": "WEIGHT",
+        "JERSEY_NUMBER": "JERSEY",
+        "POSITION": "POSITION",
+        "ROSTER_STATUS": "ROSTERSTATUS",
+        "TEAM_ID": "TEAM_ID",
+        "TEAM_NAME": "TEAM_NAME",
+        "TEAM_ABBREVIATION": "TEAM_ABBREVIATION",
+        "TEAM_CITY": "TEAM_CITY",
+        "FROM_YEAR": "FROM_YEAR",
+        "TO_YEAR": "TO_YEAR",
+        "DRAFT_YEAR": "DRAFT_YEAR",
+        "DRAFT_ROUND": "DRAFT_ROUND",
+        "DRAFT_NUMBER": "DRAFT_NUMBER",
+    }
+
+    def __init__(
+        self,
+        player_ids: List[str],
+        save_folder: str,
+        tables_folder: Optional[str] = None,
+        layout: PlayerLayout = PlayerLayout.per_player,
+        season_year: Optional[str] = None,
+        pacer: Optional[Pacer] = None,
+        cache: Optional[ResponseCache] = None,
+        output_format: OutputFormat = OutputFormat.csv,
+        writer: Optional[S3Writer] = None,
+        metrics: Optional[MetricsCollector] = None,
+    ):
+        self._init_ingest(pacer, cache, output_format, writer, metrics=metrics)
+        self.player_ids = [str(player_id) for player_id in player_ids]
+        self.layout = PlayerLayout(layout)
+        if self.layout == PlayerLayout.consolidated and tables_folder is None:
+            raise ValueError("tables_folder is required for the consolidated layout")
 
+        self.base_folder = str(save_folder)
+        self.tables_folder = tables_folder
+        self.season = Formatter.format_season(
+            season_year or Formatter.get_current_season_year()
+        )
+        # League-wide calls are recorded under the base folder
+        self.save_folder = self.base_folder
+        self.prefix = "ALL"
+
+    def _file_prefix(self) -> str:
+        return self.prefix
+
+    def _cache_params(self) -> tuple:
+        return (self.season,)
+
+    def get_player_index(self) -> pd.DataFrame:
+        return nba.PlayerIndex(
+            season=self.season, historical_nullable="1"
+        ).get_data_frames()[0]
+
+    def get_draft_combine(self, draft_year: str) -> pd.DataFrame:
+        # Same call PlayerIngest makes for each player of the draft year
+        return nba.DraftCombineStats(season_all_time=draft_year).get_data_frames()[0]
+
+    def common_info(self, player_index: pd.DataFrame) -> pd.DataFrame:
+        """
+        Converts the player index to the common_info columns.
+        """
+        df = player_index.rename(columns=self.COMMON_INFO_COLUMNS)[
+            list(self.COMMON_INFO_COLUMNS.values())
+        ]
+        df.insert(
+            3,
+            "DISPLAY_FIRST_LAST",
+            df["FIRST_NAME"].fillna("") + " " + df["LAST_NAME"].fillna(""),
+        )
+        return df
+
+    def _view(self, save_folder: str, prefix: str) -> "PlayerBulkIngest":
+        # A copy that saves into one player's folder
+        view = copy.copy(self)
+        view.save_folder = save_folder
+        view.prefix = prefix
+        view._metric = None
+        return view
+
+    def save_all(self, verbose: bool = False) -> List[str]:
+        """
+        Pulls and saves every player.
+
+        :return: Ids of the players whose common info was saved.
+        """
+        player_index = self._measure("player_index", self._fetch, self.get_player_index)
+        info = self.common_info(player_index)
+        info = info[info["PERSON_ID"].astype(str).isin(self.player_ids)]
+        missing = set(self.player_ids) - set(info["PERSON_ID"].astype(str))
+        if missing:
+            logger.warning(f"{len(missing)} players are not in the player index")
+
+        draft_years = sorted(
+            {
+                str(int(year))
+                for year in pd.to_numeric(info["DRAFT_YEAR"], errors="coerce")
+                if pd.notna(year)
+            }
+        )
+        combine = {}
+        for draft_year in tqdm(draft_years, desc="Getting Combine Stats"):
+            try:
+                combine[draft_year] = self._measure(
+                    "draft_combine", self._fetch, self.get_draft_combine, draft_year
+                )
+            except Exception as e:
+                if verbose:
+                    logger.error(f"combine {draft_year}: {e}")
+
+        if self.layout == PlayerLayout.consolidated:
+            view = self._view(self.tables_folder, self.prefix)
+            view._measure("common_info", view._save, info, "common_info")
+            if combine:
+                view._measure(
+                    "combine_stats",
+                    view._save,
+                    pd.concat(combine.values(), ignore_index=True),
+                    "combine_stats",
+                )
+            return sorted(info["PERSON_ID"].astype(str))
+
+        saved = []
+        for player_id, player_info in tqdm(
+            info.groupby(info["PERSON_ID"].astype(str)), desc="Saving players"
+        ):
+            view = self._view(f"{self.base_folder}/{player_id}", player_id)
+            try:
+                view._measure("common_info", view._save, player_info, "common_info")
+                saved.append(player_id)
+            except Exception as e:
+                logger.error(f"common_info {player_id}: {e}")
+                continue
+
+            draft_year = pd.to_numeric(
+                player_info["DRAFT_YEAR"].iloc[0], errors="coerce"
+            )
+            if pd.isna(draft_year) or str(int(draft_year)) not in combine:
+                continue
+            try:
+                # PlayerIngest also saves the whole draft class for each player
+                view._measure(
+                    "combine_stats",
+                    view._save,
+                    combine[str(int(draft_year))],
+                    "combine_stats",
+                )
+            except Exception as e:
+                if verbose:
+                    logger.error(f"combine {player_id}: {e}")
+        return saved
+
+
+class SeasonIngest(IngestMixin, Season):
+    # (table, save method) for every endpoint in save_all_nonsynergy
+    nonsynergy_endpoints = (
+        ("player_defense", "save_defense_player"),
+        ("team_defense", "save_defense_team"),
+        ("lineup_details", "save_lineup_details"),
+        ("lineups", "save_lineups"),
+        ("opponent_shooting", "save_opponent_shooting"),
+        ("player_clutch", "save_player_clutch"),
+        ("player_games", "save_player_games"),
+        ("player_hustle", "save_player_hustle"),
+        ("player_matchups", "save_player_matchups"),
+        ("player_shot_locations", "save_player_shot_locations"),
+        ("player_shots", "save_player_shots"),
+        ("player_stats", "save_player_stats"),
+        ("salaries", "save_salaries"),
+        ("team_clutch", "save_team_clutch"),
+        ("team_games", "save_team_games"),
+        ("team_hustle", "save_team_hustle"),
+        ("team_shot_locations", "save_team_shot_locations"),
+        ("team_stats", "save_team_stats"),
+    )
+    # (table, save method, play or tracking type) for every endpoint in save_all_synergy
+    synergy_endpoints = tuple(
+        (f"{play_type}_{grain}", f"save_synergy_{grain}", play_type)
+        for play_type in sorted(set(NBADataMappings.PLAY_TYPES.values()))
+        for grain in ("player", "team")
+    ) + tuple(
+        (f"{tracking_type}_{grain}", f"save_tracking_{grain}", tracking_type)
+        for tracking_type in sorted(set(NBADataMappings.TRACKING_TYPES.values()))
+        for grain in ("player", "team")
+    )
+    endpoints = tuple(
+        endpoint[0] for endpoint in nonsynergy_endpoints + synergy_endpoints
+    )
 
-class SeasonIngest(Season):
     def __init__(
         self,
         season_year: str,
@@ -102,184 +523,202 @@ class SeasonIngest(Season):
         playoffs=False,
         permode: str = "PERGAME",
         verbose: bool = False,
+        pacer: Optional[Pacer] = None,
+        cache: Optional[ResponseCache] = None,
+        output_format: OutputFormat = OutputFormat.csv,
+        writer: Optional[S3Writer] = None,
+        journal: Optional[RunJournal] = None,
+        endpoints: Optional[List[str]] = None,
+        metrics: Optional[MetricsCollector] = None,
     ):
         super().__init__(season_year=season_year, playoffs=playoffs, permode=permode)
+        self._init_ingest(
+            pacer, cache, output_format, writer, journal, endpoints, metrics
+        )
 
         self.season_id = self.season.upper().replace(" ", "").replace("-", "")
 
         self.base_folder = save_folder
         self.save_folder = f"{save_folder}/{str(self.season_id)}"
 
+    def _file_prefix(self) -> str:
+        return str(self.season_id)
+
+    def _cache_params(self) -> tuple:
+        return (self.season, self.season_type, self.permode)
+
+    def _cache_season_year(self):
+        return self.season_year
+
     def save_defense_player(self):
-        df = self.get_defense_player()
-        df.to_csv(
-            f"{self.save_folder}/{self.season_id}_player_defense.csv", index=False
-        )
+        df = self._fetch(self.get_defense_player)
+        self._save(df, "player_defense")
 
     def save_defense_team(self):
-        df = self.get_defense_team()
-        df.to_csv(f"{self.save_folder}/{self.season_id}_team_defense.csv", index=False)
+        df = self._fetch(self.get_defense_team)
+        self._save(df, "team_defense")
 
     def save_lineup_details(self):
-        df = self.get_lineup_details()
-        df.to_csv(
-            f"{self.save_folder}/{self.season_id}_lineup_details.csv", index=False
-        )
+        df = self._fetch(self.get_lineup_details)
+        self._save(df, "lineup_details")
 
     def save_lineups(self):
-        df = self.get_lineups()
-        df.to_csv(f"{self.save_folder}/{self.season_id}_lineups.csv", index=False)
+        df = self._fetch(self.get_lineups)
+        self._save(df, "lineups")
 
     def save_opponent_shooting(self):
-        df = self.get_opponent_shooting()
-        df.to_csv(
-            f"{self.save_folder}/{self.season_id}_opponent_shooting.csv", index=False
-        )
+        df = self._fetch(self.get_opponent_shooting)
+        self._save(df, "opponent_shooting")
 
     def save_player_clutch(self):
-        df = self.get_player_clutch()
-        df.to_csv(f"{self.save_folder}/{self.season_id}_player_clutch.csv", index=False)
+        df = self._fetch(self.get_player_clutch)
+        self._save(df, "player_clutch")
 
     def save_player_games(self):
-        df = self.get_player_games()
-        df.to_csv(f"{self.save_folder}/{self.season_id}_player_games.csv", index=False)
+        df = self._fetch(self.get_player_games)
+        self._save(df, "player_games")
 
     def save_player_hustle(self):
-        df = self.get_player_hustle()
-        df.to_csv(f"{self.save_folder}/{self.season_id}_player_hustle.csv", index=False)
+        df = self._fetch(self.get_player_hustle)
+        self._save(df, "player_hustle")
 
     def save_player_matchups(self):
-        df = self.get_player_matchups()
-        df.to_csv(
-            f"{self.save_folder}/{self.season_id}_player_matchups.csv", index=False
-        )
+        df = self._fetch(self.get_player_matchups)
+        self._save(df, "player_matchups")
 
     def save_player_shot_locations(self):
-        df = self.get_player_shot_locations()
-        df.to_csv(
-            f"{self.save_folder}/{self.season_id}_player_shot_locations.csv",
-            index=False,
-        )
+        df = self._fetch(self.get_player_shot_locations)
+        self._save(df, "player_shot_locations")
 
     def save_player_shots(self):
-        df = self.get_player_shots()
-        df.to_csv(f"{self.save_folder}/{self.season_id}_player_shots.csv", index=False)
+        df = self._fetch(self.get_player_shots)
+        self._save(df, "player_shots")
 
     def save_player_stats(self):
-        df = self.get_player_stats()
-        df.to_csv(f"{self.save_folder}/{self.season_id}_player_stats.csv", index=False)
+        df = self._fetch(self.get_player_stats)
+        self._save(df, "player_stats")
 
     def save_salaries(self):
-        df = self.get_salaries()
-        df.to_csv(f"{self.save_folder}/{self.season_id}_salaries.csv", index=False)
+        df = self._fetch(self.get_salaries)
+        self._save(df, "salaries")
 
     def save_team_clutch(self):
-        df = self.get_team_clutch()
-        df.to_csv(f"{self.save_folder}/{self.season_id}_team_clutch.csv", index=False)
+        df = self._fetch(self.get_team_clutch)
+        self._save(df, "team_clutch")
 
     def save_team_games(self):
-        df = self.get_team_games()
-        df.to_csv(f"{self.save_folder}/{self.season_id}_team_games.csv", index=False)
+        df = self._fetch(self.get_team_games)
+        self._save(df, "team_games")
 
     def save_team_hustle(self):
-        df = self.get_team_hustle()
-        df.to_csv(f"{self.save_folder}/{self.season_id}_team_hustle.csv", index=False)
+        df = self._fetch(self.get_team_hustle)
+        self._save(df, "team_hustle")
 
     def save_team_shot_locations(self):
-        df = self.get_team_shot_locations()
-        df.to_csv(
-            f"{self.save_folder}/{self.season_id}_team_shot_locations.csv", index=False
-        )
+        df = self._fetch(self.get_team_shot_locations)
+        self._save(df, "team_shot_locations")
 
     def save_team_stats(self):
-        df = self.get_team_stats()
-        df.to_csv(f"{self.save_folder}/{self.season_id}_team_stats.csv", index=False)
+        df = self._fetch(self.get_team_stats)
+        self._save(df, "team_stats")
 
     def save_synergy_player(self, synergy_type: str):
-        df = self.get_synergy_player(synergy_type)
-        df.to_csv(
-            f"{self.save_folder}/{self.season_id}_{synergy_type}_player.csv",
-            index=False,
-        )
+        df = self._fetch(self.get_synergy_player, synergy_type)
+        self._save(df, f"{synergy_type}_player")
 
     def save_tracking_player(self, tracking_type: str):
-        df = self.get_tracking_player(tracking_type)
-        df.to_csv(
-            f"{self.save_folder}/{self.season_id}_{tracking_type}_player.csv",
-            index=False,
-        )
+        df = self._fetch(self.get_tracking_player, tracking_type)
+        self._save(df, f"{tracking_type}_player")
 
     def save_synergy_team(self, synergy_type: str):
-        df = self.get_synergy_team(synergy_type)
-        df.to_csv(
-            f"{self.save_folder}/{self.season_id}_{synergy_type}_team.csv", index=False
-        )
+        df = self._fetch(self.get_synergy_team, synergy_type)
+        self._save(df, f"{synergy_type}_team")
 
     def save_tracking_team(self, tracking_type: str):
-        df = self.get_tracking_team(tracking_type)
-        df.to_csv(
-            f"{self.save_folder}/{self.season_id}_{tracking_type}_team.csv", index=False
-        )
+        df = self._fetch(self.get_tracking_team, tracking_type)
+        self._save(df, f"{tracking_type}_team")
+
+    def _save_isolated(self, table: str, method: str, *args):
+        if self._skip_endpoint(table):
+            return
+        # The nbastatpy getters store their result on the object before returning
+        # it, so concurrent endpoints each run on their own shallow copy
+        isolated = copy.copy(self)
+        isolated._measure(table, getattr(isolated, method), *args)
+
+    def endpoint_tasks(self, group: str = "") -> List[Task]:
+        """
+        Returns one task per endpoint saved by save_all_nonsynergy and
+        save_all_synergy so they can be run by a TaskScheduler.
+        """
+        return [
+            Task(
+                self.season_id,
+                table,
+                partial(self._save_isolated, table, method, *args),
+                group,
+                int(self.season_year),
+            )
+            for table, method, *args in self.nonsynergy_endpoints
+            + self.synergy_endpoints
+            if self.only_endpoints is None or table in self.only_endpoints
+        ]
 
-    def save_all_nonsynergy(self, verbose: bool = False):
-        total_tasks = 18
+    def save_all_nonsynergy(self, verbose: bool = False) -> int:
+        total_tasks = len(self.nonsynergy_endpoints)
         progress_bar = tqdm(total=total_tasks, desc="Progress", unit="task")
 
-        steps = [
-            ("Getting Player Defense", self.save_defense_player),
-            ("Getting Team Defense", self.save_defense_team),
-            ("Getting Lineup Details", self.save_lineup_details),
-            ("Getting Lineups", self.save_lineups),
-            ("Getting Opponent Shooting", self.save_opponent_shooting),
-            ("Getting Player Clutch", self.save_player_clutch),
-            ("Getting Player Games", self.save_player_games),
-            ("Getting Player Hustle", self.save_player_hustle),
-            ("Getting Player Matchups", self.save_player_matchups),
-            ("Getting Player Shot Locations", self.save_player_shot_locations),
-            ("Getting Player Shots", self.save_player_shots),
-            ("Getting Player Stats", self.save_player_stats),
-            ("Getting Salaries", self.save_salaries),
-            ("Getting Team Clutch", self.save_team_clutch),
-            ("Getting Team Games", self.save_team_games),
-            ("Getting Team Hustle", self.save_team_hustle),
-            ("Getting Team Shot Locations", self.save_team_shot_locations),
-            ("Getting Team Stats", self.save_team_stats),
-        ]
-
-        for desc, func in steps:
+        saved = 0
+        for table, method in self.nonsynergy_endpoints:
+            desc = f"Getting {table.replace('_', ' ').title()}"
+            if self._skip_endpoint(table):
+                saved += 1
+                progress_bar.update(1)
+                continue
             try:
                 progress_bar.set_description(desc)
-                func()  # Call the corresponding save function
+                self._measure(table, getattr(self, method))
+                saved += 1
                 progress_bar.update(1)
-                sleep(1)
             except Exception as e:
                 if verbose:
                     logger.error(f"An error occurred in {desc}: {e}")
                 # Optionally, handle the error differently if needed
 
         progress_bar.close()
+        return saved
 
-    def save_all_synergy(self, verbose: bool = False):
+    def save_all_synergy(self, verbose: bool = False) -> int:
         tracking_types = set(NBADataMappings.TRACKING_TYPES.values())
         play_types = set(NBADataMappings.PLAY_TYPES.values())
 
+        saved = 0
         total_tasks = len(play_types)
         progress_bar = tqdm(total=total_tasks, desc="Progress", unit="task")
 
         for play_type in play_types:
-            try:
-                progress_bar.set_description(f"Getting Player {play_type}")
-                self.save_synergy_player(play_type)
-                sleep(1)
-            except Exception as e:
-                if verbose:
-                    logger.error(f"{play_type}_PLAYER: {str(e)}")
-
+            if self._skip_endpoint(f"{play_type}_player"):
+                saved += 1
+            else:
+                try:
+                    progress_bar.set_description(f"Getting Player {play_type}")
+                    self._measure(
+                        f"{play_type}_player", self.save_synergy_player, play_type
+                    )
+                    saved += 1
+                except Exception as e:
+                    if verbose:
+                        logger.error(f"{play_type}_PLAYER: {e}")
+
+            if self._skip_endpoint(f"{play_type}_team"):
+                saved += 1
+                progress_bar.update(1)
+                continue
             try:
                 progress_bar.set_description(f"Getting Team {play_type}")
-                self.save_synergy_team(play_type)
+                self._measure(f"{play_type}_team", self.save_synergy_team, play_type)
+                saved += 1
                 progress_bar.update(1)
-                sleep(1)
             except Exception as e:
                 if verbose:
                     logger.error(f"{play_type}_TEAM: {str(e)}")
@@ -290,92 +729,155 @@ class SeasonIngest(Season):
         progress_bar = tqdm(total=total_tasks, desc="Progress", unit="task")
 
         for tracking_type in tracking_types:
-            try:
-                progress_bar.set_description(f"Getting Player {tracking_type}")
-                self.save_tracking_player(tracking_type)
-                sleep(1)
-            except Exception as e:
-                if verbose:
-                    logger.error(f"{tracking_type}: {str(e)}")
-
+            if self._skip_endpoint(f"{tracking_type}_player"):
+                saved += 1
+            else:
+                try:
+                    progress_bar.set_description(f"Getting Player {tracking_type}")
+                    self._measure(
+                        f"{tracking_type}_player",
+                        self.save_tracking_player,
+                        tracking_type,
+                    )
+                    saved += 1
+                except Exception as e:
+                    if verbose:
+                        logger.error(f"{tracking_type}: {e}")
+
+            if self._skip_endpoint(f"{tracking_type}_team"):
+                saved += 1
+                progress_bar.update(1)
+                continue
             try:
                 progress_bar.set_description(f"Getting Team {tracking_type}")
-                self.save_tracking_team(tracking_type)
+                self._measure(
+                    f"{tracking_type}_team", self.save_tracking_team, tracking_type
+                )
+                saved += 1
                 progress_bar.update(1)
-                sleep(1)
             except Exception as e:
                 if verbose:
                     logger.error(f"{tracking_type}: {str(e)}")
 
         progress_bar.close()
+        return saved
+
+
+class GameIngest(IngestMixin, Game):
+    endpoints = (
+        "advanced",
+        "defense",
+        "hustle",
+        "matchups",
+        "playbyplay",
+        "tracking",
+        "rotations",
+        "scoring",
+        "usage",
+    )
 
-
-class GameIngest(Game):
-    def __init__(self, game_id: str, save_folder: Path, verbose: bool = False):
+    def __init__(
+        self,
+        game_id: str,
+        save_folder: Path,
+        verbose: bool = False,
+        pacer: Optional[Pacer] = None,
+        cache: Optional[ResponseCache] = None,
+        output_format: OutputFormat = OutputFormat.csv,
+        writer: Optional[S3Writer] = None,
+        show_progress: bool = True,
+        journal: Optional[RunJournal] = None,
+        endpoints: Optional[List[str]] = None,
+        metrics: Optional[MetricsCollector] = None,
+    ):
         super().__init__(game_id=game_id)
+        self._init_ingest(
+            pacer, cache, output_format, writer, journal, endpoints, metrics
+        )
         self.game_id = game_id
 
         self.base_folder = save_folder
         self.save_folder = f"{save_folder}/{str(self.game_id)}"
 
+        self.show_progress = show_progress
+
+    def _file_prefix(self) -> str:
+        return str(self.game_id)
+
+    def _cache_params(self) -> tuple:
+        return (str(self.game_id),)
+
+    def _cache_season_year(self):
+        return season_year_from_game_id(self.game_id)
+
     def save_advanced(self):
-        df = self.get_advanced()[0]
-        df.to_csv(f"{self.save_folder}/{self.game_id}_advanced.csv", index=False)
+        df = self._fetch(self.get_advanced)[0]
+        self._save(df, "advanced")
 
     def save_defense(self):
-        df = self.get_defense()[0]
-        df.to_csv(f"{self.save_folder}/{self.game_id}_defense.csv", index=False)
+        df = self._fetch(self.get_defense)[0]
+        self._save(df, "defense")
 
     def save_hustle(self):
-        df = self.get_hustle()[0]
-        df.to_csv(f"{self.save_folder}/{self.game_id}_hustle.csv", index=False)
+        df = self._fetch(self.get_hustle)[0]
+        self._save(df, "hustle")
 
     def save_matchups(self):
-        df = self.get_matchups()[0]
-        df.to_csv(f"{self.save_folder}/{self.game_id}_matchups.csv", index=False)
+        df = self._fetch(self.get_matchups)[0]
+        self._save(df, "matchups")
 
     def save_playbyplay(self):
-        df = self.get_playbyplay()
-        df.to_csv(f"{self.save_folder}/{self.game_id}_playbyplay.csv", index=False)
+        df = self._fetch(self.get_playbyplay)
+        self._save(df, "playbyplay")
 
     def save_tracking(self):
-        df = self.get_playertrack()[0]
-        df.to_csv(f"{self.save_folder}/{self.game_id}_tracking.csv", index=False)
+        df = self._fetch(self.get_playertrack)[0]
+        self._save(df, "tracking")
 
     def save_rotations(self):
-        df = self.get_rotations()
-        df.to_csv(f"{self.save_folder}/{self.game_id}_rotations.csv", index=False)
+        df = self._fetch(self.get_rotations)
+        self._save(df, "rotations")
 
     def save_scoring(self):
-        df = self.get_scoring()[0]
-        df.to_csv(f"{self.save_folder}/{self.game_id}_scoring.csv", index=False)
+        df = self._fetch(self.get_scoring)[0]
+        self._save(df, "scoring")
 
     def save_usage(self):
-        df = self.get_usage()[0]
-        df.to_csv(f"{self.save_folder}/{self.game_id}_usage.csv", index=False)
-
-    def save_all(self, verbose: bool = False):
-        total_tasks = 9
-        progress_bar = tqdm(total=total_tasks, desc="Progress", unit="task")
+        df = self._fetch(self.get_usage)[0]
+        self._save(df, "usage")
+
+    def save_all(self, verbose: bool = False) -> int:
+        total_tasks = len(self.endpoints)
+        progress_bar = tqdm(
+            total=total_tasks,
+            desc="Progress",
+            unit="task",
+            disable=not self.show_progress,
+        )
 
         steps = [
-            ("Getting Advanced", self.save_advanced),
-            ("Getting Defense", self.save_defense),
-            ("Getting Hustle", self.save_hustle),
-            ("Getting Matchups", self.save_matchups),
-            ("Getting Play by Play", self.save_playbyplay),
-            ("Getting Tracking", self.save_tracking),
-            ("Getting Rotations", self.save_rotations),
-            ("Getting Scoring", self.save_scoring),
-            ("Getting Usage", self.save_usage),
+            ("Getting Advanced", "advanced", self.save_advanced),
+            ("Getting Defense", "defense", self.save_defense),
+            ("Getting Hustle", "hustle", self.save_hustle),
+            ("Getting Matchups", "matchups", self.save_matchups),
+            ("Getting Play by Play", "playbyplay", self.save_playbyplay),
+            ("Getting Tracking", "tracking", self.save_tracking),
+            ("Getting Rotations", "rotations", self.save_rotations),
+            ("Getting Scoring", "scoring", self.save_scoring),
+            ("Getting Usage", "usage", self.save_usage),
         ]
 
-        for desc, func in steps:
+        saved = 0
+        for desc, table, func in steps:
+            if self._skip_endpoint(table):
+                saved += 1
+                progress_bar.update(1)
+                continue
             try:
                 progress_bar.set_description(desc)
-                func()  # Call the corresponding save function
+                self._measure(table, func)
+                saved += 1
                 progress_bar.update(1)
-                sleep(1)
             except Exception as e:
                 progress_bar.update(1)
                 if verbose:
@@ -384,3 +886,4 @@ class GameIngest(Game):
                 # Optionally, you can handle specific exceptions or log them differently
 
         progress_bar.close()
+        return saved
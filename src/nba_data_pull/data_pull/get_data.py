@@ -1,17 +1,53 @@
 import os
+from collections import Counter
 from datetime import date, datetime
+from functools import partial
 from pathlib import Path
-from time import sleep
 
-import boto3
 import typer
 import yaml
 from dotenv import load_dotenv
 from loguru import logger
-from rich.progress import track
-from typing_extensions import Annotated, Dict, Literal
-
-from nba_data_pull.data_pull.dataingest import GameIngest, PlayerIngest, SeasonIngest
+from typing_extensions import (
+    TYPE_CHECKING,
+    Annotated,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+)
+
+from nba_data_pull.data_pull.journal import RunJournal, new_run_id
+from nba_data_pull.data_pull.metrics import (
+    MetricsCollector,
+    report_json,
+    write_prometheus_textfile,
+)
+from nba_data_pull.data_pull.pacing import Pacer, PacingPolicy, build_pacer
+from nba_data_pull.data_pull.response_cache import ResponseCache, build_cache
+from nba_data_pull.data_pull.scheduler import (
+    PriorityPolicy,
+    Task,
+    TaskScheduler,
+    parse_deadline,
+    prioritize,
+)
+from nba_data_pull.data_pull.schemas import OutputFormat, PlayerLayout
+from nba_data_pull.inventory.incremental import write_completions
+from nba_data_pull.inventory.inventory_index import (
+    InventoryIndex,
+    season_year_from_game_id,
+)
+from nba_data_pull.inventory.metadata_store import MetadataStore, MetaFormat
+from nba_data_pull.inventory.season_refresh import STATE_PATH as REFRESH_STATE_PATH
+from nba_data_pull.inventory.season_refresh import update_refresh_state
+from nba_data_pull.lazy_imports import ImportProfiler, lazy_import
+
+boto3 = lazy_import("boto3")
+
+if TYPE_CHECKING:
+    from nba_data_pull.data_pull.s3_writer import S3Writer
 
 app = typer.Typer()
 
@@ -27,10 +63,158 @@ class SeasonYear:
     default = current_season_year
 
 
-def load_yaml_s3(file_path: str, bucket_name: str, s3_client: boto3.client) -> dict:
-    response = s3_client.get_object(Bucket=bucket_name, Key=str(file_path))
-    yaml_content = response["Body"].read().decode("utf-8")
-    return yaml.safe_load(yaml_content)
+def open_journal(journal_path: Path, resume: str, kind: str) -> RunJournal:
+    """
+    Opens the run journal, either for a new run or to resume an earlier one.
+    """
+    journal = RunJournal(journal_path, run_id=resume)
+    if resume and not journal.exists():
+        raise typer.BadParameter(f"No run {resume} in {journal_path}")
+
+    journal.start(kind)
+    logger.info(f"Run id: {journal.run_id} (resume with --resume {journal.run_id})")
+    return journal
+
+
+def log_partial(journal: RunJournal, expected_endpoints: Dict[str, int]) -> None:
+    """
+    Logs folders the run only partly wrote so they can be resumed.
+
+    :param expected_endpoints: Folder -> number of endpoints the run pulls into it.
+    """
+    partial = journal.partial_entities(expected_endpoints)
+    if partial:
+        logger.warning(
+            f"{len(partial)} folders are missing endpoints, "
+            f"resume with --resume {journal.run_id}"
+        )
+        for entity, count in sorted(partial.items()):
+            logger.debug(f"{entity}: {count}/{expected_endpoints[entity]} endpoints")
+
+
+def save_metrics(
+    metrics: MetricsCollector,
+    writer: "S3Writer",
+    bucket: str,
+    s3_client,
+    metrics_path: str,
+    prometheus_textfile: Optional[Path] = None,
+) -> None:
+    """
+    Saves the run's per-endpoint metrics report to S3 and optionally writes it
+    as a Prometheus textfile. The writer must be flushed first so upload times
+    and failed uploads are known.
+    """
+    report = metrics.report(writer.upload_times, writer.failed)
+    key = f"{metrics_path}/{metrics.kind}/{metrics.run_id}.json"
+    s3_client.put_object(Bucket=bucket, Key=key, Body=report_json(report))
+    logger.info(f"Saved metrics report to {key}")
+
+    slowest = list(report["endpoints"].items())[:5]
+    for endpoint, row in slowest:
+        logger.info(
+            f"{endpoint}: {row['calls']} calls, {row['api_seconds']}s API, "
+            f"{row['upload_seconds']}s upload, {row['outcomes']}"
+        )
+
+    if prometheus_textfile is not None:
+        write_prometheus_textfile(report, prometheus_textfile)
+
+
+def pull_games(
+    game_ids: List[str],
+    save_folder: str,
+    workers: int = 1,
+    pacer: Optional[Pacer] = None,
+    cache: Optional[ResponseCache] = None,
+    output_format: OutputFormat = OutputFormat.csv,
+    writer: Optional["S3Writer"] = None,
+    journal: Optional[RunJournal] = None,
+    endpoints: Optional[Dict[str, List[str]]] = None,
+    metrics: Optional[MetricsCollector] = None,
+    priority: PriorityPolicy = PriorityPolicy.fifo,
+    deadline: Optional[float] = None,
+) -> Tuple[Dict, List[str]]:
+    """
+    Pulls every endpoint for a list of games, optionally across a thread pool.
+
+    :param game_ids: Game ids to pull.
+    :param save_folder: Folder the game folders are saved under.
+    :param workers: Number of games to pull at the same time.
+    :param pacer: Pacer shared by all workers. If None, each game sleeps one
+        second per call.
+    :param cache: Response cache shared by all workers.
+    :param output_format: File format to save data in.
+    :param writer: Background writer shared by all workers.
+    :param journal: Run journal used to skip endpoints a resumed run already saved.
+    :param endpoints: Game id -> endpoints to pull for games that are already
+        partly saved.
+    :param metrics: Collector for per-endpoint timings shared by all workers.
+    :param priority: Order games are pulled in.
+    :param deadline: Timestamp after which no game is started. Games left are
+        neither completed nor errors, so the next run pulls them.
+    :return: A tuple containing:
+             - A dictionary mapping game id to the error raised for that game.
+             - A list of game ids where at least one file was saved.
+    """
+    # Imported here so commands that do not pull data skip nbastatpy and pandas
+    from nba_data_pull.data_pull.dataingest import GameIngest
+
+    error_log = {}
+    completed = []
+
+    def ingest_game(game_id: str) -> int:
+        if workers <= 1:
+            logger.info(f"Game ID: {game_id}")
+        game_ingest = GameIngest(
+            game_id=game_id,
+            save_folder=save_folder,
+            verbose=True,
+            pacer=pacer,
+            cache=cache,
+            output_format=output_format,
+            writer=writer,
+            show_progress=workers <= 1,
+            journal=journal,
+            endpoints=(endpoints or {}).get(game_id),
+            metrics=metrics,
+        )
+        return game_ingest.save_all()
+
+    tasks = [
+        Task(
+            game_id,
+            "game",
+            partial(ingest_game, game_id),
+            season=season_year_from_game_id(game_id),
+        )
+        for game_id in game_ids
+    ]
+    scheduler = TaskScheduler(workers=workers, deadline=deadline)
+    scheduler.run(
+        prioritize(tasks, priority, SeasonYear.default), description="Pulling games"
+    )
+
+    for result in scheduler.results:
+        game_id = result.task.entity
+        if result.error is not None:
+            logger.error(f"Error for {game_id} - {result.error}")
+            error_log[game_id] = result.error
+        elif result.value:
+            completed.append(game_id)
+
+    return error_log, completed
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    import_profile: Annotated[
+        bool, typer.Option(help="Log startup and import time when the command ends")
+    ] = False,
+):
+    if import_profile:
+        ctx.call_on_close(ImportProfiler().start().log_report)
 
 
 @app.command()
@@ -45,7 +229,84 @@ def get_player_data(
         str,
         typer.Argument(help="Path to save error log", file_okay=False, dir_okay=True),
     ] = "data/logs/PLAYER",
+    bulk: Annotated[
+        bool,
+        typer.Option(
+            help="Pull every player with league-wide calls (one player index call "
+            "and one draft combine call per draft year) instead of per player calls"
+        ),
+    ] = False,
+    layout: Annotated[
+        PlayerLayout,
+        typer.Option(
+            help="With --bulk, save one folder per player or one table per "
+            "endpoint under data/nba/PLAYER_TABLES"
+        ),
+    ] = PlayerLayout.per_player,
+    pacing: Annotated[
+        PacingPolicy, typer.Option(help="How API calls are paced")
+    ] = PacingPolicy.aimd,
+    requests_per_second: Annotated[
+        float, typer.Option(help="Request rate (start rate for aimd)")
+    ] = 1.0,
+    connect_timeout: Annotated[
+        float, typer.Option(help="Seconds to wait for a connection to the API")
+    ] = 10.0,
+    read_timeout: Annotated[
+        float, typer.Option(help="Seconds to wait for an API response")
+    ] = 30.0,
+    cache: Annotated[
+        bool, typer.Option(help="Cache API responses on local disk")
+    ] = True,
+    cache_path: Annotated[
+        Path, typer.Option(help="Path to the response cache database")
+    ] = Path("data/cache/responses.sqlite"),
+    cache_ttl_hours: Annotated[
+        float, typer.Option(help="Hours before current season responses expire")
+    ] = 12,
+    cache_max_mb: Annotated[
+        int, typer.Option(help="Size cap for the response cache in MB")
+    ] = 2048,
+    output_format: Annotated[
+        OutputFormat, typer.Option("--format", help="File format to save data in")
+    ] = OutputFormat.csv,
+    upload_workers: Annotated[
+        int, typer.Option(help="Number of background upload threads")
+    ] = 4,
+    serialize_workers: Annotated[
+        int,
+        typer.Option(
+            help="Processes that encode files before upload, 0 encodes on the "
+            "fetch threads"
+        ),
+    ] = 0,
+    priority: Annotated[
+        PriorityPolicy,
+        typer.Option(help="Order data is pulled in, so the most valuable lands first"),
+    ] = PriorityPolicy.newest_first,
+    deadline: Annotated[
+        Optional[str],
+        typer.Option(
+            help="Local time (HH:MM) after which no new pull is started, "
+            "anything left is pulled by the next run"
+        ),
+    ] = None,
+    meta_format: Annotated[
+        MetaFormat, typer.Option(help="Format metadata files are read in")
+    ] = MetaFormat.jsonl_gz,
+    metrics_path: Annotated[
+        str, typer.Option(help="Path to save the per-endpoint metrics report")
+    ] = "data/logs/METRICS",
+    prometheus_textfile: Annotated[
+        Optional[Path],
+        typer.Option(help="Also write the metrics to this Prometheus textfile"),
+    ] = None,
 ):
+    # Imported here so --help and the other commands skip nbastatpy and pandas
+    from nba_data_pull.data_pull.dataingest import PlayerBulkIngest, PlayerIngest
+    from nba_data_pull.data_pull.http_session import build_session
+    from nba_data_pull.data_pull.s3_writer import S3Writer
+
     bucket_name = os.getenv("BUCKET_NAME")
     logger.info(f"Loaded bucket name: {bucket_name}")
 
@@ -53,29 +314,79 @@ def get_player_data(
     player_save_folder = f"s3://{bucket_name}/data/nba/PLAYER"
     player_error_log_path = f"{player_error_log_path}/{str(date.today())}.yaml"
     s3 = boto3.client("s3")
+    store = MetadataStore(bucket_name, s3, fmt=meta_format)
 
-    logger.info("Loading data to pull yaml file")
-    data_to_pull = load_yaml_s3(
-        data_to_pull_path, bucket_name=bucket_name, s3_client=s3
-    )
+    logger.info("Loading data to pull")
+    data_to_pull = store.load(data_to_pull_path)
 
     player_ids = data_to_pull.get("player")
+    deadline_ts = parse_deadline(deadline) if deadline else None
 
+    pacer = build_pacer(pacing, requests_per_second)
+    session = build_session(10, (connect_timeout, read_timeout))
+    response_cache = build_cache(cache, cache_path, cache_ttl_hours, cache_max_mb)
+    writer = S3Writer(workers=upload_workers, serialize_workers=serialize_workers)
+    metrics = MetricsCollector("PLAYER", run_id=new_run_id())
     error_log = {}
+    completed = []
 
     logger.info("Pulling player data")
-    for player_id in track(player_ids):
-        try:
+    if bulk:
+        completed = PlayerBulkIngest(
+            player_ids,
+            save_folder=player_save_folder,
+            tables_folder=f"s3://{bucket_name}/data/nba/PLAYER_TABLES",
+            layout=layout,
+            pacer=pacer,
+            cache=response_cache,
+            output_format=output_format,
+            writer=writer,
+            metrics=metrics,
+        ).save_all(verbose=True)
+        error_log.update(
+            {
+                player_id: "Not in the player index"
+                for player_id in set(map(str, player_ids)) - set(completed)
+            }
+        )
+        if layout == PlayerLayout.consolidated:
+            # No player folders are written, so nothing is added to the inventory
+            completed = []
+    else:
+
+        def ingest_player(player_id) -> str:
             player_ingest = PlayerIngest(
-                player=player_id, save_folder=player_save_folder
+                player=player_id,
+                save_folder=player_save_folder,
+                pacer=pacer,
+                cache=response_cache,
+                output_format=output_format,
+                writer=writer,
+                metrics=metrics,
             )
-        except ValueError as e:
-            logger.error(f"Error for {player_id} - {e}")
-            error_log[player_id] = e
-            continue
-
-        player_ingest.save_all()
-        sleep(1)
+            if player_ingest.save_all():
+                return str(player_ingest.id)
+
+        tasks = [
+            Task(str(player_id), "player", partial(ingest_player, player_id))
+            for player_id in player_ids
+        ]
+        scheduler = TaskScheduler(workers=1, deadline=deadline_ts)
+        scheduler.run(prioritize(tasks, priority), description="Pulling players")
+
+        for result in scheduler.results:
+            if result.error is not None:
+                logger.error(f"Error for {result.task.entity} - {result.error}")
+                error_log[result.task.entity] = result.error
+            elif result.value:
+                completed.append(result.value)
+
+    writer.flush()
+    logger.info(f"Pacing stats: {pacer.stats()}")
+    logger.info(f"HTTP connection stats: {session.stats()}")
+    logger.info(f"Upload stats: {writer.stats()}")
+    if response_cache is not None:
+        logger.info(f"Cache stats: {response_cache.stats()}")
 
     logger.info("Saving error log")
 
@@ -86,6 +397,19 @@ def get_player_data(
         Body=player_error_content,
     )
 
+    save_metrics(metrics, writer, bucket_name, s3, metrics_path, prometheus_textfile)
+
+    failed_folders = writer.failed_folders()
+    write_completions(
+        {"PLAYER": [i for i in completed if i not in failed_folders]},
+        kind="PLAYER",
+        bucket=bucket_name,
+        s3_client=s3,
+    )
+
+    # Raises if any file failed to upload, after the error log is saved
+    writer.close()
+
 
 @app.command()
 def get_season_data(
@@ -97,50 +421,155 @@ def get_season_data(
         Path,
         typer.Argument(help="Path to save error log", file_okay=False, dir_okay=True),
     ] = "data/logs/SEASON",
+    workers: Annotated[
+        int,
+        typer.Option(
+            help="Number of season endpoints to pull at the same time. "
+            "Every worker shares the pacing budget"
+        ),
+    ] = 4,
+    resume: Annotated[
+        Optional[str],
+        typer.Option(
+            help="Run id to resume. Only endpoints it did not save are pulled"
+        ),
+    ] = None,
+    journal_path: Annotated[
+        Path, typer.Option(help="Path to the run journal database")
+    ] = Path("data/journal/runs.sqlite"),
+    refresh_state_path: Annotated[
+        Path, typer.Option(help="Path to the season refresh state used by --delta")
+    ] = Path(REFRESH_STATE_PATH),
+    pacing: Annotated[
+        PacingPolicy, typer.Option(help="How API calls are paced")
+    ] = PacingPolicy.aimd,
+    requests_per_second: Annotated[
+        float, typer.Option(help="Request rate (start rate for aimd)")
+    ] = 1.0,
+    connect_timeout: Annotated[
+        float, typer.Option(help="Seconds to wait for a connection to the API")
+    ] = 10.0,
+    read_timeout: Annotated[
+        float, typer.Option(help="Seconds to wait for an API response")
+    ] = 30.0,
+    cache: Annotated[
+        bool, typer.Option(help="Cache API responses on local disk")
+    ] = True,
+    cache_path: Annotated[
+        Path, typer.Option(help="Path to the response cache database")
+    ] = Path("data/cache/responses.sqlite"),
+    cache_ttl_hours: Annotated[
+        float, typer.Option(help="Hours before current season responses expire")
+    ] = 12,
+    cache_max_mb: Annotated[
+        int, typer.Option(help="Size cap for the response cache in MB")
+    ] = 2048,
+    output_format: Annotated[
+        OutputFormat, typer.Option("--format", help="File format to save data in")
+    ] = OutputFormat.csv,
+    upload_workers: Annotated[
+        int, typer.Option(help="Number of background upload threads")
+    ] = 4,
+    serialize_workers: Annotated[
+        int,
+        typer.Option(
+            help="Processes that encode files before upload, 0 encodes on the "
+            "fetch threads"
+        ),
+    ] = 0,
+    priority: Annotated[
+        PriorityPolicy,
+        typer.Option(help="Order data is pulled in, so the most valuable lands first"),
+    ] = PriorityPolicy.newest_first,
+    deadline: Annotated[
+        Optional[str],
+        typer.Option(
+            help="Local time (HH:MM) after which no new pull is started, "
+            "anything left is pulled by the next run"
+        ),
+    ] = None,
+    meta_format: Annotated[
+        MetaFormat, typer.Option(help="Format metadata files are read in")
+    ] = MetaFormat.jsonl_gz,
+    metrics_path: Annotated[
+        str, typer.Option(help="Path to save the per-endpoint metrics report")
+    ] = "data/logs/METRICS",
+    prometheus_textfile: Annotated[
+        Optional[Path],
+        typer.Option(help="Also write the metrics to this Prometheus textfile"),
+    ] = None,
 ):
+    # Imported here so --help and the other commands skip nbastatpy and pandas
+    from nba_data_pull.data_pull.dataingest import SeasonIngest
+    from nba_data_pull.data_pull.http_session import build_session
+    from nba_data_pull.data_pull.s3_writer import S3Writer
+
     bucket_name = os.getenv("BUCKET_NAME")
     logger.info(f"Loaded bucket name: {bucket_name}")
 
     logger.info("Setting up client")
     s3 = boto3.client("s3")
+    store = MetadataStore(bucket_name, s3, fmt=meta_format)
 
-    logger.info("Loading data to pull yaml file")
-    data_to_pull = load_yaml_s3(data_to_pull_path, bucket_name, s3_client=s3)
+    logger.info("Loading data to pull")
+    data_to_pull = store.load(data_to_pull_path)
 
     season_error_log_path = f"{season_error_log_path}/{str(date.today())}.yaml"
 
     season_save_folder = f"s3://{bucket_name}/data/nba/SEASON"
 
     season_ids = data_to_pull.get("season")
+    # Endpoints missing from season folders that already exist
+    season_endpoints = data_to_pull.get("endpoints", {}).get("season", {})
+
+    pacer = build_pacer(pacing, requests_per_second)
+    session = build_session(max(10, workers), (connect_timeout, read_timeout))
+    response_cache = build_cache(cache, cache_path, cache_ttl_hours, cache_max_mb)
+    writer = S3Writer(workers=upload_workers, serialize_workers=serialize_workers)
+    journal = open_journal(journal_path, resume, kind="SEASON")
+    metrics = MetricsCollector("SEASON", run_id=journal.run_id)
 
     season_config = {
         "regular_season_pergame": {
             "season_id_list": season_ids.get("per_game").get("regular_season"),
+            "endpoints": season_endpoints.get("per_game", {}).get("regular_season")
+            or {},
             "out_path": f"{season_save_folder}/PER_GAME/REGULAR_SEASON",
+            "inventory_path": ("PER_GAME", "REGULAR_SEASON"),
             "playoffs": False,
             "permode": "PERGAME",
         },
         "playoffs_pergame": {
             "season_id_list": season_ids.get("per_game").get("playoffs"),
+            "endpoints": season_endpoints.get("per_game", {}).get("playoffs") or {},
             "out_path": f"{season_save_folder}/PER_GAME/PLAYOFFS",
+            "inventory_path": ("PER_GAME", "PLAYOFFS"),
             "playoffs": True,
             "permode": "PERGAME",
         },
         "regular_season_perpossession": {
             "season_id_list": season_ids.get("per_possession").get("regular_season"),
+            "endpoints": season_endpoints.get("per_possession", {}).get(
+                "regular_season"
+            )
+            or {},
             "out_path": f"{season_save_folder}/PER_POSSESSION/REGULAR_SEASON",
+            "inventory_path": ("PER_POSSESSION", "REGULAR_SEASON"),
             "playoffs": False,
             "permode": "PER100POSSESSIONS",
         },
         "playoffs_perpossession": {
             "season_id_list": season_ids.get("per_possession").get("playoffs"),
+            "endpoints": season_endpoints.get("per_possession", {}).get("playoffs")
+            or {},
             "out_path": f"{season_save_folder}/PER_POSSESSION/PLAYOFFS",
+            "inventory_path": ("PER_POSSESSION", "PLAYOFFS"),
             "playoffs": True,
             "permode": "PER100POSSESSIONS",
         },
     }
 
-    def save_season_data(
+    def build_season_tasks(
         season_key: Literal[
             "regular_season_pergame",
             "playoffs_pergame",
@@ -149,10 +578,20 @@ def get_season_data(
         ],
         game_ids: Dict,
         season_config: Dict = season_config,
-    ) -> Dict:
-        error_log = {}
+    ) -> List[Task]:
+        tasks = []
         config = season_config[season_key]
-        for season_id in config.get("season_id_list"):
+        if resume:
+            season_id_list = journal.planned(season_key)
+        else:
+            season_id_list = config.get("season_id_list") + [
+                season_id
+                for season_id in config.get("endpoints")
+                if season_id not in config.get("season_id_list")
+            ]
+            journal.plan(season_key, season_id_list)
+
+        for season_id in season_id_list:
             if not game_ids.get(season_id[0:4]):
                 logger.info(f"Skipping {season_id}")
                 continue
@@ -162,40 +601,64 @@ def get_season_data(
                     save_folder=config.get("out_path"),
                     playoffs=config.get("playoffs"),
                     permode=config.get("permode"),
+                    pacer=pacer,
+                    cache=response_cache,
+                    output_format=output_format,
+                    writer=writer,
+                    journal=journal,
+                    endpoints=config.get("endpoints").get(season_id),
+                    metrics=metrics,
                 )
-                season_ingest.save_all_nonsynergy()
-                season_ingest.save_all_synergy()
             except Exception as e:
                 logger.error(f"Error for {season_id} - {e}")
                 error_log[season_key][season_id] = e
                 continue
 
-            sleep(1)
+            tasks.extend(season_ingest.endpoint_tasks(group=season_key))
+        return tasks
 
-        return error_log
-
-    error_log = {}
+    error_log = {season_key: {} for season_key in season_config}
     game_ids = data_to_pull.get("game")
 
-    logger.info("Getting regular_season_pergame")
-    error_log["regular_season_pergame"] = save_season_data(
-        "regular_season_pergame", game_ids=game_ids.get("regular_season")
-    )
+    logger.info("Building season task graph")
+    tasks = []
+    for season_key, config in season_config.items():
+        game_type = "playoffs" if config.get("playoffs") else "regular_season"
+        tasks.extend(build_season_tasks(season_key, game_ids=game_ids.get(game_type)))
 
-    logger.info("Getting playoffs_pergame")
-    error_log["playoffs_pergame"] = save_season_data(
-        "playoffs_pergame", game_ids=game_ids.get("playoffs")
+    logger.info(f"Running {len(tasks)} season endpoints on {workers} workers")
+    scheduler = TaskScheduler(
+        workers=workers, deadline=parse_deadline(deadline) if deadline else None
     )
-
-    logger.info("Getting regular_season_perpossession")
-    error_log["regular_season_perpossession"] = save_season_data(
-        "regular_season_perpossession", game_ids=game_ids.get("regular_season")
+    scheduler.run(
+        prioritize(tasks, priority, SeasonYear.default),
+        description="Pulling seasons",
     )
 
-    logger.info("Getting playoffs perpossession")
-    error_log["playoffs_perpossession"] = save_season_data(
-        "playoffs_perpossession", game_ids=game_ids.get("playoffs")
+    logger.info("Endpoint wall time")
+    scheduler.log_report()
+
+    completions = {"SEASON": {}}
+    completed_entities = scheduler.completed_entities()
+    for season_key, config in season_config.items():
+        per_mode, season_type = config.get("inventory_path")
+        completions["SEASON"].setdefault(per_mode, {})[season_type] = (
+            completed_entities.get(season_key, [])
+        )
+
+    writer.flush()
+    # The journal counts endpoints per folder, i.e. per season and season_config key
+    log_partial(
+        journal,
+        Counter(
+            f"{season_config[task.group]['out_path']}/{task.entity}" for task in tasks
+        ),
     )
+    logger.info(f"Pacing stats: {pacer.stats()}")
+    logger.info(f"HTTP connection stats: {session.stats()}")
+    logger.info(f"Upload stats: {writer.stats()}")
+    if response_cache is not None:
+        logger.info(f"Cache stats: {response_cache.stats()}")
 
     logger.info("Saving error log")
     season_error_content = yaml.dump(error_log, default_flow_style=False)
@@ -205,6 +668,40 @@ def get_season_data(
         Body=season_error_content,
     )
 
+    save_metrics(metrics, writer, bucket_name, s3, metrics_path, prometheus_textfile)
+
+    failed_folders = writer.failed_folders()
+    for per_mode in completions["SEASON"].values():
+        for season_type, season_list in per_mode.items():
+            per_mode[season_type] = [i for i in season_list if i not in failed_folders]
+
+    season_refresh = data_to_pull.get("season_refresh")
+    if season_refresh:
+        # Only folders saved without any failed endpoint count as refreshed
+        failed_tasks = {
+            (result.task.group, result.task.entity)
+            for result in scheduler.results
+            if result.error is not None
+        }
+        refreshed = {}
+        for season_key, config in season_config.items():
+            per_mode, season_type = config.get("inventory_path")
+            refreshed.setdefault(per_mode.lower(), {})[season_type.lower()] = [
+                season_id
+                for season_id in completions["SEASON"][per_mode][season_type]
+                if (season_key, season_id) not in failed_tasks
+            ]
+        try:
+            refresh_state = store.load(refresh_state_path) or {}
+        except s3.exceptions.NoSuchKey:
+            refresh_state = {}
+        update_refresh_state(refresh_state, season_refresh, refreshed, date.today())
+        store.save(refresh_state, refresh_state_path)
+    write_completions(completions, kind="SEASON", bucket=bucket_name, s3_client=s3)
+
+    # Raises if any file failed to upload, after the error log is saved
+    writer.close()
+
 
 @app.command()
 def get_game_data(
@@ -218,7 +715,83 @@ def get_game_data(
         str, typer.Argument(help="Path to save error log")
     ] = "data/logs/GAME/",
     season_year: Annotated[str, typer.Argument(help="Season to pull data for")] = None,
+    workers: Annotated[
+        int, typer.Option(help="Number of games to pull at the same time")
+    ] = 1,
+    resume: Annotated[
+        Optional[str],
+        typer.Option(
+            help="Run id to resume. Only endpoints it did not save are pulled"
+        ),
+    ] = None,
+    journal_path: Annotated[
+        Path, typer.Option(help="Path to the run journal database")
+    ] = Path("data/journal/runs.sqlite"),
+    pacing: Annotated[
+        PacingPolicy, typer.Option(help="How API calls are paced")
+    ] = PacingPolicy.aimd,
+    requests_per_second: Annotated[
+        float,
+        typer.Option(help="Request rate shared by all workers (start rate for aimd)"),
+    ] = 1.0,
+    connect_timeout: Annotated[
+        float, typer.Option(help="Seconds to wait for a connection to the API")
+    ] = 10.0,
+    read_timeout: Annotated[
+        float, typer.Option(help="Seconds to wait for an API response")
+    ] = 30.0,
+    cache: Annotated[
+        bool, typer.Option(help="Cache API responses on local disk")
+    ] = True,
+    cache_path: Annotated[
+        Path, typer.Option(help="Path to the response cache database")
+    ] = Path("data/cache/responses.sqlite"),
+    cache_ttl_hours: Annotated[
+        float, typer.Option(help="Hours before current season responses expire")
+    ] = 12,
+    cache_max_mb: Annotated[
+        int, typer.Option(help="Size cap for the response cache in MB")
+    ] = 2048,
+    output_format: Annotated[
+        OutputFormat, typer.Option("--format", help="File format to save data in")
+    ] = OutputFormat.csv,
+    upload_workers: Annotated[
+        int, typer.Option(help="Number of background upload threads")
+    ] = 4,
+    serialize_workers: Annotated[
+        int,
+        typer.Option(
+            help="Processes that encode files before upload, 0 encodes on the "
+            "fetch threads"
+        ),
+    ] = 0,
+    priority: Annotated[
+        PriorityPolicy,
+        typer.Option(help="Order data is pulled in, so the most valuable lands first"),
+    ] = PriorityPolicy.newest_first,
+    deadline: Annotated[
+        Optional[str],
+        typer.Option(
+            help="Local time (HH:MM) after which no new pull is started, "
+            "anything left is pulled by the next run"
+        ),
+    ] = None,
+    meta_format: Annotated[
+        MetaFormat, typer.Option(help="Format metadata files are read in")
+    ] = MetaFormat.jsonl_gz,
+    metrics_path: Annotated[
+        str, typer.Option(help="Path to save the per-endpoint metrics report")
+    ] = "data/logs/METRICS",
+    prometheus_textfile: Annotated[
+        Optional[Path],
+        typer.Option(help="Also write the metrics to this Prometheus textfile"),
+    ] = None,
 ):
+    # Imported here so --help and the other commands skip nbastatpy and pandas
+    from nba_data_pull.data_pull.dataingest import GameIngest
+    from nba_data_pull.data_pull.http_session import build_session
+    from nba_data_pull.data_pull.s3_writer import S3Writer
+
     bucket_name = os.getenv("BUCKET_NAME")
     logger.info(f"Loaded bucket name: {bucket_name}")
 
@@ -241,69 +814,118 @@ def get_game_data(
 
     logger.info("Setting up s3 client")
     s3 = boto3.client("s3")
+    store = MetadataStore(bucket_name, s3, fmt=meta_format)
 
-    logger.info("Loading data to pull yaml file")
-    data_to_pull = load_yaml_s3(data_to_pull_path, bucket_name, s3_client=s3)
+    logger.info("Loading data to pull")
+    data_to_pull = store.load(data_to_pull_path)
 
     game_ids_regular_season = data_to_pull.get("game").get("regular_season")
     game_ids_playoffs = data_to_pull.get("game").get("playoffs")
 
-    inventory = load_yaml_s3(inventory_path, bucket_name, s3_client=s3)
+    inventory = store.load(inventory_path)
 
-    inventory_game_ids_regular_season = inventory.get("GAME").get("REGULAR_SEASON")
-    inventory_game_ids_playoffs = inventory.get("GAME").get("PLAYOFFS")
+    inventory_index = InventoryIndex(inventory)
 
     logger.info("Getting data that needs to be pulled")
-    game_ids_regular_season_topull = [
-        game_id
-        for game_id in game_ids_regular_season[season_year]
-        if game_id not in inventory_game_ids_regular_season
-    ]
-    game_ids_playoffs_topull = [
-        game_id
-        for game_id in game_ids_playoffs[season_year]
-        if game_id not in inventory_game_ids_playoffs
-    ]
-
-    error_log = {}
+    regular_season_diff = inventory_index.diff(
+        ("GAME", "REGULAR_SEASON"),
+        {season_year: game_ids_regular_season.get(season_year, [])},
+    )
+    playoffs_diff = inventory_index.diff(
+        ("GAME", "PLAYOFFS"), {season_year: game_ids_playoffs.get(season_year, [])}
+    )
+    logger.info(f"Regular season games: {regular_season_diff.per_season}")
+    logger.info(f"Playoff games: {playoffs_diff.per_season}")
+
+    # Endpoints missing from game folders that already exist, for this season only
+    game_endpoints = {
+        game_type: {
+            game_id: tables
+            for game_id, tables in (games or {}).items()
+            if str(season_year_from_game_id(game_id)) == season_year
+        }
+        for game_type, games in data_to_pull.get("endpoints", {})
+        .get("game", {})
+        .items()
+    }
+    regular_season_endpoints = game_endpoints.get("regular_season", {})
+    playoffs_endpoints = game_endpoints.get("playoffs", {})
+    logger.info(
+        f"Partly saved games: {len(regular_season_endpoints)} regular season, "
+        f"{len(playoffs_endpoints)} playoffs"
+    )
 
-    game_ids_regular_season = data_to_pull.get("game").get("regular_season")
-    game_ids_playoffs = data_to_pull.get("game").get("playoffs")
+    journal = open_journal(journal_path, resume, kind="GAME")
+    if resume:
+        # The inventory lists partly written folders, so resume from the original plan
+        game_ids_regular_season_topull = journal.planned("regular_season")
+        game_ids_playoffs_topull = journal.planned("playoffs")
+    else:
+        # Partly saved games are in the inventory, so they are never in missing
+        game_ids_regular_season_topull = regular_season_diff.missing + list(
+            regular_season_endpoints
+        )
+        game_ids_playoffs_topull = playoffs_diff.missing + list(playoffs_endpoints)
+        journal.plan("regular_season", game_ids_regular_season_topull)
+        journal.plan("playoffs", game_ids_playoffs_topull)
+
+    logger.info(f"Using {workers} workers with {pacing.value} pacing")
+    pacer = build_pacer(pacing, requests_per_second)
+    session = build_session(max(10, workers), (connect_timeout, read_timeout))
+    response_cache = build_cache(cache, cache_path, cache_ttl_hours, cache_max_mb)
+    writer = S3Writer(workers=upload_workers, serialize_workers=serialize_workers)
+    metrics = MetricsCollector("GAME", run_id=journal.run_id)
+
+    pulls = {
+        "regular_season": (
+            game_ids_regular_season_topull,
+            regular_season_path,
+            regular_season_endpoints,
+        ),
+        "playoffs": (game_ids_playoffs_topull, playoffs_path, playoffs_endpoints),
+    }
+    if priority != PriorityPolicy.fifo:
+        # Playoff games are the latest games of a season
+        pulls = dict(reversed(pulls.items()))
 
+    deadline_ts = parse_deadline(deadline) if deadline else None
     error_log = {}
-
-    error_log["regular_season"] = {}
-    for game_id in game_ids_regular_season_topull:
-        logger.info(f"Game ID: {game_id}")
-        try:
-            game_ingest = GameIngest(
-                game_id=game_id,
-                save_folder=regular_season_path,
-                verbose=True,
-            )
-            game_ingest.save_all()
-
-        except Exception as e:
-            logger.error(f"Error for {game_id} - {e}")
-            error_log["regular_season"][game_id] = e
-            continue
-        sleep(1)
-
-    error_log["playoffs"] = {}
-    for game_id in game_ids_playoffs_topull:
-        logger.info(f"Game ID: {game_id}")
-        try:
-            game_ingest = GameIngest(
-                game_id=game_id,
-                save_folder=playoffs_path,
-                verbose=True,
+    completed = {}
+    for game_type, (game_ids, save_folder, endpoints) in pulls.items():
+        logger.info(f"Pulling {game_type.replace('_', ' ')} games")
+        error_log[game_type], completed[game_type] = pull_games(
+            game_ids,
+            save_folder=save_folder,
+            workers=workers,
+            pacer=pacer,
+            cache=response_cache,
+            output_format=output_format,
+            writer=writer,
+            journal=journal,
+            endpoints=endpoints,
+            metrics=metrics,
+            priority=priority,
+            deadline=deadline_ts,
+        )
+    completed_regular_season = completed["regular_season"]
+    completed_playoffs = completed["playoffs"]
+
+    writer.flush()
+    log_partial(
+        journal,
+        {
+            f"{save_folder}/{game_id}": len(
+                endpoints.get(game_id) or GameIngest.endpoints
             )
-            game_ingest.save_all()
-        except Exception as e:
-            logger.info(f"Error for {game_id} - {e}")
-            error_log["playoffs"][game_id] = e
-            continue
-        sleep(1)
+            for game_ids, save_folder, endpoints in pulls.values()
+            for game_id in game_ids
+        },
+    )
+    logger.info(f"Pacing stats: {pacer.stats()}")
+    logger.info(f"HTTP connection stats: {session.stats()}")
+    logger.info(f"Upload stats: {writer.stats()}")
+    if response_cache is not None:
+        logger.info(f"Cache stats: {response_cache.stats()}")
 
     logger.info("Saving error log")
     game_error_content = yaml.dump(error_log, default_flow_style=False)
@@ -313,6 +935,22 @@ def get_game_data(
         Body=game_error_content,
     )
 
+    save_metrics(metrics, writer, bucket_name, s3, metrics_path, prometheus_textfile)
+
+    failed_folders = writer.failed_folders()
+    completions = {
+        "GAME": {
+            "REGULAR_SEASON": [
+                i for i in completed_regular_season if i not in failed_folders
+            ],
+            "PLAYOFFS": [i for i in completed_playoffs if i not in failed_folders],
+        }
+    }
+    write_completions(completions, kind="GAME", bucket=bucket_name, s3_client=s3)
+
+    # Raises if any file failed to upload, after the error log is saved
+    writer.close()
+
 
 if __name__ == "__main__":
     app()
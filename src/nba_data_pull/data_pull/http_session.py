@@ -0,0 +1,107 @@
+import threading
+
+import requests
+from nba_api.stats.library.http import NBAStatsHTTP
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+from typing_extensions import Tuple
+
+
+class PooledSession(requests.Session):
+    """
+    requests session shared by every nba_api call in a run, so TCP and TLS
+    connections to stats.nba.com are kept alive and reused instead of being
+    opened for each endpoint.
+
+    nba_api asks for brotli responses in its default headers, which requests
+    can only decode if the brotli package is installed. The Accept-Encoding
+    header is replaced with the encodings requests can decode.
+
+    :param pool_size: Connections kept open per host. Should be at least the
+        number of threads making API calls, or extra connections are dropped
+        after every request.
+    :param connect_timeout: Seconds to wait for a connection.
+    :param read_timeout: Seconds to wait for a response, replacing the
+        timeout nba_api passes with each call.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 30.0,
+    ):
+        super().__init__()
+        self.timeout = (connect_timeout, read_timeout)
+        self.adapter = HTTPAdapter(
+            pool_connections=4, pool_maxsize=max(1, pool_size), pool_block=False
+        )
+        self.mount("https://", self.adapter)
+        self.mount("http://", self.adapter)
+        self.headers["Accept-Encoding"] = DEFAULT_ACCEPT_ENCODING
+
+        self.requests_sent = 0
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        kwargs["timeout"] = self.timeout
+        headers = kwargs.get("headers")
+        if headers:
+            headers = dict(headers)
+            headers["Accept-Encoding"] = DEFAULT_ACCEPT_ENCODING
+            kwargs["headers"] = headers
+        with self._lock:
+            self.requests_sent += 1
+        return super().request(method, url, **kwargs)
+
+    def stats(self) -> dict:
+        """
+        Returns requests sent and connections opened over the session's life.
+        Every request above the connection count reused a kept-alive connection.
+        """
+        connections = 0
+        pool_requests = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += pool.num_connections
+            pool_requests += pool.num_requests
+
+        with self._lock:
+            sent = self.requests_sent
+        return {
+            "requests": sent,
+            "connections": connections,
+            "reused": max(0, pool_requests - connections),
+            "reuse_rate": round(1 - connections / pool_requests, 3)
+            if pool_requests
+            else 0.0,
+        }
+
+
+def install_session(session: requests.Session) -> requests.Session:
+    """
+    Makes every nba_api endpoint call in this process use the session.
+
+    :return: The session that was installed before, to restore it later.
+    """
+    previous = NBAStatsHTTP._session
+    NBAStatsHTTP.set_session(session)
+    return previous
+
+
+def build_session(
+    pool_size: int = 10, timeouts: Tuple[float, float] = (10.0, 30.0)
+) -> PooledSession:
+    """
+    Creates the pooled session used by the CLI commands and installs it for nba_api.
+
+    :param timeouts: (connect, read) seconds.
+    """
+    session = PooledSession(
+        pool_size=pool_size, connect_timeout=timeouts[0], read_timeout=timeouts[1]
+    )
+    install_session(session)
+    return session
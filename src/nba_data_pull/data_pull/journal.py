@@ -0,0 +1,156 @@
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from time import time
+
+from typing_extensions import Dict, Iterable, List, Optional
+
+
+def new_run_id() -> str:
+    """
+    Returns a run id that sorts by start time, e.g. 20250301T120000_1a2b3c.
+    """
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    return f"{timestamp}_{uuid.uuid4().hex[:6]}"
+
+
+class RunJournal:
+    """
+    Durable record of what a run planned and which endpoints it finished.
+
+    Completion is kept per (entity, endpoint), where the entity is the folder
+    an ingest object saves into. Rows are committed as each file is saved, so
+    a run killed halfway can be resumed with the same run id and only redo the
+    missing endpoints.
+
+    :param path: Path to the SQLite file. Parent folders are created if needed.
+    :param run_id: Id of the run to resume. A new id is generated if None.
+    """
+
+    def __init__(self, path: Path, run_id: Optional[str] = None):
+        self.path = Path(path)
+        self.run_id = run_id or new_run_id()
+
+        self._lock = threading.Lock()
+        self._connection = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    started REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS planned (
+                    run_id TEXT NOT NULL,
+                    grp TEXT NOT NULL,
+                    entity TEXT NOT NULL,
+                    PRIMARY KEY (run_id, grp, entity)
+                );
+                CREATE TABLE IF NOT EXISTS completed (
+                    run_id TEXT NOT NULL,
+                    entity TEXT NOT NULL,
+                    endpoint TEXT NOT NULL,
+                    finished REAL NOT NULL,
+                    PRIMARY KEY (run_id, entity, endpoint)
+                );
+                """
+            )
+            self._connection.commit()
+        return self._connection
+
+    def exists(self) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM runs WHERE run_id = ?", (self.run_id,)
+            ).fetchone()
+        return row is not None
+
+    def start(self, kind: str) -> None:
+        """
+        Registers the run. Does nothing if the run already exists.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO runs VALUES (?, ?, ?)",
+                (self.run_id, kind, time()),
+            )
+            self._conn.commit()
+
+    def plan(self, group: str, entities: Iterable[str]) -> None:
+        """
+        Records the ids a run is going to pull so a resume pulls the same list.
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO planned VALUES (?, ?, ?)",
+                [(self.run_id, group, str(entity)) for entity in entities],
+            )
+            self._conn.commit()
+
+    def planned(self, group: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT entity FROM planned WHERE run_id = ? AND grp = ? "
+                "ORDER BY rowid",
+                (self.run_id, group),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def record(self, entity: str, endpoint: str) -> None:
+        """
+        Marks an endpoint of an entity as saved.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completed VALUES (?, ?, ?, ?)",
+                (self.run_id, str(entity), endpoint, time()),
+            )
+            self._conn.commit()
+
+    def is_done(self, entity: str, endpoint: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM completed "
+                "WHERE run_id = ? AND entity = ? AND endpoint = ?",
+                (self.run_id, str(entity), endpoint),
+            ).fetchone()
+        return row is not None
+
+    def progress(self) -> Dict[str, int]:
+        """
+        Returns the number of saved endpoints per entity.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT entity, COUNT(*) FROM completed WHERE run_id = ? "
+                "GROUP BY entity",
+                (self.run_id,),
+            ).fetchall()
+        return dict(rows)
+
+    def partial_entities(self, expected_endpoints: Dict[str, int]) -> Dict[str, int]:
+        """
+        Returns entities with some but not all endpoints saved, i.e. partly
+        written folders.
+
+        :param expected_endpoints: Number of endpoints the run pulls for each entity.
+        """
+        return {
+            entity: count
+            for entity, count in self.progress().items()
+            if count < expected_endpoints.get(entity, 0)
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,187 @@
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from time import monotonic
+
+from typing_extensions import Dict, List, Optional
+
+
+class MetricsCollector:
+    """
+    Collects one record per endpoint save (API latency, serialization time,
+    rows, bytes and outcome) and builds the run report.
+
+    Upload time is measured by the S3Writer threads and joined on the file path
+    when the report is built, after the writer is flushed.
+
+    :param kind: Name of the ingest command (GAME, PLAYER or SEASON).
+    :param run_id: Id of the run, if there is one.
+    """
+
+    def __init__(self, kind: str, run_id: Optional[str] = None):
+        self.kind = kind
+        self.run_id = run_id
+        self.started = datetime.now(timezone.utc)
+        self._start = monotonic()
+        self._lock = threading.Lock()
+        self.records: List[Dict] = []
+
+    @staticmethod
+    def new_record(entity: str, endpoint: str) -> Dict:
+        return {
+            "entity": str(entity),
+            "endpoint": endpoint,
+            "outcome": None,
+            "error": None,
+            "api_seconds": 0.0,
+            "serialize_seconds": 0.0,
+            "upload_seconds": None,
+            "rows": None,
+            "bytes": None,
+            "path": None,
+        }
+
+    def record(self, record: Dict) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def _finalize(
+        self, upload_times: Optional[Dict[str, float]] = None, failed_uploads=()
+    ) -> List[Dict]:
+        upload_times = upload_times or {}
+        failed_uploads = set(failed_uploads)
+        with self._lock:
+            records = [dict(record) for record in self.records]
+
+        for record in records:
+            path = record["path"]
+            if path in upload_times:
+                record["upload_seconds"] = round(upload_times[path], 4)
+            if path in failed_uploads:
+                record["outcome"] = "upload_failed"
+        return records
+
+    @staticmethod
+    def summarize(records: List[Dict]) -> Dict[str, Dict]:
+        """
+        Totals the records per endpoint, slowest API time first.
+        """
+        summary: Dict[str, Dict] = {}
+        for record in records:
+            row = summary.setdefault(
+                record["endpoint"],
+                {
+                    "calls": 0,
+                    "outcomes": {},
+                    "api_seconds": 0.0,
+                    "serialize_seconds": 0.0,
+                    "upload_seconds": 0.0,
+                    "rows": 0,
+                    "bytes": 0,
+                },
+            )
+            row["calls"] += 1
+            row["outcomes"][record["outcome"]] = (
+                row["outcomes"].get(record["outcome"], 0) + 1
+            )
+            for key in ("api_seconds", "serialize_seconds", "upload_seconds"):
+                row[key] += record[key] or 0.0
+            for key in ("rows", "bytes"):
+                row[key] += record[key] or 0
+
+        for row in summary.values():
+            for key in ("api_seconds", "serialize_seconds", "upload_seconds"):
+                row[key] = round(row[key], 3)
+
+        return dict(
+            sorted(
+                summary.items(), key=lambda item: item[1]["api_seconds"], reverse=True
+            )
+        )
+
+    def report(
+        self, upload_times: Optional[Dict[str, float]] = None, failed_uploads=()
+    ) -> Dict:
+        """
+        Builds the run report.
+
+        :param upload_times: Path -> upload seconds, from S3Writer.upload_times.
+        :param failed_uploads: Paths whose upload failed.
+        """
+        records = self._finalize(upload_times, failed_uploads)
+        return {
+            "kind": self.kind,
+            "run_id": self.run_id,
+            "started": self.started.isoformat(),
+            "finished": datetime.now(timezone.utc).isoformat(),
+            "wall_seconds": round(monotonic() - self._start, 3),
+            "endpoints": self.summarize(records),
+            "records": records,
+        }
+
+
+def report_json(report: Dict) -> str:
+    return json.dumps(report, indent=2, default=str)
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def prometheus_text(report: Dict) -> str:
+    """
+    Formats a run report in the Prometheus text exposition format.
+    """
+    kind = _label(report["kind"])
+    lines = [
+        "# HELP nba_ingest_run_wall_seconds Wall time of the last ingest run.",
+        "# TYPE nba_ingest_run_wall_seconds gauge",
+        f'nba_ingest_run_wall_seconds{{kind="{kind}"}} {report["wall_seconds"]}',
+    ]
+
+    gauges = {
+        "api_seconds": "API time including pacing and retries",
+        "serialize_seconds": "Time spent serializing files",
+        "upload_seconds": "Time spent uploading files",
+        "rows": "Rows saved",
+        "bytes": "Bytes saved",
+    }
+    lines += [
+        "# HELP nba_ingest_endpoint_calls Endpoint saves in the last run by outcome.",
+        "# TYPE nba_ingest_endpoint_calls gauge",
+    ]
+    for endpoint, row in report["endpoints"].items():
+        for outcome, count in row["outcomes"].items():
+            lines.append(
+                f'nba_ingest_endpoint_calls{{kind="{kind}",'
+                f'endpoint="{_label(endpoint)}",outcome="{_label(outcome)}"}} {count}'
+            )
+
+    for key, description in gauges.items():
+        name = f"nba_ingest_endpoint_{key}"
+        lines += [
+            f"# HELP {name} {description} in the last run.",
+            f"# TYPE {name} gauge",
+        ]
+        for endpoint, row in report["endpoints"].items():
+            lines.append(
+                f'{name}{{kind="{kind}",endpoint="{_label(endpoint)}"}} {row[key]}'
+            )
+
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_textfile(report: Dict, path: Path) -> None:
+    """
+    Writes the report for the node exporter textfile collector. The file is
+    renamed into place so the collector never reads a partial file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        f.write(prometheus_text(report))
+    os.replace(tmp_path, path)
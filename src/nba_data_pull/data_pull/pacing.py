@@ -0,0 +1,296 @@
+import json
+import random
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from enum import Enum
+from time import monotonic, sleep
+
+from nba_data_pull.data_pull.rate_limit import TokenBucket
+from nba_data_pull.lazy_imports import lazy_import
+
+requests = lazy_import("requests")
+
+# Status codes stats.nba.com returns when it is throttling or overloaded
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class PacingPolicy(str, Enum):
+    fixed = "fixed"
+    bucket = "bucket"
+    aimd = "aimd"
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Checks if an error looks like throttling or a transient network problem.
+
+    :param error: Exception raised by an endpoint call.
+    :return: True if the call is worth retrying after a backoff.
+    """
+    if isinstance(
+        error,
+        (
+            requests.exceptions.Timeout,
+            requests.exceptions.ConnectionError,
+            ConnectionResetError,
+            TimeoutError,
+        ),
+    ):
+        return True
+
+    # nba_api does not raise on a throttled response, it fails to parse the body instead
+    if isinstance(error, json.JSONDecodeError):
+        return True
+
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+def percentile(values: list, q: float) -> float:
+    """
+    Returns the q-th percentile (0-100) of a list using nearest-rank.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1))))
+    return ordered[rank]
+
+
+class Pacer(ABC):
+    """
+    Base pacing controller. Wraps every API call so pacing, retries and
+    latency tracking happen in one place and can be shared across workers.
+
+    :param max_retries: Number of times a retryable error is retried.
+    :param latency_window: Number of recent call latencies kept for percentiles.
+    """
+
+    policy = None
+
+    def __init__(self, max_retries: int = 0, latency_window: int = 1000):
+        self.max_retries = max_retries
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self._latencies = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+
+    @property
+    @abstractmethod
+    def rate(self) -> float:
+        """Calls per second this pacer currently allows"""
+
+    def before_call(self) -> None:
+        """Waits until a call is allowed. No wait unless a subclass overrides it."""
+
+    def on_success(self, latency: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self._latencies.append(latency)
+
+    def on_error(self, error: Exception, retryable: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.failures += 1
+
+    def backoff(self, attempt: int) -> float:
+        return 0.0
+
+    def call(self, func, *args, **kwargs):
+        """
+        Calls func under the pacing policy, retrying throttled or timed out calls.
+
+        :param func: Function that makes one API request.
+        :return: Whatever func returns.
+        """
+        attempt = 0
+        while True:
+            self.before_call()
+            start = monotonic()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                retryable = is_retryable(e)
+                self.on_error(e, retryable)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                sleep(self.backoff(attempt))
+                continue
+
+            self.on_success(monotonic() - start)
+            return result
+
+    def stats(self) -> dict:
+        """
+        Returns the current rate, call and retry counts, and latency percentiles.
+        """
+        with self._lock:
+            latencies = list(self._latencies)
+            calls, retries, failures = self.calls, self.retries, self.failures
+
+        return {
+            "policy": self.policy,
+            "rate": round(self.rate, 3),
+            "calls": calls,
+            "retries": retries,
+            "failures": failures,
+            "latency_p50": round(percentile(latencies, 50), 3),
+            "latency_p90": round(percentile(latencies, 90), 3),
+            "latency_p99": round(percentile(latencies, 99), 3),
+        }
+
+
+class FixedPacer(Pacer):
+    """
+    Sleeps a fixed delay after every successful call. This is the original
+    sleep(1) behavior, kept for comparison.
+
+    Workers share one schedule: each success reserves the next slot, one delay
+    after the last one, so N workers together still make one call per delay.
+
+    :param delay: Seconds between calls.
+    """
+
+    policy = PacingPolicy.fixed.value
+
+    def __init__(self, delay: float = 1.0, max_retries: int = 0):
+        super().__init__(max_retries=max_retries)
+        self.delay = delay
+        self._next_slot = 0.0
+
+    @property
+    def rate(self) -> float:
+        return 1 / self.delay if self.delay else float("inf")
+
+    def on_success(self, latency: float) -> None:
+        super().on_success(latency)
+        with self._lock:
+            now = monotonic()
+            self._next_slot = max(self._next_slot, now) + self.delay
+            wait = self._next_slot - now
+        sleep(wait)
+
+
+class TokenBucketPacer(Pacer):
+    """
+    Spends one token from a shared bucket before every call.
+
+    :param requests_per_second: Rate the bucket is refilled at.
+    :param max_retries: Number of times a retryable error is retried.
+    :param base_backoff: Starting backoff in seconds, doubled every retry.
+    :param max_backoff: Upper bound on a single backoff in seconds.
+    """
+
+    policy = PacingPolicy.bucket.value
+
+    def __init__(
+        self,
+        requests_per_second: float = 1.0,
+        max_retries: int = 3,
+        base_backoff: float = 2.0,
+        max_backoff: float = 60.0,
+    ):
+        super().__init__(max_retries=max_retries)
+        self.bucket = TokenBucket(rate=requests_per_second)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def before_call(self) -> None:
+        self.bucket.acquire()
+
+    def backoff(self, attempt: int) -> float:
+        # Equal jitter so workers that failed together do not retry together
+        ceiling = min(self.max_backoff, self.base_backoff * 2 ** (attempt - 1))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+class AIMDPacer(TokenBucketPacer):
+    """
+    Additive-increase / multiplicative-decrease pacing. The request rate grows
+    a little after every success and is cut when the API throttles us.
+
+    :param requests_per_second: Starting rate.
+    :param min_rate: Lowest rate the controller will back off to.
+    :param max_rate: Highest rate the controller will speed up to.
+    :param increase: Requests per second added after each successful call.
+    :param decrease: Factor the rate is multiplied by on a retryable error.
+    :param cooldown: Seconds after a decrease where further errors do not
+        decrease again.
+    """
+
+    policy = PacingPolicy.aimd.value
+
+    def __init__(
+        self,
+        requests_per_second: float = 1.0,
+        min_rate: float = 0.2,
+        max_rate: float = 4.0,
+        increase: float = 0.05,
+        decrease: float = 0.5,
+        cooldown: float = 5.0,
+        max_retries: int = 3,
+        base_backoff: float = 2.0,
+        max_backoff: float = 60.0,
+    ):
+        super().__init__(
+            requests_per_second=requests_per_second,
+            max_retries=max_retries,
+            base_backoff=base_backoff,
+            max_backoff=max_backoff,
+        )
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._last_decrease = None
+
+    def on_success(self, latency: float) -> None:
+        super().on_success(latency)
+        # Under the same lock as the decrease, so concurrent workers do not
+        # lose increases or undo a backoff that just happened
+        with self._lock:
+            self.bucket.set_rate(min(self.max_rate, self.bucket.rate + self.increase))
+
+    def on_error(self, error: Exception, retryable: bool) -> None:
+        super().on_error(error, retryable)
+        if not retryable:
+            return
+
+        with self._lock:
+            now = monotonic()
+            if (
+                self._last_decrease is not None
+                and now - self._last_decrease < self.cooldown
+            ):
+                return
+            self._last_decrease = now
+            self.bucket.set_rate(max(self.min_rate, self.bucket.rate * self.decrease))
+
+
+def build_pacer(
+    policy: PacingPolicy = PacingPolicy.aimd, requests_per_second: float = 1.0
+) -> Pacer:
+    """
+    Creates a pacer for the given policy.
+
+    :param policy: One of fixed, bucket or aimd.
+    :param requests_per_second: Rate for bucket, starting rate for aimd,
+        and 1 / delay for fixed.
+    :return: A pacer to share across all ingest objects in a run.
+    """
+    policy = PacingPolicy(policy)
+    if policy == PacingPolicy.fixed:
+        return FixedPacer(delay=1 / requests_per_second)
+    if policy == PacingPolicy.bucket:
+        return TokenBucketPacer(requests_per_second=requests_per_second)
+    return AIMDPacer(requests_per_second=requests_per_second)
@@ -0,0 +1,73 @@
+import threading
+from time import monotonic, sleep
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to share one request budget across ingest workers.
+
+    :param rate: Number of tokens (requests) added per second.
+    :param capacity: Maximum number of tokens that can be banked for a burst.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = self.capacity
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Changes the refill rate. Tokens banked at the old rate are kept.
+
+        :param rate: New number of tokens added per second.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        with self._lock:
+            self._refill()
+            self.rate = float(rate)
+
+    def try_acquire(self) -> bool:
+        """
+        Takes a token if one is available without blocking.
+
+        :return: True if a token was taken.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> float:
+        """
+        Blocks until a token is available and takes it.
+
+        :return: Number of seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait_time = (1 - self._tokens) / self.rate
+
+            sleep(wait_time)
+            waited += wait_time
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+from time import time
+
+from typing_extensions import Optional
+
+# Returned by `get` so a cached None can be told apart from a miss
+MISS = object()
+
+
+class ResponseCache:
+    """
+    On-disk cache of endpoint responses stored in SQLite.
+
+    Entries are keyed by endpoint name and parameters. Finished seasons never
+    expire, anything tied to the current season expires after
+    `current_season_ttl_hours`. When the cache grows past `max_bytes` the least
+    recently used entries are evicted.
+
+    :param path: Path to the SQLite file. Parent folders are created if needed.
+    :param current_season_ttl_hours: Hours before current season responses expire.
+    :param max_bytes: Size cap for all cached responses.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        current_season_ttl_hours: float = 12,
+        max_bytes: int = 2 * 1024**3,
+    ):
+        self.path = Path(path)
+        self.current_season_ttl = current_season_ttl_hours * 3600
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._connection = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Opened on first use, so a cache that is never used touches nothing on disk
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires REAL,
+                    accessed REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+            self._connection.commit()
+        return self._connection
+
+    @staticmethod
+    def make_key(endpoint: str, params: tuple) -> str:
+        raw = json.dumps([endpoint, list(params)], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def ttl_for_season(self, season_year=None):
+        """
+        Returns the TTL in seconds for a response from the given season.
+
+        :param season_year: Starting year of the season, or None if the response
+            is not tied to one.
+        :return: None (never expires) for finished seasons, otherwise the
+            current season TTL.
+        """
+        # nbastatpy.utils imports pandas, which commands without API calls skip
+        from nbastatpy.utils import Formatter
+
+        if season_year is not None and int(season_year) < int(
+            Formatter.get_current_season_year()
+        ):
+            return None
+        return self.current_season_ttl
+
+    def get(self, endpoint: str, params: tuple):
+        """
+        Looks up a cached response.
+
+        :return: The cached value, or MISS if it is not cached or has expired.
+        """
+        key = self.make_key(endpoint, params)
+        now = time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or (row[1] is not None and row[1] <= now):
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return MISS
+
+            self._conn.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return pickle.loads(row[0])
+
+    def set(
+        self, endpoint: str, params: tuple, value, ttl: Optional[float] = None
+    ) -> None:
+        """
+        Stores a response and evicts least recently used entries if over the size cap.
+
+        :param ttl: Seconds until the entry expires. None means it never expires.
+        """
+        key = self.make_key(endpoint, params)
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time()
+        expires = now + ttl if ttl is not None else None
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, blob, len(blob), expires, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def get_or_fetch(
+        self, endpoint: str, params: tuple, fetch, ttl: Optional[float] = None
+    ):
+        """
+        Returns the cached response, calling `fetch` and caching its result on a miss.
+        """
+        value = self.get(endpoint, params)
+        if value is MISS:
+            value = fetch()
+            self.set(endpoint, params, value, ttl=ttl)
+        return value
+
+    def _evict(self) -> None:
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        to_delete = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed ASC"
+        ):
+            if total <= self.max_bytes:
+                break
+            to_delete.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", to_delete)
+        self.evictions += len(to_delete)
+
+    def stats(self) -> dict:
+        """
+        Returns hit, miss and eviction counters plus the current cache size.
+        """
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def build_cache(
+    enabled: bool, path: Path, ttl_hours: float, max_mb: int
+) -> ResponseCache:
+    """
+    Creates the response cache used by the CLI commands, or None if disabled.
+    """
+    if not enabled:
+        return None
+    return ResponseCache(
+        path, current_season_ttl_hours=ttl_hours, max_bytes=max_mb * 1024**2
+    )
@@ -0,0 +1,245 @@
+import io
+import queue
+import threading
+from concurrent.futures import Future
+from functools import partial
+from pathlib import Path
+from time import monotonic
+
+import pandas as pd
+from loguru import logger
+from typing_extensions import Callable, Optional
+
+from nba_data_pull.data_pull.schemas import OutputFormat
+from nba_data_pull.data_pull.serialize_pool import SerializePool
+from nba_data_pull.lazy_imports import lazy_import
+
+boto3 = lazy_import("boto3")
+
+
+class UploadError(RuntimeError):
+    """Raised when a run finishes with uploads that never made it to S3"""
+
+
+def split_s3_path(path: str):
+    """
+    Splits an s3://bucket/key path into bucket and key.
+    """
+    bucket, _, key = path[len("s3://") :].partition("/")
+    return bucket, key
+
+
+class S3Writer:
+    """
+    Uploads serialized files on background threads so the next API call can
+    start while the previous file is still uploading.
+
+    One boto3 client (and its connection pool) is shared by every upload thread.
+    Files larger than the multipart threshold are uploaded in parts. Paths that
+    do not start with s3:// are written to local disk.
+
+    :param s3_client: boto3 S3 client. A pooled client is created if None.
+    :param workers: Number of upload threads.
+    :param max_queue: Maximum files waiting to upload before `submit` blocks.
+    :param multipart_threshold_mb: Files at least this large use multipart uploads.
+    :param multipart_chunksize_mb: Size of each part in a multipart upload.
+    :param serialize_workers: Processes that encode frames given to `submit_frame`.
+        0 encodes them on the calling thread.
+    """
+
+    def __init__(
+        self,
+        s3_client=None,
+        workers: int = 4,
+        max_queue: int = 32,
+        multipart_threshold_mb: int = 16,
+        multipart_chunksize_mb: int = 16,
+        serialize_workers: int = 0,
+    ):
+        self.workers = workers
+        self.multipart_threshold = multipart_threshold_mb * 1024**2
+        self.multipart_chunksize = multipart_chunksize_mb * 1024**2
+        self._s3 = s3_client
+        self._transfer_config = None
+        self.serializer = (
+            SerializePool(serialize_workers) if serialize_workers > 0 else None
+        )
+
+        self.files_uploaded = 0
+        self.bytes_uploaded = 0
+        self.failed = {}
+        # Seconds each successful upload took, by path
+        self.upload_times = {}
+
+        self._started = None
+        self._lock = threading.Lock()
+        self._client_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._threads = [
+            threading.Thread(target=self._worker, daemon=True) for _ in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def s3(self):
+        # Created on first upload so local-only writers never set up a client
+        with self._client_lock:
+            if self._s3 is None:
+                from botocore.config import Config
+
+                self._s3 = boto3.client(
+                    "s3",
+                    config=Config(max_pool_connections=max(10, self.workers * 2)),
+                )
+        return self._s3
+
+    @property
+    def transfer_config(self):
+        with self._client_lock:
+            if self._transfer_config is None:
+                from boto3.s3.transfer import TransferConfig
+
+                self._transfer_config = TransferConfig(
+                    multipart_threshold=self.multipart_threshold,
+                    multipart_chunksize=self.multipart_chunksize,
+                    max_concurrency=self.workers,
+                    use_threads=True,
+                )
+        return self._transfer_config
+
+    def submit(
+        self, path: str, body: bytes, on_success: Optional[Callable] = None
+    ) -> None:
+        """
+        Queues a file for upload. Blocks if the queue is full.
+
+        :param path: s3://bucket/key or a local file path.
+        :param body: File contents.
+        :param on_success: Called with no arguments once the file is uploaded.
+        """
+        if self._started is None:
+            self._started = monotonic()
+        self._queue.put((str(path), body, on_success))
+
+    def submit_frame(
+        self,
+        path: str,
+        df: pd.DataFrame,
+        table: str,
+        output_format: OutputFormat,
+        on_success: Optional[Callable] = None,
+        metric: Optional[dict] = None,
+    ) -> None:
+        """
+        Encodes a frame on the serializer processes, then queues the file for
+        upload. Blocks while the serializer is full.
+
+        :param metric: Metric record of the endpoint, given serialize_seconds and bytes.
+        """
+        if self._started is None:
+            self._started = monotonic()
+        self.serializer.submit(
+            df,
+            table,
+            output_format,
+            partial(self._encoded, str(path), on_success, metric),
+        )
+
+    def _encoded(
+        self, path: str, on_success: Callable, metric: dict, future: Future
+    ) -> None:
+        try:
+            body, seconds = future.result()
+        except Exception as e:
+            logger.error(f"Serialization failed for {path} - {e}")
+            with self._lock:
+                self.failed[path] = e
+            return
+
+        if metric is not None:
+            metric["serialize_seconds"] = seconds
+            metric["bytes"] = len(body)
+        self.submit(path, body, on_success=on_success)
+
+    def _write(self, path: str, body: bytes) -> None:
+        if path.startswith("s3://"):
+            bucket, key = split_s3_path(path)
+            self.s3.upload_fileobj(
+                io.BytesIO(body), bucket, key, Config=self.transfer_config
+            )
+        else:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_bytes(body)
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+
+            path, body, on_success = item
+            try:
+                start = monotonic()
+                self._write(path, body)
+                with self._lock:
+                    self.files_uploaded += 1
+                    self.bytes_uploaded += len(body)
+                    self.upload_times[path] = monotonic() - start
+                if on_success is not None:
+                    on_success()
+            except Exception as e:
+                logger.error(f"Upload failed for {path} - {e}")
+                with self._lock:
+                    self.failed[path] = e
+            finally:
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        """
+        Returns queue depth, upload counts and throughput.
+        """
+        elapsed = monotonic() - self._started if self._started else 0.0
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "files": self.files_uploaded,
+                "bytes": self.bytes_uploaded,
+                "bytes_per_second": round(self.bytes_uploaded / elapsed, 1)
+                if elapsed
+                else 0.0,
+                "failed": len(self.failed),
+            }
+
+    def failed_folders(self) -> set:
+        """
+        Returns the names of the entity folders (game, season or player id)
+        with a failed upload.
+        """
+        with self._lock:
+            return {path.rstrip("/").split("/")[-2] for path in self.failed}
+
+    def flush(self) -> None:
+        """
+        Blocks until every queued file has been uploaded or has failed.
+        """
+        if self.serializer is not None:
+            self.serializer.join()
+        self._queue.join()
+
+    def close(self) -> None:
+        """
+        Flushes the queue, stops the upload threads and raises if anything failed.
+        """
+        self.flush()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        if self.serializer is not None:
+            self.serializer.close()
+
+        if self.failed:
+            failed = ", ".join(sorted(self.failed))
+            raise UploadError(f"{len(self.failed)} uploads failed: {failed}")
@@ -0,0 +1,239 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from enum import Enum
+from time import monotonic, time
+
+from loguru import logger
+from typing_extensions import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from nba_data_pull.lazy_imports import lazy_import
+
+rich_progress = lazy_import("rich.progress")
+
+
+class Task(NamedTuple):
+    """
+    One API endpoint for one entity, e.g. ("202324", "player_defense").
+
+    :param entity: Id of the season, game or player the endpoint is pulled for.
+    :param endpoint: Name of the table the endpoint is saved as.
+    :param func: Callable that fetches and saves the endpoint.
+    :param group: Optional label, e.g. the season_config key the entity belongs to.
+    :param season: Starting year of the season the entity belongs to, if any.
+        Used to order tasks by priority.
+    """
+
+    entity: str
+    endpoint: str
+    func: Callable
+    group: str = ""
+    season: Optional[int] = None
+
+
+class TaskResult(NamedTuple):
+    task: Task
+    seconds: float
+    error: Optional[Exception] = None
+    value: object = None
+
+
+def run_task(task: Task) -> TaskResult:
+    start = monotonic()
+    try:
+        value = task.func()
+    except Exception as e:
+        return TaskResult(task, monotonic() - start, e)
+    return TaskResult(task, monotonic() - start, value=value)
+
+
+class PriorityPolicy(str, Enum):
+    fifo = "fifo"
+    newest_first = "newest_first"
+    current_season_first = "current_season_first"
+
+
+def _recency(task: Task) -> tuple:
+    # Ids of the same kind share a width, so longer ids (e.g. newer player ids)
+    # and then larger ids are newer
+    return (task.season or 0, len(task.entity), task.entity)
+
+
+def prioritize(
+    tasks: List[Task], policy: PriorityPolicy, current_season: Optional[int] = None
+) -> List[Task]:
+    """
+    Orders tasks so the most valuable data is pulled first.
+
+    fifo keeps the order tasks were built in. newest_first pulls the latest
+    seasons first and, within a season, the latest games (or the newest
+    players). current_season_first moves the current season to the front and
+    keeps the rest in build order. Sorting is stable, so the endpoints of an
+    entity stay together.
+    """
+    policy = PriorityPolicy(policy)
+    if policy == PriorityPolicy.newest_first:
+        return sorted(tasks, key=_recency, reverse=True)
+    if policy == PriorityPolicy.current_season_first:
+        return sorted(tasks, key=lambda task: task.season != current_season)
+    return list(tasks)
+
+
+def parse_deadline(value: str, now: Optional[datetime] = None) -> float:
+    """
+    Converts a local HH:MM clock time to a timestamp, tomorrow if it has
+    already passed today.
+    """
+    now = now or datetime.now()
+    clock = datetime.strptime(value, "%H:%M")
+    deadline = now.replace(
+        hour=clock.hour, minute=clock.minute, second=0, microsecond=0
+    )
+    if deadline <= now:
+        deadline += timedelta(days=1)
+    return deadline.timestamp()
+
+
+class TaskScheduler:
+    """
+    Runs a task graph built up front on a bounded thread pool.
+
+    The pool only bounds how many calls are in flight. The request rate is
+    still set by the pacer shared by every task, so adding workers overlaps
+    API latency without going over the API budget.
+
+    Tasks are started in list order, so order them with `prioritize` first.
+    With a deadline, no task is started once it has passed, and a task whose
+    endpoint has taken longer on average than the time left is skipped so
+    shorter ones can still run. Skipped tasks are kept in `skipped` and are
+    pulled again by the next run.
+
+    :param workers: Maximum number of tasks running at the same time.
+    :param deadline: Timestamp (time.time()) after which no task is started.
+    """
+
+    def __init__(self, workers: int = 4, deadline: Optional[float] = None):
+        self.workers = max(1, workers)
+        self.deadline = deadline
+        self.results: List[TaskResult] = []
+        self.skipped: List[Task] = []
+
+    def _fits(self, task: Task) -> bool:
+        if self.deadline is None:
+            return True
+        left = self.deadline - time()
+        if left <= 0:
+            return False
+        seconds = [
+            result.seconds
+            for result in self.results
+            if result.task.endpoint == task.endpoint
+        ]
+        return not seconds or sum(seconds) / len(seconds) <= left
+
+    def _results(self, tasks: List[Task]) -> Iterator[TaskResult]:
+        pending = iter(tasks)
+
+        def next_task() -> Optional[Task]:
+            for task in pending:
+                if self._fits(task):
+                    return task
+                self.skipped.append(task)
+            return None
+
+        if self.workers == 1:
+            while (task := next_task()) is not None:
+                result = run_task(task)
+                self.results.append(result)
+                yield result
+            return
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            in_flight = set()
+            while True:
+                while len(in_flight) < self.workers:
+                    task = next_task()
+                    if task is None:
+                        break
+                    in_flight.add(executor.submit(run_task, task))
+                if not in_flight:
+                    return
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    self.results.append(result)
+                    yield result
+
+    def run(self, tasks: List[Task], description: str = "Pulling") -> List[TaskResult]:
+        """
+        Runs the tasks and returns their results in completion order.
+        Failed tasks are recorded, not raised.
+        """
+        skipped = len(self.skipped)
+        results = list(
+            rich_progress.track(
+                self._results(tasks), total=len(tasks), description=description
+            )
+        )
+
+        for result in results:
+            if result.error is not None:
+                logger.debug(
+                    f"{result.task.entity} {result.task.endpoint}: {result.error}"
+                )
+        if len(self.skipped) > skipped:
+            logger.warning(
+                f"Deadline reached, skipped {len(self.skipped) - skipped} tasks"
+            )
+        return results
+
+    def completed_entities(self) -> Dict[str, List[str]]:
+        """
+        Returns the entities with at least one saved endpoint, by group.
+        Entities with a task skipped at the deadline are left out, so they are
+        not added to the inventory half written.
+        """
+        skipped = {(task.group, task.entity) for task in self.skipped}
+        completed: Dict[str, List[str]] = {}
+        for result in self.results:
+            entities = completed.setdefault(result.task.group, [])
+            if (
+                result.error is None
+                and (result.task.group, result.task.entity) not in skipped
+                and result.task.entity not in entities
+            ):
+                entities.append(result.task.entity)
+        return completed
+
+    def endpoint_report(self) -> Dict[str, Dict]:
+        """
+        Summarises wall time per endpoint, slowest total first.
+        """
+        report: Dict[str, Dict] = {}
+        for result in self.results:
+            row = report.setdefault(
+                result.task.endpoint,
+                {"calls": 0, "failures": 0, "total_seconds": 0.0, "max_seconds": 0.0},
+            )
+            row["calls"] += 1
+            row["failures"] += result.error is not None
+            row["total_seconds"] += result.seconds
+            row["max_seconds"] = max(row["max_seconds"], result.seconds)
+
+        for row in report.values():
+            row["mean_seconds"] = round(row["total_seconds"] / row["calls"], 3)
+            row["total_seconds"] = round(row["total_seconds"], 3)
+            row["max_seconds"] = round(row["max_seconds"], 3)
+
+        return dict(
+            sorted(
+                report.items(), key=lambda item: item[1]["total_seconds"], reverse=True
+            )
+        )
+
+    def log_report(self) -> None:
+        for endpoint, row in self.endpoint_report().items():
+            logger.info(
+                f"{endpoint}: {row['calls']} calls, {row['failures']} failed, "
+                f"{row['total_seconds']}s total, {row['mean_seconds']}s mean, "
+                f"{row['max_seconds']}s max"
+            )
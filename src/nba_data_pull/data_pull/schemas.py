@@ -0,0 +1,157 @@
+import io
+import re
+from enum import Enum
+
+from nba_data_pull.lazy_imports import lazy_import
+
+# Lazy so the CLI can use the enums below without loading pandas
+pd = lazy_import("pandas")
+
+
+class OutputFormat(str, Enum):
+    csv = "csv"
+    parquet = "parquet"
+
+
+class PlayerLayout(str, Enum):
+    per_player = "per_player"
+    consolidated = "consolidated"
+
+
+# Player, team and person ids all fit in int32. Game and season ids are kept as
+# strings because of their leading zeros.
+ID_COLUMN = re.compile(r"^(?:[A-Z]+)?(?:PLAYER|TEAM|PERSON)ID$")
+STRING_ID_COLUMNS = {"GAMEID", "SEASONID", "GROUPID", "LEAGUEID"}
+
+# Low cardinality codes that repeat on every row
+CATEGORY_COLUMNS = {
+    "TEAMABBREVIATION",
+    "TEAMTRICODE",
+    "TEAMCITY",
+    "TEAMNAME",
+    "TEAMSLUG",
+    "OPPONENTTEAMABBREVIATION",
+    "POSITION",
+    "WL",
+    "SEASONTYPE",
+    "PLAYTYPE",
+    "TYPEGROUPING",
+    "ACTIONTYPE",
+    "SUBTYPE",
+    "SHOTRESULT",
+    "LOCATION",
+}
+
+# Columns where the rules above would give a different dtype depending on the
+# data in a single file (e.g. an all empty column is read as float)
+TABLE_SCHEMAS = {
+    "playbyplay": {
+        "actionNumber": "Int32",
+        "period": "Int32",
+        "actionId": "Int32",
+        "shotValue": "Int32",
+        "isFieldGoal": "Int32",
+        "videoAvailable": "Int32",
+        "clock": "string",
+        "description": "string",
+        "scoreHome": "string",
+        "scoreAway": "string",
+        "playerName": "string",
+        "playerNameI": "string",
+    },
+    "rotations": {
+        "PLAYER_FIRST": "string",
+        "PLAYER_LAST": "string",
+    },
+    "common_info": {
+        "DRAFT_YEAR": "string",
+        "DRAFT_ROUND": "string",
+        "DRAFT_NUMBER": "string",
+        "JERSEY": "string",
+        "HEIGHT": "string",
+        "WEIGHT": "string",
+    },
+}
+
+
+def _normalize_name(column: str) -> str:
+    return str(column).upper().replace("_", "")
+
+
+def flatten_columns(df: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Joins multi-level column headers (e.g. shot location ranges) into single strings.
+    """
+    if not isinstance(df.columns, pd.MultiIndex):
+        return df
+
+    df = df.copy()
+    df.columns = [
+        "_".join(str(level) for level in column if str(level).strip())
+        for column in df.columns
+    ]
+    return df
+
+
+def column_dtype(table: str, column: str, series: "pd.Series") -> str:
+    """
+    Returns the parquet dtype for a column of a given table.
+    """
+    pinned = TABLE_SCHEMAS.get(table, {})
+    if column in pinned:
+        return pinned[column]
+
+    name = _normalize_name(column)
+    if name in STRING_ID_COLUMNS:
+        return "string"
+    if ID_COLUMN.match(name):
+        return "Int32"
+    if name in CATEGORY_COLUMNS:
+        return "category"
+    if pd.api.types.is_bool_dtype(series):
+        return "boolean"
+    if pd.api.types.is_numeric_dtype(series):
+        return "float32"
+    return "string"
+
+
+def apply_schema(df: "pd.DataFrame", table: str) -> "pd.DataFrame":
+    """
+    Casts a frame to the stable schema for its table so every file of that
+    table has the same column types.
+
+    :param df: Frame returned by an endpoint.
+    :param table: Table name, e.g. "playbyplay" or "player_defense".
+    :return: A new frame with the schema applied.
+    """
+    df = flatten_columns(df).copy()
+    dtypes = {}
+    for column in df.columns:
+        dtype = column_dtype(table, column, df[column])
+        if dtype == "Int32":
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+        dtypes[column] = dtype
+    return df.astype(dtypes)
+
+
+def serialize_table(
+    df: "pd.DataFrame", table: str, output_format: OutputFormat
+) -> bytes:
+    """
+    Encodes a frame as file contents in the requested format.
+    """
+    if OutputFormat(output_format) == OutputFormat.parquet:
+        buffer = io.BytesIO()
+        apply_schema(df, table).to_parquet(buffer, index=False, compression="zstd")
+        return buffer.getvalue()
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def write_table(df: "pd.DataFrame", path: str, table: str, output_format: OutputFormat):
+    """
+    Writes a frame to a local or s3:// path in the requested format.
+    """
+    if OutputFormat(output_format) == OutputFormat.parquet:
+        apply_schema(df, table).to_parquet(path, index=False, compression="zstd")
+    else:
+        df.to_csv(path, index=False)
@@ -0,0 +1,109 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from time import monotonic
+
+import pandas as pd
+from typing_extensions import Callable, Optional, Tuple
+
+from nba_data_pull.data_pull.schemas import OutputFormat, serialize_table
+
+
+def encode_table(
+    df: pd.DataFrame, table: str, output_format: OutputFormat
+) -> Tuple[bytes, float]:
+    """
+    Applies the table schema and encodes the frame. Runs in a worker process.
+
+    :return: (file contents, seconds spent)
+    """
+    start = monotonic()
+    body = serialize_table(df, table, output_format)
+    return body, monotonic() - start
+
+
+class SerializePool:
+    """
+    Encodes fetched frames on a process pool so fetch threads stay free for
+    network calls while large frames are converted to CSV or Parquet.
+
+    At most `max_pending` frames are waiting or being encoded. `submit` blocks
+    past that, so a slow pool slows the fetch threads down instead of
+    buffering frames without bound.
+
+    :param workers: Number of worker processes.
+    :param max_pending: Frames queued or in progress before `submit` blocks.
+        Defaults to four per worker.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: Optional[int] = None):
+        self.workers = max(1, workers)
+        self.max_pending = max_pending or self.workers * 4
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._changed = threading.Condition(self._lock)
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # Started on first use. Spawned rather than forked because the parent
+        # has upload and fetch threads running.
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+        return self._executor
+
+    def submit(
+        self,
+        df: pd.DataFrame,
+        table: str,
+        output_format: OutputFormat,
+        callback: Callable[[Future], None],
+    ) -> None:
+        """
+        Queues a frame for encoding. Blocks while `max_pending` frames are in flight.
+
+        :param callback: Called with the finished future, which holds
+            (file contents, seconds) or the encoding error.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._pending < self.max_pending)
+            self._pending += 1
+
+        try:
+            future = self.executor.submit(
+                encode_table, df, table, OutputFormat(output_format)
+            )
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda done: self._finish(done, callback))
+
+    def _finish(self, future: Future, callback: Callable[[Future], None]) -> None:
+        try:
+            callback(future)
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        with self._changed:
+            self._pending -= 1
+            self._changed.notify_all()
+
+    def join(self) -> None:
+        """
+        Blocks until every submitted frame is encoded and handed on.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._pending == 0)
+
+    def close(self) -> None:
+        self.join()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
@@ -1,27 +1,88 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 
-import boto3
 import typer
-import yaml
 from dotenv import load_dotenv
 from loguru import logger
-from typing_extensions import Annotated
-
+from typing_extensions import Annotated, List, Optional
+
+from nba_data_pull.data_pull.pacing import PacingPolicy, build_pacer
+from nba_data_pull.data_pull.response_cache import build_cache
+from nba_data_pull.inventory.endpoint_inventory import (
+    build_endpoint_inventory,
+    folder_inventory,
+    missing_endpoints,
+)
+from nba_data_pull.inventory.incremental import (
+    STATE_PATH,
+    apply_new_completions,
+    list_completion_keys,
+    load_state,
+    save_state,
+)
+from nba_data_pull.inventory.inventory_index import InventoryIndex, unique_ids
 from nba_data_pull.inventory.inventory_utils import (
     InventoryMeta,
     SeasonYear,
     get_season_list,
-    load_yaml_s3,
+    latest_game_date,
     process_seasons,
     update_s3_inventory,
 )
+from nba_data_pull.inventory.metadata_store import MetadataStore, MetaFormat
+from nba_data_pull.inventory.season_refresh import (
+    NONSYNERGY,
+    SYNERGY,
+    AggregateRefresh,
+    refresh_groups,
+)
+from nba_data_pull.inventory.season_refresh import STATE_PATH as REFRESH_STATE_PATH
+from nba_data_pull.inventory.sharded_listing import ShardedLister, sharded_inventory
+from nba_data_pull.lazy_imports import ImportProfiler, lazy_import
+
+boto3 = lazy_import("boto3")
 
 load_dotenv()
 
 app = typer.Typer()
 
+ENDPOINT_INVENTORY_PATH = "data/meta/endpoint_inventory.yaml"
+
+META_FILES = ("inventory.yaml", "data_to_pull.yaml")
+
+SEASON_GRAINS = (
+    ("per_game", "regular_season"),
+    ("per_game", "playoffs"),
+    ("per_possession", "regular_season"),
+    ("per_possession", "playoffs"),
+)
+
+
+def season_group_tables() -> dict:
+    """
+    Returns the tables of each endpoint group refreshed by --delta.
+    """
+    # Imported here so commands that do not pull data skip nbastatpy and pandas
+    from nba_data_pull.data_pull.dataingest import SeasonIngest
+
+    return {
+        NONSYNERGY: [endpoint[0] for endpoint in SeasonIngest.nonsynergy_endpoints],
+        SYNERGY: [endpoint[0] for endpoint in SeasonIngest.synergy_endpoints],
+    }
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    import_profile: Annotated[
+        bool, typer.Option(help="Log startup and import time when the command ends")
+    ] = False,
+):
+    if import_profile:
+        ctx.call_on_close(ImportProfiler().start().log_report)
+
 
 @app.command()
 def copy_previous_meta(
@@ -37,45 +98,59 @@ def copy_previous_meta(
             help="Output folder to save archive", file_okay=False, dir_okay=True
         ),
     ] = Path("data/logs/inventory_logs/"),
+    files: Annotated[
+        Optional[List[str]],
+        typer.Option(
+            "--file",
+            help="Metadata files to archive, in every saved format. Defaults to "
+            f"{', '.join(META_FILES)}",
+        ),
+    ] = None,
+    keep_days: Annotated[
+        int,
+        typer.Option(help="Delete archives older than this many days, 0 keeps all"),
+    ] = 0,
+    meta_format: Annotated[
+        MetaFormat, typer.Option(help="Format metadata files are read and written in")
+    ] = MetaFormat.jsonl_gz,
+    export_yaml: Annotated[
+        bool, typer.Option(help="Also write a YAML copy of metadata files")
+    ] = True,
 ):
     if isinstance(root_folder, str):
         root_folder = Path(root_folder)
     if isinstance(out_folder, str):
         out_folder = Path(out_folder)
+    files = files or list(META_FILES)
 
     bucket_name = os.getenv("BUCKET_NAME")
     logger.info(f"Loaded bucket name: {bucket_name}")
 
     logger.info("Connecting to S3")
     s3 = boto3.client("s3")
+    store = MetadataStore(bucket_name, s3, fmt=meta_format, export_yaml=export_yaml)
 
     # Create output folder for today
-    out_folder = out_folder.joinpath(str(date.today()))
-
-    logger.info("Reading data")
-    inventory = load_yaml_s3(
-        root_folder.joinpath("inventory.yaml"), bucket_name=bucket_name, s3_client=s3
-    )
-    data_to_pull = load_yaml_s3(
-        root_folder.joinpath("data_to_pull.yaml"), bucket_name=bucket_name, s3_client=s3
-    )
-
-    logger.info("Saving data to S3")
-    # Convert Python dictionary to YAML format
-    inventory_yaml_content = yaml.dump(inventory, default_flow_style=False)
-    data_to_pull_yaml_content = yaml.dump(data_to_pull, default_flow_style=False)
-
-    # Upload to S3
-    s3.put_object(
-        Bucket=bucket_name,
-        Key=str(out_folder.joinpath("inventory.yaml")),
-        Body=inventory_yaml_content,
-    )
-    s3.put_object(
-        Bucket=bucket_name,
-        Key=str(out_folder.joinpath("data_to_pull.yaml")),
-        Body=data_to_pull_yaml_content,
-    )
+    archive_folder = out_folder.joinpath(str(date.today()))
+
+    logger.info("Copying metadata in S3")
+    existing = store.list_keys(root_folder)
+    with ThreadPoolExecutor(max_workers=max(1, len(files))) as executor:
+        copied = executor.map(
+            lambda name: store.copy(
+                root_folder.joinpath(name), archive_folder.joinpath(name), existing
+            ),
+            files,
+        )
+        for name, keys in zip(files, copied, strict=True):
+            if keys:
+                logger.info(f"{name}: copied {', '.join(keys)}")
+            else:
+                logger.warning(f"{name}: not found in {root_folder}")
+
+    if keep_days > 0:
+        pruned = store.prune_archives(out_folder, keep_days)
+        logger.info(f"Deleted {len(pruned)} archives older than {keep_days} days")
 
 
 @app.command()
@@ -86,31 +161,99 @@ def create_inventory(
             help="Path to save data inventory", file_okay=True, dir_okay=False
         ),
     ] = Path("data/meta/inventory.yaml"),
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            help="Apply completions recorded by the ingest commands since the last "
+            "run instead of re-listing every S3 prefix"
+        ),
+    ] = False,
+    state_path: Annotated[
+        Path, typer.Option(help="Path to the incremental inventory state")
+    ] = Path(STATE_PATH),
+    endpoints: Annotated[
+        bool,
+        typer.Option(
+            help="Also record which endpoint files exist in every folder, "
+            "from one flat listing of the bucket"
+        ),
+    ] = False,
+    endpoint_inventory_path: Annotated[
+        Path, typer.Option(help="Path to the endpoint inventory")
+    ] = Path(ENDPOINT_INVENTORY_PATH),
+    list_workers: Annotated[
+        int,
+        typer.Option(
+            help="Number of S3 list requests in flight for a full scan. Large "
+            "prefixes are split by leading id digits. 1 lists one prefix at a time"
+        ),
+    ] = 16,
+    meta_format: Annotated[
+        MetaFormat, typer.Option(help="Format metadata files are read and written in")
+    ] = MetaFormat.jsonl_gz,
+    export_yaml: Annotated[
+        bool, typer.Option(help="Also write a YAML copy of metadata files")
+    ] = True,
 ):
     bucket_name = os.getenv("BUCKET_NAME")
     logger.info(f"Loaded bucket name: {bucket_name}")
 
-    inventory_meta = InventoryMeta().empty_inventory
-
     logger.info("Setting up Client")
     s3 = boto3.client("s3")
-
-    logger.info("Getting inventory")
-    updated_inventory = update_s3_inventory(
-        inventory=inventory_meta,
-        bucket=bucket_name,
-        prefix="data/nba/",
-        s3_client=s3,
-    )
-
-    inventory_yaml_content = yaml.dump(updated_inventory, default_flow_style=False)
+    store = MetadataStore(bucket_name, s3, fmt=meta_format, export_yaml=export_yaml)
+
+    state = {}
+    if incremental:
+        state = load_state(bucket_name, s3, state_path=str(state_path))
+        if "watermark" not in state:
+            logger.warning("No incremental state found, running a full scan")
+
+    if "watermark" in state:
+        if endpoints:
+            logger.warning("The endpoint inventory is only rebuilt by a full scan")
+        logger.info(f"Updating inventory from watermark {state['watermark']}")
+        updated_inventory = store.load(output_path)
+        watermark = apply_new_completions(
+            updated_inventory, bucket_name, s3, watermark=state["watermark"]
+        )
+    else:
+        # Completions written while the scan runs are picked up by the next
+        # incremental run
+        completion_keys = list_completion_keys(bucket_name, s3)
+        watermark = completion_keys[-1] if completion_keys else None
+
+        inventory_meta = InventoryMeta().empty_inventory
+
+        if endpoints:
+            logger.info("Getting endpoint inventory")
+            endpoint_inventory = build_endpoint_inventory(
+                bucket=bucket_name, prefix="data/nba/", s3_client=s3
+            )
+            store.save(endpoint_inventory, endpoint_inventory_path)
+            updated_inventory = folder_inventory(endpoint_inventory, inventory_meta)
+        elif list_workers > 1:
+            logger.info(f"Getting inventory with {list_workers} list workers")
+            lister = ShardedLister(workers=list_workers)
+            updated_inventory = sharded_inventory(
+                inventory=inventory_meta,
+                bucket=bucket_name,
+                prefix="data/nba/",
+                lister=lister,
+            )
+            lister.log_report()
+        else:
+            logger.info("Getting inventory")
+            updated_inventory = update_s3_inventory(
+                inventory=inventory_meta,
+                bucket=bucket_name,
+                prefix="data/nba/",
+                s3_client=s3,
+            )
 
     logger.info("Saving inventory to S3")
-    s3.put_object(
-        Bucket=bucket_name,
-        Key=str(output_path),
-        Body=inventory_yaml_content,
-    )
+    store.save(updated_inventory, output_path)
+
+    save_state(watermark, bucket_name, s3, state_path=str(state_path))
 
 
 @app.command()
@@ -128,103 +271,230 @@ def get_data_to_pull(
     earliest_season_year: Annotated[
         int, typer.Argument(help="Earliest season year")
     ] = 1990,
+    endpoints: Annotated[
+        bool,
+        typer.Option(
+            help="Add the endpoints missing from partly written game and season "
+            "folders, using the endpoint inventory"
+        ),
+    ] = False,
+    endpoint_inventory_path: Annotated[
+        Path, typer.Option(help="Path to the endpoint inventory")
+    ] = Path(ENDPOINT_INVENTORY_PATH),
+    refresh_manifests: Annotated[
+        bool,
+        typer.Option(
+            help="Rediscover the game and player ids of finished seasons "
+            "instead of reading their saved manifests"
+        ),
+    ] = False,
+    delta: Annotated[
+        bool,
+        typer.Option(
+            help="Only pull the current season's aggregates again when games "
+            "were played since they were last saved, instead of every run"
+        ),
+    ] = False,
+    aggregate_refresh: Annotated[
+        AggregateRefresh,
+        typer.Option(help="With --delta, when non-synergy aggregates are refreshed"),
+    ] = AggregateRefresh.new_games,
+    synergy_refresh_days: Annotated[
+        int,
+        typer.Option(
+            help="With --delta, minimum days between synergy and tracking refreshes"
+        ),
+    ] = 7,
+    refresh_state_path: Annotated[
+        Path, typer.Option(help="Path to the season refresh state")
+    ] = Path(REFRESH_STATE_PATH),
+    pacing: Annotated[
+        PacingPolicy, typer.Option(help="How API calls are paced")
+    ] = PacingPolicy.aimd,
+    requests_per_second: Annotated[
+        float, typer.Option(help="Request rate (start rate for aimd)")
+    ] = 1.0,
+    connect_timeout: Annotated[
+        float, typer.Option(help="Seconds to wait for a connection to the API")
+    ] = 10.0,
+    read_timeout: Annotated[
+        float, typer.Option(help="Seconds to wait for an API response")
+    ] = 30.0,
+    cache: Annotated[
+        bool, typer.Option(help="Cache API responses on local disk")
+    ] = True,
+    cache_path: Annotated[
+        Path, typer.Option(help="Path to the response cache database")
+    ] = Path("data/cache/responses.sqlite"),
+    cache_ttl_hours: Annotated[
+        float, typer.Option(help="Hours before current season responses expire")
+    ] = 12,
+    cache_max_mb: Annotated[
+        int, typer.Option(help="Size cap for the response cache in MB")
+    ] = 2048,
+    meta_format: Annotated[
+        MetaFormat, typer.Option(help="Format metadata files are read and written in")
+    ] = MetaFormat.jsonl_gz,
+    export_yaml: Annotated[
+        bool, typer.Option(help="Also write a YAML copy of metadata files")
+    ] = True,
 ):
+    # Imported here so commands that do not call the API skip nba_api
+    from nba_data_pull.data_pull.http_session import build_session
+
     bucket_name = os.getenv("BUCKET_NAME")
     logger.info(f"Loaded bucket name: {bucket_name}")
 
     logger.info("Connecting to S3")
     s3 = boto3.client("s3")
+    store = MetadataStore(bucket_name, s3, fmt=meta_format, export_yaml=export_yaml)
 
     logger.info("Reading data")
-    inventory = load_yaml_s3(str(inventory_path), bucket_name=bucket_name, s3_client=s3)
+    inventory = store.load(inventory_path)
 
     expected_season_list = [
         f"{str(season)}{str(season + 1)[-2:]}"
         for season in range(earliest_season_year, SeasonYear.default + 1)
     ]
 
+    pacer = build_pacer(pacing, requests_per_second)
+    session = build_session(10, (connect_timeout, read_timeout))
+    response_cache = build_cache(cache, cache_path, cache_ttl_hours, cache_max_mb)
+
     seasons_regular_season = get_season_list(earliest_season_year, inventory)
     seasons_playoffs = get_season_list(earliest_season_year, inventory, playoffs=True)
 
+    # Manifests are only read back by this command, so no YAML copy is needed
+    manifest_store = MetadataStore(bucket_name, s3, fmt=meta_format, export_yaml=False)
+
     logger.info("Going through regular season")
     game_ids_regular, player_ids_regular = process_seasons(
         seasons=seasons_regular_season,
         playoffs=False,
+        pacer=pacer,
+        cache=response_cache,
+        manifest_store=manifest_store,
+        refresh_manifests=refresh_manifests,
     )
 
     logger.info("Going through playoffs")
     game_ids_playoffs, player_ids_playoffs = process_seasons(
-        seasons=seasons_playoffs, playoffs=True
+        seasons=seasons_playoffs,
+        playoffs=True,
+        pacer=pacer,
+        cache=response_cache,
+        manifest_store=manifest_store,
+        refresh_manifests=refresh_manifests,
     )
 
+    inventory_index = InventoryIndex(inventory)
+
     data_to_pull = {
         "game": {
             "regular_season": game_ids_regular,
             "playoffs": game_ids_playoffs,
         },
-        "player": [
-            str(player_id)
-            for player_id in player_ids_regular
-            if str(player_id) not in inventory["PLAYER"]
-        ],
+        "player": inventory_index.missing_ids(
+            ("PLAYER",), unique_ids(player_ids_regular)
+        ),
         "season": {
             "per_game": {
-                "regular_season": [
-                    season
-                    for season in expected_season_list
-                    if season not in inventory["SEASON"]["PER_GAME"]["REGULAR_SEASON"]
-                ],
-                "playoffs": [
-                    season
-                    for season in expected_season_list
-                    if season not in inventory["SEASON"]["PER_GAME"]["PLAYOFFS"]
-                ],
+                "regular_season": inventory_index.missing(
+                    ("SEASON", "PER_GAME", "REGULAR_SEASON"), expected_season_list
+                ),
+                "playoffs": inventory_index.missing(
+                    ("SEASON", "PER_GAME", "PLAYOFFS"), expected_season_list
+                ),
             },
             "per_possession": {
-                "regular_season": [
-                    season
-                    for season in expected_season_list
-                    if season
-                    not in inventory["SEASON"]["PER_POSSESSION"]["REGULAR_SEASON"]
-                ],
-                "playoffs": [
-                    season
-                    for season in expected_season_list
-                    if season not in inventory["SEASON"]["PER_POSSESSION"]["PLAYOFFS"]
-                ],
+                "regular_season": inventory_index.missing(
+                    ("SEASON", "PER_POSSESSION", "REGULAR_SEASON"), expected_season_list
+                ),
+                "playoffs": inventory_index.missing(
+                    ("SEASON", "PER_POSSESSION", "PLAYOFFS"), expected_season_list
+                ),
             },
         },
     }
 
-    if not data_to_pull["season"]["per_game"]["regular_season"]:
-        data_to_pull["season"]["per_game"]["regular_season"] = [
-            f"{str(SeasonYear.default)}{str(SeasonYear.default + 1)[-2:]}"
-        ]
-
-    if not data_to_pull["season"]["per_game"]["playoffs"]:
-        data_to_pull["season"]["per_game"]["playoffs"] = [
-            f"{str(SeasonYear.default)}{str(SeasonYear.default + 1)[-2:]}"
-        ]
-
-    if not data_to_pull["season"]["per_possession"]["regular_season"]:
-        data_to_pull["season"]["per_possession"]["regular_season"] = [
-            f"{str(SeasonYear.default)}{str(SeasonYear.default + 1)[-2:]}"
-        ]
-
-    if not data_to_pull["season"]["per_possession"]["playoffs"]:
-        data_to_pull["season"]["per_possession"]["playoffs"] = [
-            f"{str(SeasonYear.default)}{str(SeasonYear.default + 1)[-2:]}"
-        ]
-
-    logger.info("Saving Data")
-    data_to_pull_yaml_content = yaml.dump(data_to_pull, default_flow_style=False)
-
-    logger.info("Saving inventory to S3")
-    s3.put_object(
-        Bucket=bucket_name,
-        Key=str(output_path),
-        Body=data_to_pull_yaml_content,
-    )
+    if endpoints:
+        from nba_data_pull.data_pull.dataingest import GameIngest, SeasonIngest
+
+        logger.info("Finding partly written folders")
+        endpoint_inventory = store.load(endpoint_inventory_path)
+        data_to_pull["endpoints"] = {}
+        for kind, ingest_class in (("GAME", GameIngest), ("SEASON", SeasonIngest)):
+            missing = missing_endpoints(
+                endpoint_inventory, kind, ingest_class.endpoints
+            )
+            for path, entities in missing.items():
+                logger.info(f"{'/'.join(path)}: {len(entities)} partly written folders")
+                node = data_to_pull["endpoints"]
+                for key in path[:-1]:
+                    node = node.setdefault(key.lower(), {})
+                node[path[-1].lower()] = entities
+
+    # Seasons already saved in full still need the current season's aggregates
+    current_season_id = f"{SeasonYear.default}{str(SeasonYear.default + 1)[-2:]}"
+    if delta:
+        try:
+            refresh_state = store.load(refresh_state_path) or {}
+        except s3.exceptions.NoSuchKey:
+            refresh_state = {}
+        last_game_dates = {
+            season_type: latest_game_date(
+                str(SeasonYear.default),
+                playoffs=season_type == "playoffs",
+                pacer=pacer,
+                cache=response_cache,
+            )
+            for season_type in ("regular_season", "playoffs")
+        }
+        logger.info(f"Latest game dates: {last_game_dates}")
+
+    for per_mode, season_type in SEASON_GRAINS:
+        if data_to_pull["season"][per_mode][season_type]:
+            continue
+        if not delta:
+            data_to_pull["season"][per_mode][season_type] = [current_season_id]
+            continue
+
+        groups = refresh_groups(
+            refresh_state.get(per_mode, {}).get(season_type, {}).get(current_season_id),
+            last_game_dates[season_type],
+            today=date.today(),
+            cadence=aggregate_refresh,
+            synergy_days=synergy_refresh_days,
+        )
+        logger.info(f"{per_mode} {season_type}: refreshing {groups or 'nothing'}")
+        if not groups:
+            continue
+
+        # Pulled like a partly written folder, so only these endpoints are saved
+        season_endpoints = (
+            data_to_pull.setdefault("endpoints", {})
+            .setdefault("season", {})
+            .setdefault(per_mode, {})
+            .setdefault(season_type, {})
+        )
+        tables = set(season_endpoints.get(current_season_id, []))
+        group_tables = season_group_tables()
+        for group in groups:
+            tables.update(group_tables[group])
+        season_endpoints[current_season_id] = sorted(tables)
+
+        data_to_pull.setdefault("season_refresh", {}).setdefault(per_mode, {})[
+            season_type
+        ] = {
+            current_season_id: {
+                "last_game_date": last_game_dates[season_type],
+                "groups": groups,
+            }
+        }
+
+    logger.info(f"HTTP connection stats: {session.stats()}")
+    logger.info("Saving data to pull to S3")
+    store.save(data_to_pull, output_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,142 @@
+import copy
+
+from loguru import logger
+from typing_extensions import Dict, Iterable, List, Tuple
+
+from nba_data_pull.inventory.inventory_index import season_year_from_game_id
+from nba_data_pull.lazy_imports import lazy_import
+
+boto3 = lazy_import("boto3")
+
+
+def table_from_key(key: str, prefix: str) -> Tuple[Tuple[str, ...], str, str]:
+    """
+    Splits an object key into its inventory path, entity and table.
+
+    data/nba/GAME/REGULAR_SEASON/0022400001/0022400001_advanced.csv ->
+    (("GAME", "REGULAR_SEASON"), "0022400001", "advanced")
+
+    :return: (path, entity, table), or None if the key is not an entity file.
+    """
+    parts = key[len(prefix) :].split("/")
+    if len(parts) < 3 or not parts[-1]:
+        return None
+
+    entity = parts[-2]
+    stem = parts[-1].split(".", 1)[0]
+    if not stem.startswith(f"{entity}_"):
+        return None
+    return tuple(parts[:-2]), entity, stem[len(entity) + 1 :]
+
+
+def build_endpoint_inventory(
+    bucket: str, prefix: str = "data/nba/", s3_client=None
+) -> Dict:
+    """
+    Builds an inventory of the endpoint files saved for every entity from one
+    flat listing of the prefix (no delimiter, so no per-folder requests).
+
+    The result mirrors the folder inventory, with each leaf mapping an entity
+    id to its sorted tables, e.g.
+    {"GAME": {"REGULAR_SEASON": {"0022400001": ["advanced", ...]}}}
+
+    :param bucket: Name of the S3 bucket.
+    :param prefix: Prefix all data is saved under.
+    :param s3_client: Optional boto3 S3 client.
+    """
+    if s3_client is None:
+        s3_client = boto3.client("s3")
+
+    tables: Dict[Tuple[str, ...], Dict[str, set]] = {}
+    objects = 0
+    paginator = s3_client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            objects += 1
+            parsed = table_from_key(obj["Key"], prefix)
+            if parsed is None:
+                continue
+            path, entity, table = parsed
+            tables.setdefault(path, {}).setdefault(entity, set()).add(table)
+
+    logger.info(f"Listed {objects} objects in {len(tables)} folders")
+
+    inventory = {}
+    for path, entities in sorted(tables.items()):
+        node = inventory
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = {
+            entity: sorted(entity_tables)
+            for entity, entity_tables in sorted(entities.items())
+        }
+    return inventory
+
+
+def folder_inventory(endpoint_inventory: Dict, template: Dict) -> Dict:
+    """
+    Converts an endpoint inventory into the folder inventory (lists of entity
+    ids) used by the rest of the pipeline, keeping the keys of the template.
+    """
+    inventory = copy.deepcopy(template)
+
+    def fill(node: Dict, endpoint_node: Dict) -> None:
+        for key, value in node.items():
+            if isinstance(value, dict):
+                fill(value, endpoint_node.get(key) or {})
+            else:
+                node[key] = sorted(endpoint_node.get(key) or {})
+
+    fill(inventory, endpoint_inventory or {})
+    return inventory
+
+
+def _entity_season(kind: str, entity: str) -> str:
+    if kind == "GAME":
+        return str(season_year_from_game_id(entity))
+    return str(entity)[0:4]
+
+
+def _leaves(node: Dict, path: Tuple[str, ...] = ()):
+    for key, value in node.items():
+        child = (*path, key)
+        if value and all(isinstance(tables, list) for tables in value.values()):
+            yield child, value
+        elif isinstance(value, dict):
+            yield from _leaves(value, child)
+
+
+def missing_endpoints(
+    endpoint_inventory: Dict, kind: str, known_endpoints: Iterable[str]
+) -> Dict[Tuple[str, ...], Dict[str, List[str]]]:
+    """
+    Finds entities of a kind (GAME or SEASON) with endpoint files missing.
+
+    Not every endpoint exists for every season (e.g. tracking and synergy data
+    start in later seasons) or every season type and per mode, so an endpoint
+    is only expected for an entity if some entity in the same folder and
+    season has it.
+
+    :param endpoint_inventory: Output of `build_endpoint_inventory`.
+    :param kind: Top level key of the inventory.
+    :param known_endpoints: Tables the ingest class saves. Other files are ignored.
+    :return: {path: {entity: [missing tables]}} for partly written entities only.
+    """
+    known = set(known_endpoints)
+    leaves = list(_leaves(endpoint_inventory.get(kind) or {}, (kind,)))
+
+    expected: Dict[Tuple[Tuple[str, ...], str], set] = {}
+    for path, entities in leaves:
+        for entity, tables in entities.items():
+            expected.setdefault((path, _entity_season(kind, entity)), set()).update(
+                set(tables) & known
+            )
+
+    missing = {}
+    for path, entities in leaves:
+        for entity, tables in entities.items():
+            key = (path, _entity_season(kind, entity))
+            entity_missing = expected[key] - set(tables)
+            if entity_missing:
+                missing.setdefault(path, {})[entity] = sorted(entity_missing)
+    return missing
@@ -0,0 +1,129 @@
+from datetime import datetime, timezone
+
+import yaml
+from loguru import logger
+from typing_extensions import Dict, List, Optional
+
+from nba_data_pull.lazy_imports import lazy_import
+
+boto3 = lazy_import("boto3")
+
+COMPLETIONS_PREFIX = "data/meta/completions/"
+STATE_PATH = "data/meta/inventory_state.yaml"
+
+
+def _load_yaml_or_none(key: str, bucket: str, s3_client: "boto3.client"):
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=str(key))
+    except s3_client.exceptions.NoSuchKey:
+        return None
+    return yaml.safe_load(response["Body"].read().decode("utf-8"))
+
+
+def write_completions(
+    completions: Dict,
+    kind: str,
+    bucket: str,
+    s3_client: "boto3.client",
+    prefix: str = COMPLETIONS_PREFIX,
+) -> str:
+    """
+    Saves the entities an ingest command finished so the inventory can be
+    updated without re-listing S3.
+
+    :param completions: Nested dictionary shaped like the inventory with lists of ids.
+    :param kind: Name of the ingest command (GAME, PLAYER or SEASON).
+    :param bucket: Name of the S3 bucket.
+    :param s3_client: boto3 S3 client.
+    :param prefix: Folder the completion files are saved in.
+    :return: The key of the saved completion file.
+    """
+    # Keys sort by time so the watermark can be used as StartAfter
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    key = f"{prefix}{timestamp}_{kind}.yaml"
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=yaml.dump(completions, default_flow_style=False),
+    )
+    return key
+
+
+def list_completion_keys(
+    bucket: str,
+    s3_client: "boto3.client",
+    start_after: Optional[str] = None,
+    prefix: str = COMPLETIONS_PREFIX,
+) -> List[str]:
+    """
+    Lists completion files newer than the watermark, oldest first.
+    """
+    paginator = s3_client.get_paginator("list_objects_v2")
+    params = {"Bucket": bucket, "Prefix": prefix}
+    if start_after:
+        params["StartAfter"] = start_after
+
+    keys = []
+    for page in paginator.paginate(**params):
+        keys.extend(obj["Key"] for obj in page.get("Contents", []))
+    return sorted(keys)
+
+
+def merge_inventory(inventory: Dict, completions: Dict) -> Dict:
+    """
+    Adds completed ids to the matching lists of the inventory in place.
+    """
+    for key, value in completions.items():
+        if isinstance(value, dict):
+            merge_inventory(inventory.setdefault(key, {}), value)
+        elif value:
+            existing = inventory.get(key) or []
+            inventory[key] = sorted(set(existing) | {str(item) for item in value})
+    return inventory
+
+
+def load_state(
+    bucket: str, s3_client: "boto3.client", state_path: str = STATE_PATH
+) -> Dict:
+    """
+    Loads the incremental inventory state (watermark). Returns an empty dict if missing.
+    """
+    return _load_yaml_or_none(state_path, bucket, s3_client) or {}
+
+
+def save_state(
+    watermark: str,
+    bucket: str,
+    s3_client: "boto3.client",
+    state_path: str = STATE_PATH,
+) -> None:
+    state = {
+        "watermark": watermark,
+        "updated": datetime.now(timezone.utc).isoformat(),
+    }
+    s3_client.put_object(
+        Bucket=bucket, Key=state_path, Body=yaml.dump(state, default_flow_style=False)
+    )
+
+
+def apply_new_completions(
+    inventory: Dict,
+    bucket: str,
+    s3_client: "boto3.client",
+    watermark: Optional[str] = None,
+    prefix: str = COMPLETIONS_PREFIX,
+) -> str:
+    """
+    Merges every completion file after the watermark into the inventory.
+
+    :return: The new watermark (the last completion file applied).
+    """
+    keys = list_completion_keys(bucket, s3_client, start_after=watermark, prefix=prefix)
+    logger.info(f"Applying {len(keys)} completion files")
+
+    for key in keys:
+        completions = _load_yaml_or_none(key, bucket, s3_client)
+        if completions:
+            merge_inventory(inventory, completions)
+
+    return keys[-1] if keys else watermark
@@ -0,0 +1,142 @@
+from typing_extensions import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+from nba_data_pull.lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+
+def season_year_from_game_id(game_id: str) -> int:
+    """
+    Returns the starting year of the season a game belongs to.
+
+    Game ids look like 0022400001 where "24" is the season.
+    """
+    year = int(str(game_id).zfill(10)[3:5])
+    return 1900 + year if year >= 46 else 2000 + year
+
+
+def unique_ids(ids_by_season: Dict[str, Sequence]) -> "np.ndarray":
+    """
+    Merges the numeric ids of every season into one int64 array without
+    duplicates, in the order they first appear.
+
+    :param ids_by_season: {season: ids}, as ints, numeric strings or arrays.
+    """
+    arrays = [np.asarray(ids, dtype=np.int64) for ids in ids_by_season.values()]
+    if not arrays:
+        return np.empty(0, dtype=np.int64)
+    merged = np.concatenate(arrays)
+    _, first = np.unique(merged, return_index=True)
+    return merged[np.sort(first)]
+
+
+class InventoryDiff(NamedTuple):
+    missing: List[str]
+    extra: List[str]
+    per_season: Dict[str, Dict[str, int]]
+
+
+class InventoryIndex:
+    """
+    Set-backed view of an inventory dictionary.
+
+    Every leaf list of the inventory (e.g. GAME/REGULAR_SEASON or PLAYER) is
+    stored as a frozenset of string ids so membership checks are O(1).
+
+    :param inventory: Nested inventory dictionary as saved in inventory.yaml.
+    """
+
+    def __init__(self, inventory: Dict):
+        self._ids: Dict[Tuple[str, ...], frozenset] = {}
+        self._index(inventory or {}, ())
+
+    def _index(self, node: Dict, path: Tuple[str, ...]) -> None:
+        for key, value in node.items():
+            if isinstance(value, dict):
+                self._index(value, (*path, key))
+            else:
+                self._ids[(*path, key)] = frozenset(str(i) for i in value or [])
+
+    def ids(self, *path: str) -> frozenset:
+        """
+        Returns the ids stored at a path, e.g. ids("GAME", "REGULAR_SEASON").
+        """
+        return self._ids.get(tuple(path), frozenset())
+
+    def contains(self, path: Tuple[str, ...], item_id) -> bool:
+        return str(item_id) in self.ids(*path)
+
+    def missing(self, path: Tuple[str, ...], candidates: Iterable) -> List[str]:
+        """
+        Returns candidates that are not in the inventory, keeping their order
+        and dropping duplicates.
+        """
+        present = self.ids(*path)
+        seen = set()
+        missing = []
+        for candidate in candidates:
+            candidate = str(candidate)
+            if candidate not in present and candidate not in seen:
+                seen.add(candidate)
+                missing.append(candidate)
+        return missing
+
+    def missing_ids(self, path: Tuple[str, ...], candidates: "np.ndarray") -> List[str]:
+        """
+        Vectorized `missing` for an array of numeric ids, e.g. from `unique_ids`.
+        Non numeric ids in the inventory are ignored.
+        """
+        present = np.fromiter(
+            (int(i) for i in self.ids(*path) if i.isdigit()), dtype=np.int64
+        )
+        candidates = np.asarray(candidates, dtype=np.int64)
+        return candidates[~np.isin(candidates, present)].astype(str).tolist()
+
+    def extra(self, path: Tuple[str, ...], expected: Iterable) -> List[str]:
+        """
+        Returns ids in the inventory that were not expected.
+        """
+        return sorted(self.ids(*path) - {str(i) for i in expected})
+
+    def diff(self, path: Tuple[str, ...], expected) -> InventoryDiff:
+        """
+        Compares the inventory at a path against the expected ids.
+
+        :param path: Inventory path, e.g. ("GAME", "REGULAR_SEASON").
+        :param expected: Either a list of ids or a dictionary of season -> ids.
+        :return: Missing ids, extra ids, and per-season expected/present/missing counts.
+        """
+        present = self.ids(*path)
+        if not isinstance(expected, dict):
+            expected = {None: expected}
+
+        missing = []
+        expected_ids = set()
+        per_season = {}
+        for season, season_ids in expected.items():
+            season_missing = self.missing(path, season_ids)
+            missing.extend(season_missing)
+            season_ids = {str(i) for i in season_ids}
+            expected_ids |= season_ids
+            if season is not None:
+                per_season[str(season)] = {
+                    "expected": len(season_ids),
+                    "present": len(season_ids & present),
+                    "missing": len(season_missing),
+                }
+
+        return InventoryDiff(
+            missing=missing,
+            extra=sorted(present - expected_ids),
+            per_season=per_season,
+        )
+
+    def season_counts(self, *path: str) -> Dict[int, int]:
+        """
+        Counts the game ids at a path by the season they belong to.
+        """
+        counts: Dict[int, int] = {}
+        for game_id in self.ids(*path):
+            season = season_year_from_game_id(game_id)
+            counts[season] = counts.get(season, 0) + 1
+        return dict(sorted(counts.items()))
@@ -1,17 +1,19 @@
 from datetime import datetime
-from time import sleep
 
-import boto3
-import yaml
-from nbastatpy.season import Season
 from tqdm import tqdm
-from typing_extensions import Dict, List, Tuple
+from typing_extensions import TYPE_CHECKING, Dict, List, Optional, Tuple
 
+from nba_data_pull.data_pull.pacing import FixedPacer, Pacer
+from nba_data_pull.data_pull.response_cache import ResponseCache
+from nba_data_pull.inventory.inventory_index import InventoryIndex
+from nba_data_pull.inventory.metadata_store import MetadataStore
+from nba_data_pull.lazy_imports import lazy_import
 
-def load_yaml_s3(file_path: str, bucket_name: str, s3_client: boto3.client) -> dict:
-    response = s3_client.get_object(Bucket=bucket_name, Key=str(file_path))
-    yaml_content = response["Body"].read().decode("utf-8")
-    return yaml.safe_load(yaml_content)
+boto3 = lazy_import("boto3")
+np = lazy_import("numpy")
+
+if TYPE_CHECKING:
+    from nbastatpy.season import Season
 
 
 class InventoryMeta:
@@ -110,29 +112,127 @@ class SeasonYear:
     default = current_season_year
 
 
-def process_seasons(seasons: List, playoffs: bool) -> Tuple[Dict[str, List], List[str]]:
+MANIFEST_PREFIX = "data/meta/season_manifests/"
+
+
+def _fetch_season(
+    season_ingest: "Season",
+    getter: str,
+    pacer: Pacer,
+    cache: Optional[ResponseCache] = None,
+):
+    fetch = getattr(season_ingest, getter)
+    if cache is None:
+        return pacer.call(fetch)
+    return cache.get_or_fetch(
+        endpoint=getter,
+        params=(season_ingest.season, season_ingest.season_type, season_ingest.permode),
+        fetch=lambda: pacer.call(fetch),
+        ttl=cache.ttl_for_season(season_ingest.season_year),
+    )
+
+
+def discover_season_ids(
+    season: str, playoffs: bool, pacer: Pacer, cache: Optional[ResponseCache] = None
+) -> Dict[str, List[str]]:
+    """
+    Finds the game and player ids of a season from the league game log (two
+    rows per game) and the season player stats (one row per player), instead
+    of the full player game log.
+
+    :return: {"game_ids": [...], "player_ids": [...]}
+    """
+    from nbastatpy.season import Season
+
+    season_ingest = Season(season, playoffs=playoffs, permode="PerGame")
+    team_games = _fetch_season(season_ingest, "get_team_games", pacer, cache)
+    player_stats = _fetch_season(season_ingest, "get_player_stats", pacer, cache)
+    return {
+        "game_ids": team_games["GAME_ID"].astype(str).unique().tolist(),
+        "player_ids": player_stats["PLAYER_ID"].astype(str).unique().tolist(),
+    }
+
+
+def latest_game_date(
+    season: str,
+    playoffs: bool,
+    pacer: Optional[Pacer] = None,
+    cache: Optional[ResponseCache] = None,
+) -> str:
+    """
+    Returns the date of the latest game played in a season (YYYY-MM-DD), or
+    None if no game has been played. Reuses the game log discover_season_ids
+    fetches, so with a cache it makes no extra call.
+    """
+    if pacer is None:
+        pacer = FixedPacer()
+
+    from nbastatpy.season import Season
+
+    season_ingest = Season(season, playoffs=playoffs, permode="PerGame")
+    team_games = _fetch_season(season_ingest, "get_team_games", pacer, cache)
+    if team_games.empty:
+        return None
+    return str(team_games["GAME_DATE"].max())[:10]
+
+
+def manifest_path(season: str, playoffs: bool) -> str:
+    season_type = "PLAYOFFS" if playoffs else "REGULAR_SEASON"
+    return f"{MANIFEST_PREFIX}{season}_{season_type}.yaml"
+
+
+def process_seasons(
+    seasons: List,
+    playoffs: bool,
+    pacer: Optional[Pacer] = None,
+    cache: Optional[ResponseCache] = None,
+    manifest_store: Optional[MetadataStore] = None,
+    refresh_manifests: bool = False,
+) -> Tuple[Dict[str, List], Dict[str, "np.ndarray"]]:
     """
     Processes a list of seasons and returns game IDs per season and a consolidated list of player IDs.
 
+    The ids of a finished season never change, so with a manifest store they
+    are saved to S3 the first time they are found and read from there afterwards.
+
     :param seasons: List of season identifiers.
     :param playoffs: Boolean indicating if the seasons are playoffs.
-    :param permode: The performance mode parameter for Season.
+    :param pacer: Pacer used for the API calls. Defaults to a one second fixed sleep.
+    :param cache: Optional response cache so finished seasons are only downloaded once.
+    :param manifest_store: Optional store for the per-season id manifests.
+    :param refresh_manifests: Rediscover finished seasons even if they have a manifest.
     :return: A tuple containing:
              - A dictionary mapping season (as string) to a list of game IDs.
-             - A list of player IDs (as strings) from all seasons.
+             - A dictionary mapping season (as string) to an int64 array of
+               player IDs. Merge them with inventory_index.unique_ids.
     """
+    if pacer is None:
+        pacer = FixedPacer()
+
     game_ids: Dict[str, List] = {}
-    player_ids: List[str] = []
+    player_ids: Dict[str, "np.ndarray"] = {}
     progress_bar = tqdm(total=len(seasons), desc="Progress", unit="task")
 
     for season in seasons:
         progress_bar.set_description(f"Getting {season}")
-        season_ingest = Season(season, playoffs=playoffs, permode="PerGame")
-        df = season_ingest.get_player_games()
-        game_ids[str(season)] = df["GAME_ID"].unique().tolist()
-        player_ids.extend(df["PLAYER_ID"].astype(str).unique().tolist())
+        finished = int(season) < SeasonYear.default
+        use_manifest = manifest_store is not None and finished
+
+        manifest = None
+        if use_manifest and not refresh_manifests:
+            try:
+                manifest = manifest_store.load(manifest_path(season, playoffs))
+            except manifest_store.s3.exceptions.NoSuchKey:
+                manifest = None
+
+        if manifest is None:
+            manifest = discover_season_ids(season, playoffs, pacer, cache)
+            if use_manifest:
+                manifest_store.save(manifest, manifest_path(season, playoffs))
+
+        game_ids[str(season)] = manifest["game_ids"]
+        player_ids[str(season)] = np.asarray(manifest["player_ids"], dtype=np.int64)
         progress_bar.update(1)
-        sleep(1)
 
     progress_bar.close()
     return game_ids, player_ids
@@ -150,8 +250,9 @@ def get_season_list(earliest_season_year: int, inventory: dict, playoffs: bool =
     seasons = [f"{str(season)}{str(season + 1)[-2:]}" for season in seasons]
     seasons = [
         season[0:4]
-        for season in seasons
-        if season not in inventory["SEASON"]["PER_GAME"][season_grain]
+        for season in InventoryIndex(inventory).missing(
+            ("SEASON", "PER_GAME", season_grain), seasons
+        )
     ]
     if not seasons:
         seasons = [f"{str(season_year)}"]
@@ -0,0 +1,265 @@
+import gzip
+import json
+from datetime import date
+from enum import Enum
+from pathlib import Path
+
+import yaml
+from loguru import logger
+from typing_extensions import Dict, Iterator, List, Optional, Tuple
+
+from nba_data_pull.lazy_imports import lazy_import
+
+boto3 = lazy_import("boto3")
+
+# Uses libyaml when it is installed, it parses several times faster
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+class MetaFormat(str, Enum):
+    yaml = "yaml"
+    jsonl = "jsonl"
+    jsonl_gz = "jsonl_gz"
+    msgpack = "msgpack"
+
+
+META_SUFFIXES = {
+    MetaFormat.yaml: ".yaml",
+    MetaFormat.jsonl: ".jsonl",
+    MetaFormat.jsonl_gz: ".jsonl.gz",
+    MetaFormat.msgpack: ".msgpack",
+}
+
+
+def format_from_path(path) -> MetaFormat:
+    """
+    Returns the metadata format of a file from its suffix. Unknown suffixes
+    are read as YAML.
+    """
+    name = Path(str(path)).name
+    for fmt in (MetaFormat.jsonl_gz, MetaFormat.jsonl, MetaFormat.msgpack):
+        if name.endswith(META_SUFFIXES[fmt]):
+            return fmt
+    return MetaFormat.yaml
+
+
+def with_format(path, fmt: MetaFormat) -> str:
+    """
+    Swaps the suffix of a metadata path, e.g.
+    data/meta/inventory.yaml -> data/meta/inventory.jsonl.gz
+    """
+    path = str(path)
+    for suffix in (*META_SUFFIXES.values(), ".yml"):
+        if path.endswith(suffix):
+            path = path[: -len(suffix)]
+            break
+    return f"{path}{META_SUFFIXES[fmt]}"
+
+
+def _flatten(node: Dict, path: Tuple[str, ...] = ()) -> Iterator[Tuple[list, object]]:
+    for key, value in node.items():
+        if isinstance(value, dict) and value:
+            yield from _flatten(value, (*path, key))
+        else:
+            yield [*path, key], value
+
+
+def _unflatten(records: List[Tuple[list, object]]) -> Dict:
+    data = {}
+    for path, value in records:
+        node = data
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+    return data
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError as e:
+        raise ImportError(
+            "msgpack is needed for the msgpack metadata format, "
+            "install it with `pip install nba-data-pull[msgpack]`"
+        ) from e
+    return msgpack
+
+
+def dumps(data: Dict, fmt: MetaFormat) -> bytes:
+    """
+    Serializes a metadata dictionary.
+
+    JSON lines files have one line per leaf of the dictionary, e.g.
+    {"path": ["GAME", "REGULAR_SEASON"], "value": ["0022400001", ...]}
+    """
+    if fmt == MetaFormat.yaml:
+        return yaml.dump(data, Dumper=YAML_DUMPER, default_flow_style=False).encode(
+            "utf-8"
+        )
+    if fmt == MetaFormat.msgpack:
+        return _msgpack().packb(data, use_bin_type=True)
+
+    content = "".join(
+        json.dumps({"path": path, "value": value}, separators=(",", ":")) + "\n"
+        for path, value in _flatten(data or {})
+    ).encode("utf-8")
+    if fmt == MetaFormat.jsonl_gz:
+        # Sorted id lists compress well and mtime=0 keeps the output reproducible
+        return gzip.compress(content, compresslevel=6, mtime=0)
+    return content
+
+
+def loads(content: bytes, fmt: MetaFormat) -> Dict:
+    """
+    Parses a metadata file written by `dumps`.
+    """
+    if fmt == MetaFormat.yaml:
+        return yaml.load(content.decode("utf-8"), Loader=YAML_LOADER)
+    if fmt == MetaFormat.msgpack:
+        return _msgpack().unpackb(content, raw=False)
+
+    if fmt == MetaFormat.jsonl_gz:
+        content = gzip.decompress(content)
+    records = (json.loads(line) for line in content.splitlines() if line)
+    return _unflatten([(record["path"], record["value"]) for record in records])
+
+
+class MetadataStore:
+    """
+    Reads and writes pipeline metadata (inventory, data to pull) in S3.
+
+    Callers keep passing the YAML paths (e.g. data/meta/inventory.yaml). The
+    store swaps the suffix for its format, and falls back to the YAML file
+    when the compact file has not been written yet.
+
+    :param bucket_name: Name of the S3 bucket.
+    :param s3_client: boto3 S3 client.
+    :param fmt: Format used to write and (first) read files.
+    :param export_yaml: Also write a YAML copy next to compact files for humans.
+    """
+
+    def __init__(
+        self,
+        bucket_name: str,
+        s3_client: "boto3.client",
+        fmt: MetaFormat = MetaFormat.jsonl_gz,
+        export_yaml: bool = True,
+    ):
+        self.bucket_name = bucket_name
+        self.s3 = s3_client
+        self.fmt = MetaFormat(fmt)
+        self.export_yaml = export_yaml
+
+    def _get(self, key: str) -> bytes:
+        response = self.s3.get_object(Bucket=self.bucket_name, Key=key)
+        return response["Body"].read()
+
+    def load(self, path) -> Dict:
+        """
+        Loads a metadata file, preferring the store's format over the path's own suffix.
+        """
+        key = with_format(path, self.fmt)
+        if key != str(path):
+            try:
+                return loads(self._get(key), self.fmt)
+            except self.s3.exceptions.NoSuchKey:
+                logger.info(f"{key} not found, reading {path}")
+        return loads(self._get(str(path)), format_from_path(path))
+
+    def save(self, data: Dict, path) -> List[str]:
+        """
+        Saves a metadata file in the store's format, plus a YAML export if enabled.
+
+        :return: The keys written.
+        """
+        keys = [with_format(path, self.fmt)]
+        if self.export_yaml and self.fmt != MetaFormat.yaml:
+            keys.append(with_format(path, MetaFormat.yaml))
+
+        for key in keys:
+            self.s3.put_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                Body=dumps(data, format_from_path(key)),
+            )
+        return keys
+
+    def list_keys(self, folder: str) -> List[str]:
+        """
+        Lists the files directly in a folder (not in its sub folders).
+        """
+        prefix = f"{str(folder).rstrip('/')}/"
+        paginator = self.s3.get_paginator("list_objects_v2")
+        keys = []
+        for page in paginator.paginate(
+            Bucket=self.bucket_name, Prefix=prefix, Delimiter="/"
+        ):
+            keys += [obj["Key"] for obj in page.get("Contents", [])]
+        return keys
+
+    def copy(self, path, dest, existing: Optional[List[str]] = None) -> List[str]:
+        """
+        Copies every format a metadata file is saved in (e.g. the jsonl.gz file
+        and its YAML export) to another path with server-side copies, so
+        nothing is downloaded or parsed.
+
+        :param existing: Keys in the source folder, listed if None.
+        :return: The keys written.
+        """
+        if existing is None:
+            existing = self.list_keys(Path(str(path)).parent)
+        existing = set(existing)
+
+        keys = []
+        for fmt in MetaFormat:
+            source = with_format(path, fmt)
+            if source not in existing:
+                continue
+            key = with_format(dest, fmt)
+            self.s3.copy_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                CopySource={"Bucket": self.bucket_name, "Key": source},
+            )
+            keys.append(key)
+        return keys
+
+    def prune_archives(
+        self, folder, keep_days: int, today: Optional[date] = None
+    ) -> List[str]:
+        """
+        Deletes dated archive folders (<folder>/YYYY-MM-DD/) older than `keep_days`.
+
+        :return: The folders deleted.
+        """
+        today = today or date.today()
+        prefix = f"{str(folder).rstrip('/')}/"
+        paginator = self.s3.get_paginator("list_objects_v2")
+
+        expired = []
+        for page in paginator.paginate(
+            Bucket=self.bucket_name, Prefix=prefix, Delimiter="/"
+        ):
+            for common_prefix in page.get("CommonPrefixes", []):
+                name = common_prefix["Prefix"][len(prefix) :].rstrip("/")
+                try:
+                    archived = date.fromisoformat(name)
+                except ValueError:
+                    continue
+                if (today - archived).days > keep_days:
+                    expired.append(common_prefix["Prefix"])
+
+        for archive in expired:
+            keys = [
+                {"Key": obj["Key"]}
+                for page in paginator.paginate(Bucket=self.bucket_name, Prefix=archive)
+                for obj in page.get("Contents", [])
+            ]
+            # delete_objects takes at most 1000 keys per request
+            for start in range(0, len(keys), 1000):
+                self.s3.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": keys[start : start + 1000], "Quiet": True},
+                )
+        return expired
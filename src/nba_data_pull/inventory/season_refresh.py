@@ -0,0 +1,101 @@
+from datetime import date
+from enum import Enum
+
+from typing_extensions import Dict, List
+
+STATE_PATH = "data/meta/season_refresh_state.yaml"
+
+# Endpoint groups of SeasonIngest, refreshed on their own cadence
+NONSYNERGY = "nonsynergy"
+SYNERGY = "synergy"
+
+
+class AggregateRefresh(str, Enum):
+    new_games = "new_games"
+    always = "always"
+
+
+def refresh_groups(
+    entry: Dict,
+    last_game_date: str,
+    today: date,
+    cadence: AggregateRefresh = AggregateRefresh.new_games,
+    synergy_days: int = 7,
+) -> List[str]:
+    """
+    Decides which endpoint groups of the current season to pull again.
+
+    Non-synergy aggregates are refreshed when games were played since their
+    last refresh (or every run with the `always` cadence). Synergy and
+    tracking endpoints are refreshed at most every `synergy_days` days, and
+    only if there are new games since their last refresh.
+
+    :param entry: Refresh state of one season folder,
+        {group: {"game_date", "refreshed"}}.
+    :param last_game_date: Date of the latest game played this season (YYYY-MM-DD),
+        or None if no game has been played.
+    :param today: Date of the run.
+    """
+    if not last_game_date:
+        return []
+
+    entry = entry or {}
+    groups = []
+
+    nonsynergy = entry.get(NONSYNERGY) or {}
+    if cadence == AggregateRefresh.always or last_game_date > nonsynergy.get(
+        "game_date", ""
+    ):
+        groups.append(NONSYNERGY)
+
+    synergy = entry.get(SYNERGY) or {}
+    refreshed = synergy.get("refreshed")
+    due = (
+        refreshed is None
+        or (today - date.fromisoformat(refreshed)).days >= synergy_days
+    )
+    new_games = last_game_date > synergy.get("game_date", "")
+    if due and (new_games or cadence == AggregateRefresh.always):
+        groups.append(SYNERGY)
+
+    return groups
+
+
+def mark_refreshed(
+    entry: Dict, last_game_date: str, groups: List[str], today: date
+) -> Dict:
+    """
+    Records that the groups of a season folder were pulled up to a game date.
+    """
+    entry = dict(entry or {})
+    for group in groups:
+        entry[group] = {"game_date": last_game_date, "refreshed": today.isoformat()}
+    return entry
+
+
+def update_refresh_state(
+    state: Dict, planned: Dict, completed: Dict, today: date
+) -> Dict:
+    """
+    Marks the planned refreshes of the season folders that were fully saved.
+
+    :param state: {per_mode: {season_type: {season_id: entry}}}, updated in place.
+    :param planned: The season_refresh section of data to pull, same shape as
+        the state with {"last_game_date", "groups"} leaves.
+    :param completed: {per_mode: {season_type: [season ids saved without errors]}}
+    :return: The updated state.
+    """
+    for per_mode, season_types in planned.items():
+        for season_type, seasons in season_types.items():
+            done = set(completed.get(per_mode, {}).get(season_type, []))
+            node = state.setdefault(per_mode, {}).setdefault(season_type, {})
+            for season_id, plan in seasons.items():
+                if season_id not in done:
+                    continue
+                node[season_id] = mark_refreshed(
+                    node.get(season_id),
+                    plan["last_game_date"],
+                    plan["groups"],
+                    today,
+                )
+    return state
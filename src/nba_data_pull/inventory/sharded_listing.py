@@ -0,0 +1,215 @@
+import string
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from time import monotonic
+
+from loguru import logger
+from typing_extensions import Dict, List, NamedTuple, Optional, Tuple
+
+from nba_data_pull.lazy_imports import lazy_import
+
+boto3 = lazy_import("boto3")
+
+# Entity folders (game, player and season ids) are named with digits only
+SHARD_ALPHABET = string.digits
+
+
+class PrefixTiming(NamedTuple):
+    prefix: str
+    seconds: float
+    requests: int
+    shards: int
+    folders: int
+
+
+def pooled_client(workers: int):
+    """
+    Returns an S3 client whose connection pool fits `workers` concurrent listings.
+    """
+    from botocore.config import Config
+
+    return boto3.client("s3", config=Config(max_pool_connections=max(10, workers)))
+
+
+def _leaf_prefixes(node: Dict, prefix: str) -> List[Tuple[Tuple[str, ...], str]]:
+    leaves = []
+    for key, value in node.items():
+        if isinstance(value, dict):
+            leaves += [
+                ((key, *path), leaf_prefix)
+                for path, leaf_prefix in _leaf_prefixes(value, f"{prefix}{key}/")
+            ]
+        else:
+            leaves.append(((key,), f"{prefix}{key}/"))
+    return leaves
+
+
+class ShardedLister:
+    """
+    Lists the folders under many prefixes at once on a thread pool.
+
+    A prefix is listed with one delimiter request. If the result does not fit
+    in one page, the prefix is split by the next id digit (e.g.
+    data/nba/PLAYER/ into data/nba/PLAYER/0 ... data/nba/PLAYER/9) and the
+    shards are listed concurrently, splitting again until each shard fits
+    in a page or `max_depth` digits are used. Shared leading digits, like the
+    00 of every game id, only cost one extra request per level.
+
+    :param s3_client: boto3 S3 client, shared by every thread. A pooled client
+        is created if None.
+    :param workers: Number of list requests in flight.
+    :param max_depth: Maximum number of id digits a prefix is split by.
+    :param page_size: Folders per list request.
+    """
+
+    def __init__(
+        self,
+        s3_client=None,
+        workers: int = 16,
+        max_depth: int = 6,
+        page_size: int = 1000,
+    ):
+        self.workers = max(1, workers)
+        self.s3 = s3_client if s3_client is not None else pooled_client(workers)
+        self.max_depth = max_depth
+        self.page_size = page_size
+        self.timings: List[PrefixTiming] = []
+        self._lock = threading.Lock()
+
+    def _list_page(self, bucket: str, prefix: str, token: Optional[str] = None) -> Dict:
+        kwargs = {
+            "Bucket": bucket,
+            "Prefix": prefix,
+            "Delimiter": "/",
+            "MaxKeys": self.page_size,
+        }
+        if token:
+            kwargs["ContinuationToken"] = token
+        return self.s3.list_objects_v2(**kwargs)
+
+    def _list_shard(
+        self, bucket: str, root: str, shard: str
+    ) -> Tuple[List[str], List[str], int]:
+        """
+        Lists one shard of a root prefix.
+
+        :return: (folder names, child shards to list, requests made). Child
+            shards are returned instead of listed when the shard is too large.
+        """
+        page = self._list_page(bucket, root + shard)
+        requests = 1
+        folders = [cp["Prefix"] for cp in page.get("CommonPrefixes", [])]
+
+        if page.get("IsTruncated") and len(shard) < self.max_depth:
+            # Names that do not start with a digit are not in any child shard
+            others = [
+                folder
+                for folder in folders
+                if not folder[len(root) :].startswith(tuple(SHARD_ALPHABET))
+            ]
+            if others:
+                logger.warning(f"Non numeric folders under {root}: {others[:5]}")
+            # Nor is the id equal to the shard, e.g. PLAYER/2/ when 2 is split.
+            # "/" sorts before the digits, so it is always on the first page.
+            own = [folder for folder in folders if folder == f"{root}{shard}/"]
+            return (
+                others + own,
+                [shard + digit for digit in SHARD_ALPHABET],
+                requests,
+            )
+
+        while page.get("IsTruncated"):
+            page = self._list_page(
+                bucket, root + shard, page.get("NextContinuationToken")
+            )
+            requests += 1
+            folders += [cp["Prefix"] for cp in page.get("CommonPrefixes", [])]
+        return folders, [], requests
+
+    def list_folders(self, bucket: str, roots: List[str]) -> Dict[str, List[str]]:
+        """
+        Lists the folder names directly under every root prefix.
+
+        :param roots: Prefixes ending with a slash, e.g. data/nba/PLAYER/.
+        :return: {root: sorted folder names}
+        """
+        folders: Dict[str, set] = {root: set() for root in roots}
+        started = {root: monotonic() for root in roots}
+        requests = dict.fromkeys(roots, 0)
+        shards = dict.fromkeys(roots, 0)
+        pending = dict.fromkeys(roots, 0)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            in_flight = {}
+
+            def submit(root: str, shard: str) -> None:
+                future = executor.submit(self._list_shard, bucket, root, shard)
+                in_flight[future] = root
+                pending[root] += 1
+                shards[root] += 1
+
+            for root in roots:
+                submit(root, "")
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    root = in_flight.pop(future)
+                    pending[root] -= 1
+                    names, children, made = future.result()
+                    requests[root] += made
+                    folders[root].update(
+                        name.rstrip("/").split("/")[-1] for name in names
+                    )
+                    for child in children:
+                        submit(root, child)
+
+                    if not pending[root]:
+                        self._record(
+                            PrefixTiming(
+                                root,
+                                round(monotonic() - started[root], 3),
+                                requests[root],
+                                shards[root],
+                                len(folders[root]),
+                            )
+                        )
+
+        return {root: sorted(names) for root, names in folders.items()}
+
+    def _record(self, timing: PrefixTiming) -> None:
+        with self._lock:
+            self.timings.append(timing)
+
+    def log_report(self) -> None:
+        """
+        Logs listing time, requests and shards per prefix, slowest first.
+        """
+        for timing in sorted(self.timings, key=lambda t: t.seconds, reverse=True):
+            logger.info(
+                f"{timing.prefix}: {timing.folders} folders in {timing.seconds}s "
+                f"({timing.requests} requests, {timing.shards} shards)"
+            )
+
+
+def sharded_inventory(
+    inventory: Dict,
+    bucket: str,
+    prefix: str = "data/nba/",
+    lister: Optional[ShardedLister] = None,
+) -> Dict:
+    """
+    Fills every leaf of an inventory template with the folder names under its
+    prefix, like update_s3_inventory, but lists all leaves and their shards
+    concurrently.
+    """
+    lister = lister or ShardedLister()
+    leaves = _leaf_prefixes(inventory, prefix)
+    listed = lister.list_folders(bucket, [leaf_prefix for _, leaf_prefix in leaves])
+
+    for path, leaf_prefix in leaves:
+        node = inventory
+        for key in path[:-1]:
+            node = node[key]
+        node[path[-1]] = listed[leaf_prefix]
+    return inventory
@@ -0,0 +1,117 @@
+import importlib.abc
+import importlib.util
+import sys
+import threading
+from time import perf_counter, process_time
+from types import ModuleType
+
+from loguru import logger
+from typing_extensions import Dict, List, Tuple
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Returns a module that is only executed when one of its attributes is
+    first used, so CLI commands that never touch it do not pay for the import.
+
+    The module object can be patched in tests like a regular import.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """
+    Times every module imported while it is installed, including the deferred
+    imports made by lazy modules on first use.
+
+    It sits first on sys.meta_path, lets the other finders locate each module
+    and wraps the loader's exec_module with a timer. Builtin and frozen modules
+    are not timed.
+    """
+
+    def __init__(self):
+        # name -> (seconds including submodules, seconds in the module itself)
+        self.timings: Dict[str, Tuple[float, float]] = {}
+        self.total = 0.0
+        self.startup_cpu_seconds = 0.0
+        self.modules_at_start = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def start(self) -> "ImportProfiler":
+        # CPU time so far is almost all interpreter startup and imports
+        self.startup_cpu_seconds = process_time()
+        self.modules_at_start = len(sys.modules)
+        sys.meta_path.insert(0, self)
+        return self
+
+    def stop(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in list(sys.meta_path):
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        loader = spec.loader
+        if loader is None or isinstance(loader, type):
+            return spec
+        exec_module = getattr(loader, "exec_module", None)
+        if exec_module is None:
+            return spec
+
+        def timed_exec_module(module):
+            stack = self._local.__dict__.setdefault("stack", [])
+            stack.append(0.0)
+            start = perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                seconds = perf_counter() - start
+                children = stack.pop()
+                with self._lock:
+                    self.timings[fullname] = (seconds, seconds - children)
+                    if stack:
+                        stack[-1] += seconds
+                    else:
+                        self.total += seconds
+
+        loader.exec_module = timed_exec_module
+        return spec
+
+    def slowest(self, top: int = 15) -> List[Tuple[str, float, float]]:
+        """
+        Returns (module, seconds, self seconds) of the slowest imports.
+        """
+        with self._lock:
+            rows = [(name, *seconds) for name, seconds in self.timings.items()]
+        return sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+
+    def log_report(self, top: int = 15) -> None:
+        self.stop()
+        logger.info(
+            f"Startup: {self.startup_cpu_seconds:.2f}s CPU, "
+            f"{self.modules_at_start} modules loaded before the command"
+        )
+        logger.info(
+            f"Imported {len(self.timings)} modules while running in {self.total:.2f}s"
+        )
+        for name, seconds, own in self.slowest(top):
+            logger.info(f"{name}: {seconds * 1000:.0f} ms ({own * 1000:.0f} ms self)")
@@ -0,0 +1,113 @@
+import gzip
+import json
+from unittest import mock
+
+import nbastatpy.season
+import pytest
+import requests
+
+from nba_data_pull.benchmark.harness import compare, run_season_stage
+from nba_data_pull.benchmark.replay import (
+    LocalS3Client,
+    ReplaySession,
+    recording_key,
+    use_session,
+)
+from nba_data_pull.data_pull.pacing import TokenBucketPacer
+from nba_data_pull.data_pull.s3_writer import S3Writer
+from nba_data_pull.data_pull.schemas import OutputFormat
+
+GAME_LOG = {
+    "resource": "leaguegamelog",
+    "parameters": {},
+    "resultSets": [
+        {
+            "name": "LeagueGameLog",
+            "headers": ["GAME_ID", "TEAM_ID", "PTS"],
+            "rowSet": [["0022300001", 1, 100], ["0022300001", 2, 98]],
+        }
+    ],
+}
+
+
+@pytest.fixture
+def recordings(tmp_path):
+    folder = tmp_path / "recordings"
+    folder.mkdir()
+    url = "https://stats.nba.com/stats/leaguegamelog"
+    record = {"url": url, "text": json.dumps(GAME_LOG)}
+    path = folder / f"{recording_key(url, {'Season': '2023-24'})}.json.gz"
+    path.write_bytes(gzip.compress(json.dumps(record).encode("utf-8")))
+    return folder
+
+
+def test_season_stage_replays_through_ingest(tmp_path, recordings):
+    """Test that recorded responses are saved to the local S3 stand-in for any season"""
+    session = ReplaySession(recordings)
+    s3 = LocalS3Client(tmp_path / "s3")
+
+    # boto3 is mocked in tests, so skip building its transfer config
+    with use_session(session), mock.patch.object(S3Writer, "transfer_config", None):
+        report = run_season_stage(
+            ["2022", "2023"],
+            s3,
+            TokenBucketPacer(1000),
+            OutputFormat.csv,
+            workers=2,
+            upload_workers=2,
+            endpoints=["team_games"],
+        )
+
+    keys = s3.list_keys("benchmark", "data/nba/SEASON/")
+    assert [key.rsplit("/", 1)[-1] for key in keys] == [
+        "202223_team_games.csv",
+        "202324_team_games.csv",
+    ]
+    assert report["files"] == 2
+    assert report["errors"] == 0
+    # The recording has other parameters, so it stands in for both seasons
+    assert session.stats()["substituted"] == 2
+
+    with pytest.raises(s3.exceptions.NoSuchKey):
+        s3.get_object(Bucket="benchmark", Key="missing.csv")
+
+
+def test_compare_flags_slower_stages():
+    """Test that only stages slower than the allowed slowdown are reported"""
+    baseline = {"stages": {"game": {"entities_per_second": 10}, "season": {}}}
+    report = {
+        "stages": {
+            "game": {"entities_per_second": 7},
+            "season": {"entities_per_second": 1},
+        }
+    }
+
+    assert len(compare(report, baseline, max_slowdown=0.2)) == 1
+    assert compare(report, baseline, max_slowdown=0.5) == []
+
+
+def test_use_session_routes_nbastatpy_requests(recordings):
+    """Test that nbastatpy's requests.get is replayed and restored afterwards"""
+    session = ReplaySession(recordings)
+    url = "https://stats.nba.com/stats/leaguegamelog"
+
+    with use_session(session):
+        response = nbastatpy.season.requests.get(url)
+
+    assert response.json() == GAME_LOG
+    assert nbastatpy.season.requests is requests
+
+
+def test_local_s3_paginates_list_objects_only(tmp_path):
+    """Test that list_objects_v2 pages keys and other operations are refused"""
+    s3 = LocalS3Client(tmp_path / "s3")
+    for key in ("a/1.csv", "a/2.csv", "b/3.csv"):
+        s3.put_object(Bucket="benchmark", Key=key, Body="x")
+
+    pages = s3.get_paginator("list_objects_v2").paginate(
+        Bucket="benchmark", Prefix="a/", PaginationConfig={"PageSize": 1}
+    )
+    assert [page["Contents"][0]["Key"] for page in pages] == ["a/1.csv", "a/2.csv"]
+
+    with pytest.raises(ValueError):
+        s3.get_paginator("list_objects")
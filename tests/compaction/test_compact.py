@@ -0,0 +1,41 @@
+import io
+from unittest import mock
+
+import pandas as pd
+
+from nba_data_pull.compaction.compact import compact_partition, season_prefix
+
+
+def csv_body(df: pd.DataFrame):
+    return {"Body": io.BytesIO(df.to_csv(index=False).encode("utf-8"))}
+
+
+def test_compact_partition_merges_new_games():
+    """Test that per-game CSVs are merged with their game ids intact"""
+    s3_client = mock.MagicMock()
+    s3_client.get_object.side_effect = lambda Bucket, Key: csv_body(
+        pd.DataFrame({"GAME_ID": [int(Key.split("/")[-2])], "PTS": [100]})
+    )
+    writer = mock.MagicMock()
+
+    rows = compact_partition(
+        "test-bucket",
+        "usage",
+        2024,
+        "REGULAR_SEASON",
+        {
+            game_id: f"data/nba/GAME/REGULAR_SEASON/{game_id}/{game_id}_usage.csv"
+            for game_id in ("0022400001", "0022400002")
+        },
+        compacted=False,
+        s3_client=s3_client,
+        writer=writer,
+        workers=2,
+    )
+
+    path, body = writer.submit.call_args[0]
+    df = pd.read_parquet(io.BytesIO(body))
+    assert rows == 2
+    assert path.endswith("usage/season=2024/game_type=REGULAR_SEASON/usage.parquet")
+    assert df["GAME_ID"].tolist() == ["0022400001", "0022400002"]
+    assert season_prefix("PLAYOFFS", 2024) == "data/nba/GAME/PLAYOFFS/00424"
@@ -20,7 +20,6 @@ os.environ.update(
 # Pre-mock the inventory utilities that might be imported
 # during test collection
 mock_utils = mock.MagicMock()
-mock_utils.load_yaml_s3 = mock.MagicMock(return_value={})
 mock_utils.update_s3_inventory = mock.MagicMock(return_value={})
 mock_utils.get_season_list = mock.MagicMock(return_value=[])
 mock_utils.process_seasons = mock.MagicMock(return_value=([], []))
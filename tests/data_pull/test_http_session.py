@@ -0,0 +1,48 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+
+from nba_data_pull.data_pull.http_session import PooledSession
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = self.headers.get("Accept-Encoding", "").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/stats/endpoint"
+    server.shutdown()
+    server.server_close()
+
+
+def test_session_reuses_connections(server_url):
+    """Test that repeated calls share one kept-alive connection"""
+    session = PooledSession(pool_size=2)
+    for _ in range(5):
+        response = session.get(server_url, headers={"Accept-Encoding": "br"})
+        assert response.status_code == 200
+        # Replaced with the encodings requests can decode
+        assert response.text == DEFAULT_ACCEPT_ENCODING
+
+    assert session.stats() == {
+        "requests": 5,
+        "connections": 1,
+        "reused": 4,
+        "reuse_rate": 0.8,
+    }
@@ -0,0 +1,27 @@
+from nba_data_pull.data_pull.journal import RunJournal
+
+
+def test_resumed_run_sees_saved_endpoints(tmp_path):
+    """Test that a second journal with the same run id sees the first run's progress"""
+    journal = RunJournal(tmp_path / "runs.sqlite")
+    journal.start("GAME")
+    journal.plan("regular_season", ["0022400002", "0022400001"])
+    journal.record("GAME/REGULAR_SEASON/0022400002", "advanced")
+    journal.close()
+
+    resumed = RunJournal(tmp_path / "runs.sqlite", run_id=journal.run_id)
+
+    assert resumed.exists()
+    assert resumed.planned("regular_season") == ["0022400002", "0022400001"]
+    assert resumed.is_done("GAME/REGULAR_SEASON/0022400002", "advanced")
+    assert not resumed.is_done("GAME/REGULAR_SEASON/0022400002", "usage")
+    assert resumed.partial_entities({"GAME/REGULAR_SEASON/0022400002": 9}) == {
+        "GAME/REGULAR_SEASON/0022400002": 1
+    }
+    # Folders that only pull the endpoints they were missing
+    assert resumed.partial_entities({"GAME/REGULAR_SEASON/0022400002": 1}) == {}
+
+
+def test_unknown_run_does_not_exist(tmp_path):
+    """Test that an unknown run id is reported as missing"""
+    assert not RunJournal(tmp_path / "runs.sqlite", run_id="missing").exists()
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+from nba_data_pull.data_pull.dataingest import IngestMixin
+from nba_data_pull.data_pull.metrics import (
+    MetricsCollector,
+    prometheus_text,
+    write_prometheus_textfile,
+)
+from nba_data_pull.data_pull.pacing import TokenBucketPacer
+
+
+class FakeIngest(IngestMixin):
+    def __init__(self, save_folder, metrics):
+        self._init_ingest(pacer=TokenBucketPacer(1000), metrics=metrics)
+        self.save_folder = save_folder
+
+    def _file_prefix(self):
+        return "1"
+
+    def _cache_params(self):
+        return ("1",)
+
+    def save_usage(self):
+        df = self._fetch(lambda: pd.DataFrame({"a": [1, 2, 3]}))
+        self._save(df, "usage")
+
+    def save_broken(self):
+        self._fetch(self._raise)
+
+    @staticmethod
+    def _raise():
+        raise ValueError("no data")
+
+
+def test_measure_records_saves_and_errors(tmp_path):
+    """Test that each save records rows, timings and outcome, and errors still raise"""
+    metrics = MetricsCollector("GAME", run_id="run")
+    (tmp_path / "1").mkdir()
+    ingest = FakeIngest(str(tmp_path / "1"), metrics)
+
+    ingest._measure("usage", ingest.save_usage)
+    with pytest.raises(ValueError):
+        ingest._measure("broken", ingest.save_broken)
+
+    report = metrics.report()
+    usage, broken = report["records"]
+    assert usage["outcome"] == "ok"
+    assert usage["rows"] == 3
+    assert usage["path"].endswith("1_usage.csv")
+    assert broken["outcome"] == "error"
+    assert broken["error"] == "ValueError: no data"
+    assert report["endpoints"]["broken"]["outcomes"] == {"error": 1}
+
+
+def test_report_joins_upload_times_and_writes_prometheus(tmp_path):
+    """Test that upload times and failures are joined on path"""
+    metrics = MetricsCollector("SEASON", run_id="run")
+    for entity in ("2023", "2024"):
+        record = MetricsCollector.new_record(entity, "player_stats")
+        record.update(outcome="ok", rows=10, bytes=100, path=f"s3://b/{entity}.csv")
+        metrics.record(record)
+
+    report = metrics.report(
+        upload_times={"s3://b/2023.csv": 0.5}, failed_uploads={"s3://b/2024.csv"}
+    )
+    summary = report["endpoints"]["player_stats"]
+    assert summary["upload_seconds"] == 0.5
+    assert summary["outcomes"] == {"ok": 1, "upload_failed": 1}
+    assert summary["rows"] == 20
+
+    text = prometheus_text(report)
+    assert (
+        'nba_ingest_endpoint_calls{kind="SEASON",endpoint="player_stats",'
+        'outcome="upload_failed"} 1' in text
+    )
+
+    write_prometheus_textfile(report, tmp_path / "nba.prom")
+    assert (tmp_path / "nba.prom").read_text() == text
+    assert list(tmp_path.iterdir()) == [tmp_path / "nba.prom"]
@@ -0,0 +1,92 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+
+import pytest
+
+from nba_data_pull.data_pull.pacing import AIMDPacer, FixedPacer, is_retryable
+
+
+def test_fixed_pacer_does_not_retry():
+    """Test that the fixed policy keeps the original fail-fast behavior"""
+    pacer = FixedPacer(delay=0)
+
+    def throttled():
+        raise json.JSONDecodeError("Expecting value", "", 0)
+
+    with pytest.raises(json.JSONDecodeError):
+        pacer.call(throttled)
+
+    assert pacer.stats()["failures"] == 1
+    assert pacer.stats()["retries"] == 0
+
+
+def test_fixed_pacer_delay_is_shared_across_threads():
+    """Test that workers take turns instead of each sleeping its own delay"""
+    pacer = FixedPacer(delay=0.02)
+
+    start = monotonic()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: pacer.call(lambda: None), range(8)))
+
+    # Eight calls at one per delay, not two rounds of four in parallel
+    assert monotonic() - start >= 8 * 0.02
+    assert pacer.stats()["calls"] == 8
+
+
+def test_aimd_pacer_backs_off_and_retries():
+    """Test that a throttled call cuts the rate and is retried"""
+    pacer = AIMDPacer(requests_per_second=100, max_rate=200, base_backoff=0)
+    responses = iter([TimeoutError("timed out"), "ok"])
+
+    def flaky():
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert pacer.call(flaky) == "ok"
+
+    stats = pacer.stats()
+    assert stats["retries"] == 1
+    assert stats["rate"] == pytest.approx(50.05)
+
+
+def test_aimd_pacer_does_not_retry_other_errors():
+    """Test that errors unrelated to throttling are raised straight away"""
+    pacer = AIMDPacer(requests_per_second=100)
+
+    def broken():
+        raise KeyError("resultSets")
+
+    with pytest.raises(KeyError):
+        pacer.call(broken)
+
+    assert pacer.stats()["retries"] == 0
+    assert pacer.rate == 100
+
+
+def test_is_retryable_status_codes():
+    """Test that 429 responses are retryable and 404s are not"""
+
+    class Response:
+        def __init__(self, status_code):
+            self.status_code = status_code
+
+    class HTTPError(Exception):
+        def __init__(self, status_code):
+            self.response = Response(status_code)
+
+    assert is_retryable(HTTPError(429))
+    assert not is_retryable(HTTPError(404))
+
+
+def test_aimd_pacer_increases_are_not_lost_across_threads():
+    """Test that concurrent successes each add to the rate"""
+    pacer = AIMDPacer(requests_per_second=1.0, max_rate=1000.0, increase=0.01)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(pacer.on_success, [0.1] * 2000))
+
+    assert pacer.rate == pytest.approx(21.0)
+    assert pacer.calls == 2000
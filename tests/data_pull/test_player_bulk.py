@@ -0,0 +1,72 @@
+from unittest import mock
+
+import pandas as pd
+
+from nba_data_pull.data_pull.dataingest import PlayerBulkIngest, PlayerLayout
+from nba_data_pull.data_pull.pacing import TokenBucketPacer
+
+PLAYER_INDEX = pd.DataFrame(
+    {
+        column: [None, None, None]
+        for column in PlayerBulkIngest.COMMON_INFO_COLUMNS
+        if column not in {"PERSON_ID", "DRAFT_YEAR"}
+    }
+).assign(
+    PERSON_ID=[1, 2, 3],
+    PLAYER_FIRST_NAME=["A", "B", "C"],
+    PLAYER_LAST_NAME=["X", "Y", "Z"],
+    DRAFT_YEAR=[2003, 2003, None],
+)
+COMBINE = pd.DataFrame({"PLAYER_ID": [1, 2], "SEASON": ["2003", "2003"]})
+
+
+def bulk_ingest(layout):
+    writer = mock.MagicMock(serializer=None)
+    ingest = PlayerBulkIngest(
+        ["1", "2", "3", "4"],
+        save_folder="s3://bucket/data/nba/PLAYER",
+        tables_folder="s3://bucket/data/nba/PLAYER_TABLES",
+        layout=layout,
+        pacer=TokenBucketPacer(1000),
+        writer=writer,
+    )
+    ingest.get_player_index = mock.MagicMock(return_value=PLAYER_INDEX)
+    ingest.get_draft_combine = mock.MagicMock(return_value=COMBINE)
+    return ingest, writer
+
+
+def test_bulk_fans_out_to_player_folders():
+    """Test that one index call and one call per draft year cover every player"""
+    ingest, writer = bulk_ingest(PlayerLayout.per_player)
+
+    assert ingest.save_all() == ["1", "2", "3"]
+
+    ingest.get_player_index.assert_called_once()
+    ingest.get_draft_combine.assert_called_once_with("2003")
+    paths = sorted(call.args[0] for call in writer.submit.call_args_list)
+    assert paths == [
+        "s3://bucket/data/nba/PLAYER/1/1_combine_stats.csv",
+        "s3://bucket/data/nba/PLAYER/1/1_common_info.csv",
+        "s3://bucket/data/nba/PLAYER/2/2_combine_stats.csv",
+        "s3://bucket/data/nba/PLAYER/2/2_common_info.csv",
+        "s3://bucket/data/nba/PLAYER/3/3_common_info.csv",
+    ]
+
+
+def test_bulk_consolidated_saves_one_table_per_endpoint():
+    """Test that the consolidated layout writes a single table per endpoint"""
+    ingest, writer = bulk_ingest(PlayerLayout.consolidated)
+
+    ingest.save_all()
+
+    calls = {call.args[0]: call.args[1] for call in writer.submit.call_args_list}
+    assert sorted(calls) == [
+        "s3://bucket/data/nba/PLAYER_TABLES/ALL_combine_stats.csv",
+        "s3://bucket/data/nba/PLAYER_TABLES/ALL_common_info.csv",
+    ]
+    common_info = calls["s3://bucket/data/nba/PLAYER_TABLES/ALL_common_info.csv"]
+    assert (
+        common_info.decode()
+        .splitlines()[0]
+        .startswith("PERSON_ID,FIRST_NAME,LAST_NAME,DISPLAY_FIRST_LAST")
+    )
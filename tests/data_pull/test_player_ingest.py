@@ -0,0 +1,23 @@
+from unittest import mock
+
+from nba_data_pull.data_pull.dataingest import PlayerIngest
+
+
+def test_player_ingest_resolves_names_lazily():
+    """Test that a player id is used without the name lookup until a name is read"""
+    with mock.patch("nba_data_pull.data_pull.dataingest.players") as static_players:
+        static_players.find_player_by_id.return_value = {
+            "id": 2544,
+            "full_name": "LeBron James",
+            "first_name": "LeBron",
+            "last_name": "James",
+            "is_active": True,
+        }
+        ingest = PlayerIngest("2544", save_folder="s3://bucket/data/nba/PLAYER")
+
+        assert ingest.id == 2544
+        assert ingest.save_folder == "s3://bucket/data/nba/PLAYER/2544"
+        static_players.find_player_by_id.assert_not_called()
+
+        assert ingest.last_name == "James"
+        static_players.find_player_by_id.assert_called_once_with(2544)
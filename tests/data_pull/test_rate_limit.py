@@ -0,0 +1,26 @@
+import pytest
+
+from nba_data_pull.data_pull.rate_limit import TokenBucket
+
+
+def test_token_bucket_limits_burst():
+    """Test that only `capacity` tokens can be taken without waiting"""
+    bucket = TokenBucket(rate=0.01, capacity=2)
+
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_token_bucket_acquire_waits_for_refill():
+    """Test that acquire blocks until a token is refilled"""
+    bucket = TokenBucket(rate=100)
+
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() > 0.0
+
+
+def test_token_bucket_rejects_bad_rate():
+    """Test that a non-positive rate is rejected"""
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
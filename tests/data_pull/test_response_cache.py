@@ -0,0 +1,42 @@
+from nba_data_pull.data_pull.response_cache import MISS, ResponseCache
+
+
+def test_cache_hit_and_miss(tmp_path):
+    """Test that a stored response is returned and counted as a hit"""
+    cache = ResponseCache(tmp_path / "responses.sqlite")
+
+    assert cache.get("get_advanced", ("0022400001",)) is MISS
+    cache.set("get_advanced", ("0022400001",), {"rows": 1})
+
+    assert cache.get("get_advanced", ("0022400001",)) == {"rows": 1}
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_expires_entries(tmp_path):
+    """Test that an entry past its TTL is treated as a miss"""
+    cache = ResponseCache(tmp_path / "responses.sqlite")
+    cache.set("get_player_games", ("2024-25",), [1, 2, 3], ttl=-1)
+
+    assert cache.get("get_player_games", ("2024-25",)) is MISS
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test that the oldest entry is evicted once the size cap is hit"""
+    cache = ResponseCache(tmp_path / "responses.sqlite", max_bytes=250)
+    cache.set("get_usage", ("1",), "a" * 100)
+    cache.set("get_usage", ("2",), "b" * 100)
+    cache.get("get_usage", ("1",))
+    cache.set("get_usage", ("3",), "c" * 100)
+
+    assert cache.get("get_usage", ("2",)) is MISS
+    assert cache.get("get_usage", ("1",)) == "a" * 100
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_ttl_for_finished_season(tmp_path):
+    """Test that finished seasons never expire"""
+    cache = ResponseCache(tmp_path / "responses.sqlite", current_season_ttl_hours=1)
+
+    assert cache.ttl_for_season(1996) is None
+    assert cache.ttl_for_season(None) == 3600
@@ -0,0 +1,59 @@
+from unittest import mock
+
+import pytest
+
+from nba_data_pull.data_pull.s3_writer import S3Writer, UploadError
+
+
+def test_writer_uploads_to_s3_in_background():
+    """Test that queued files are uploaded with the shared client"""
+    s3_client = mock.MagicMock()
+    writer = S3Writer(s3_client=s3_client, workers=2)
+    writer._transfer_config = mock.sentinel.transfer_config
+
+    writer.submit("s3://test-bucket/data/nba/GAME/1/1_usage.csv", b"a,b\n1,2\n")
+    writer.close()
+
+    args = s3_client.upload_fileobj.call_args
+    assert args[0][1:] == ("test-bucket", "data/nba/GAME/1/1_usage.csv")
+    assert writer.stats()["files"] == 1
+    assert writer.stats()["bytes"] == 8
+
+
+def test_writer_writes_local_paths(tmp_path):
+    """Test that paths without s3:// are written to disk"""
+    writer = S3Writer(workers=1)
+    writer.submit(tmp_path / "GAME" / "1_usage.csv", b"a,b\n")
+    writer.close()
+
+    assert (tmp_path / "GAME" / "1_usage.csv").read_bytes() == b"a,b\n"
+
+
+def test_writer_raises_on_failed_upload():
+    """Test that close fails loudly if an upload failed"""
+    s3_client = mock.MagicMock()
+    s3_client.upload_fileobj.side_effect = ConnectionResetError("reset")
+    writer = S3Writer(s3_client=s3_client, workers=1)
+    writer._transfer_config = mock.sentinel.transfer_config
+
+    writer.submit("s3://test-bucket/key.csv", b"data")
+
+    with pytest.raises(UploadError):
+        writer.close()
+
+
+def test_writer_encodes_frames_on_serializer_processes(tmp_path):
+    """Test that frames are encoded on the process pool before they are written"""
+    import pandas as pd
+
+    writer = S3Writer(workers=1, serialize_workers=1)
+    metric = {}
+    path = tmp_path / "GAME" / "1_usage.csv"
+    writer.submit_frame(
+        path, pd.DataFrame({"a": [1, 2]}), "usage", "csv", metric=metric
+    )
+    writer.close()
+
+    assert path.read_text().splitlines() == ["a", "1", "2"]
+    assert metric["bytes"] == path.stat().st_size
+    assert metric["serialize_seconds"] >= 0
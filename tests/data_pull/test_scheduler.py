@@ -0,0 +1,62 @@
+from datetime import datetime
+from time import time
+from unittest import mock
+
+from nba_data_pull.data_pull.scheduler import (
+    PriorityPolicy,
+    Task,
+    TaskScheduler,
+    parse_deadline,
+    prioritize,
+)
+
+
+def test_scheduler_records_failures_and_completions():
+    """Test that failed endpoints are reported and do not stop other tasks"""
+    failing = mock.MagicMock(side_effect=ValueError("throttled"))
+    tasks = [
+        Task("202324", "player_defense", mock.MagicMock(), "regular_season_pergame"),
+        Task("202324", "lineups", failing, "regular_season_pergame"),
+        Task("202425", "lineups", failing, "regular_season_pergame"),
+    ]
+
+    scheduler = TaskScheduler(workers=2)
+    results = scheduler.run(tasks)
+
+    assert len(results) == 3
+    assert scheduler.completed_entities() == {"regular_season_pergame": ["202324"]}
+    report = scheduler.endpoint_report()
+    assert report["lineups"]["calls"] == 2
+    assert report["lineups"]["failures"] == 2
+    assert report["player_defense"]["failures"] == 0
+
+
+def test_prioritize_and_deadline():
+    """Test that newest work runs first and nothing starts after the deadline"""
+    tasks = [
+        Task("0022200001", "game", mock.MagicMock(), season=2022),
+        Task("0022300001", "game", mock.MagicMock(), season=2023),
+        Task("0022300002", "game", mock.MagicMock(), season=2023),
+        Task("0022400001", "game", mock.MagicMock(), season=2024),
+    ]
+
+    newest = prioritize(tasks, PriorityPolicy.newest_first)
+    assert [task.entity for task in newest] == [
+        "0022400001",
+        "0022300002",
+        "0022300001",
+        "0022200001",
+    ]
+    current = prioritize(tasks, PriorityPolicy.current_season_first, 2023)
+    assert [task.season for task in current] == [2023, 2023, 2022, 2024]
+
+    scheduler = TaskScheduler(workers=2, deadline=time() - 1)
+    assert scheduler.run(newest) == []
+    assert len(scheduler.skipped) == 4
+    tasks[0].func.assert_not_called()
+
+
+def test_parse_deadline_rolls_to_tomorrow():
+    now = datetime(2024, 1, 1, 18, 0)
+    assert parse_deadline("20:30", now) == datetime(2024, 1, 1, 20, 30).timestamp()
+    assert parse_deadline("06:00", now) == datetime(2024, 1, 2, 6, 0).timestamp()
@@ -0,0 +1,77 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from nba_data_pull.data_pull.schemas import (
+    OutputFormat,
+    apply_schema,
+    column_dtype,
+    flatten_columns,
+    serialize_table,
+)
+
+
+def test_column_dtype_rules():
+    """Test that ids, codes and stats get the same dtype whatever the data"""
+    numbers = pd.Series([1, 2])
+    assert column_dtype("advanced", "PLAYER_ID", numbers) == "Int32"
+    assert column_dtype("advanced", "teamId", numbers) == "Int32"
+    assert column_dtype("advanced", "OPPONENT_TEAM_ID", numbers) == "Int32"
+    assert column_dtype("advanced", "GAME_ID", numbers) == "string"
+    assert column_dtype("team_stats", "SEASON_ID", numbers) == "string"
+    assert column_dtype("advanced", "TEAM_ABBREVIATION", pd.Series(["BOS"])) == (
+        "category"
+    )
+    assert column_dtype("advanced", "PTS", numbers) == "float32"
+
+
+def test_apply_schema_keeps_game_ids_and_pins_empty_columns():
+    """Test that leading zeros survive and a pinned column is typed even when empty"""
+    df = pd.DataFrame(
+        {
+            "gameId": ["0022400001", "0022400001"],
+            "personId": ["2544", None],
+            "teamTricode": ["LAL", "LAL"],
+            "period": [1, 2],
+            "scoreHome": [np.nan, np.nan],
+        }
+    )
+
+    result = apply_schema(df, "playbyplay")
+
+    assert result["gameId"].tolist() == ["0022400001", "0022400001"]
+    assert str(result["personId"].dtype) == "Int32"
+    assert result["personId"].isna().tolist() == [False, True]
+    assert str(result["teamTricode"].dtype) == "category"
+    assert str(result["period"].dtype) == "Int32"
+    # An all empty column would otherwise be read as float
+    assert str(result["scoreHome"].dtype) == "string"
+
+
+def test_flatten_columns_joins_multiindex_headers():
+    """Test that shot location style headers become single strings"""
+    df = pd.DataFrame(
+        [[1, 2, 3]],
+        columns=pd.MultiIndex.from_tuples(
+            [("", "PLAYER_ID"), ("Restricted Area", "FGM"), ("Restricted Area", "FGA")]
+        ),
+    )
+
+    assert flatten_columns(df).columns.tolist() == [
+        "PLAYER_ID",
+        "Restricted Area_FGM",
+        "Restricted Area_FGA",
+    ]
+
+
+def test_serialize_table_parquet_round_trip():
+    """Test that parquet files keep the schema when read back"""
+    df = pd.DataFrame({"GAME_ID": ["0022400001"], "PLAYER_ID": [2544], "PTS": [30]})
+
+    body = serialize_table(df, "advanced", OutputFormat.parquet)
+    result = pd.read_parquet(io.BytesIO(body))
+
+    assert result["GAME_ID"].tolist() == ["0022400001"]
+    assert str(result["PLAYER_ID"].dtype) == "Int32"
+    assert str(result["PTS"].dtype) == "float32"
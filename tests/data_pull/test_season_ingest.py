@@ -0,0 +1,22 @@
+from unittest import mock
+
+from nba_data_pull.data_pull.dataingest import SeasonIngest
+
+
+def test_serial_season_ingest_only_pulls_requested_endpoints():
+    """Test that the serial save_all loops skip endpoints that were not requested"""
+    ingest = SeasonIngest(
+        "2023",
+        save_folder="s3://bucket/data/nba/SEASON/PER_GAME/REGULAR_SEASON",
+        endpoints=["player_stats", "Isolation_team", "Drives_player"],
+    )
+
+    with mock.patch.object(ingest, "_measure") as measure:
+        ingest.save_all_nonsynergy()
+        ingest.save_all_synergy()
+
+    assert [call.args[0] for call in measure.call_args_list] == [
+        "player_stats",
+        "Isolation_team",
+        "Drives_player",
+    ]
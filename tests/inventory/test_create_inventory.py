@@ -16,11 +16,12 @@ def mock_all_externals():
     """Mock all external dependencies to avoid any real S3/boto3 calls"""
     with (
         mock.patch("nba_data_pull.inventory.create_inventory.boto3"),
-        mock.patch("nba_data_pull.inventory.create_inventory.load_yaml_s3"),
+        mock.patch("nba_data_pull.inventory.create_inventory.MetadataStore"),
         mock.patch("nba_data_pull.inventory.create_inventory.update_s3_inventory"),
+        mock.patch("nba_data_pull.inventory.create_inventory.ShardedLister"),
+        mock.patch("nba_data_pull.inventory.create_inventory.sharded_inventory"),
         mock.patch("nba_data_pull.inventory.create_inventory.get_season_list"),
         mock.patch("nba_data_pull.inventory.create_inventory.process_seasons"),
-        mock.patch("nba_data_pull.inventory.create_inventory.yaml"),
     ):
         yield
 
@@ -47,22 +48,40 @@ def sample_data_to_pull():
     }
 
 
-def test_copy_previous_meta(sample_inventory, sample_data_to_pull):
-    """Test that copy_previous_meta copies files correctly"""
-    # Mock file operations instead of S3
+def test_copy_previous_meta():
+    """Test that copy_previous_meta archives files with server-side copies"""
     with (
         mock.patch(
-            "nba_data_pull.inventory.create_inventory.load_yaml_s3"
-        ) as mock_load,
+            "nba_data_pull.inventory.create_inventory.MetadataStore"
+        ) as mock_store,
     ):
-        # Set up the load_yaml_s3 mock to return our test data
-        mock_load.side_effect = [sample_inventory, sample_data_to_pull]
+        store = mock_store.return_value
+        store.list_keys.return_value = ["source/inventory.jsonl.gz"]
+        store.copy.return_value = ["dest/inventory.jsonl.gz"]
 
-        # Call the function
         copy_previous_meta(Path("source/"), Path("dest/"))
 
-        # Verify that files were read
-        assert mock_load.call_count == 2
+        # Nothing is downloaded or parsed
+        store.load.assert_not_called()
+        store.save.assert_not_called()
+        assert store.copy.call_count == 2
+        store.prune_archives.assert_not_called()
+
+
+def test_copy_previous_meta_prunes_old_archives():
+    """Test that archives past the retention are pruned"""
+    with (
+        mock.patch(
+            "nba_data_pull.inventory.create_inventory.MetadataStore"
+        ) as mock_store,
+    ):
+        copy_previous_meta(
+            Path("source/"), Path("dest/"), files=["inventory.yaml"], keep_days=30
+        )
+
+        mock_store.return_value.prune_archives.assert_called_once_with(
+            Path("dest/"), 30
+        )
 
 
 def test_create_inventory():
@@ -77,19 +96,41 @@ def test_create_inventory():
         mock.patch(
             "nba_data_pull.inventory.create_inventory.update_s3_inventory"
         ) as mock_update,
-        mock.patch("nba_data_pull.inventory.create_inventory.yaml.dump") as mock_dump,
+        mock.patch(
+            "nba_data_pull.inventory.create_inventory.MetadataStore"
+        ) as mock_store,
     ):
         # Set up the return value for the directory scan
         mock_update.return_value = fake_inventory
 
         # Call the function
-        create_inventory(Path("test/inventory.yaml"))
+        create_inventory(Path("test/inventory.yaml"), list_workers=1)
 
         # Check that the directory was scanned
         mock_update.assert_called_once()
 
         # Check that the result was written to a file
-        mock_dump.assert_called_once()
+        mock_store.return_value.save.assert_called_once()
+
+
+def test_create_inventory_sharded():
+    """Test that a full scan with list workers uses the sharded lister"""
+    with (
+        mock.patch(
+            "nba_data_pull.inventory.create_inventory.sharded_inventory"
+        ) as mock_sharded,
+        mock.patch(
+            "nba_data_pull.inventory.create_inventory.update_s3_inventory"
+        ) as mock_update,
+        mock.patch(
+            "nba_data_pull.inventory.create_inventory.MetadataStore"
+        ) as mock_store,
+    ):
+        create_inventory(Path("test/inventory.yaml"), list_workers=8)
+
+        mock_sharded.assert_called_once()
+        mock_update.assert_not_called()
+        mock_store.return_value.save.assert_called_once()
 
 
 def test_get_data_to_pull(sample_inventory):
@@ -97,23 +138,35 @@ def test_get_data_to_pull(sample_inventory):
 
     with (
         mock.patch(
-            "nba_data_pull.inventory.create_inventory.load_yaml_s3"
-        ) as mock_load,
+            "nba_data_pull.inventory.create_inventory.MetadataStore"
+        ) as mock_store,
         mock.patch(
             "nba_data_pull.inventory.create_inventory.get_season_list"
         ) as mock_seasons,
         mock.patch(
             "nba_data_pull.inventory.create_inventory.process_seasons"
         ) as mock_process,
-        mock.patch("nba_data_pull.inventory.create_inventory.yaml.dump") as mock_dump,
+        mock.patch(
+            "nba_data_pull.data_pull.http_session.build_session"
+        ) as mock_session,
     ):
         # Set up the return values
+        mock_load = mock_store.return_value.load
         mock_load.return_value = sample_inventory
         mock_seasons.return_value = ["2020"]
-        mock_process.return_value = (["new_game_id"], ["new_player_id"])
+        mock_process.return_value = ({"2020": ["1"]}, {"2020": [3, 9]})
 
         # Call the function
-        get_data_to_pull(Path("inventory.yaml"), Path("data_to_pull.yaml"), 2020)
+        get_data_to_pull(
+            Path("inventory.yaml"),
+            Path("data_to_pull.yaml"),
+            2020,
+            connect_timeout=5.0,
+            read_timeout=20.0,
+        )
+
+        # Check that the pooled session was installed with the timeouts
+        mock_session.assert_called_once_with(10, (5.0, 20.0))
 
         # Check that inventory was loaded
         mock_load.assert_called_once()
@@ -125,4 +178,6 @@ def test_get_data_to_pull(sample_inventory):
         mock_process.assert_called()
 
         # Verify that results were written to file
-        mock_dump.assert_called_once()
+        mock_store.return_value.save.assert_called_once()
+        data_to_pull = mock_store.return_value.save.call_args.args[0]
+        assert data_to_pull["player"] == ["9"]
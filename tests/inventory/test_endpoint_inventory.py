@@ -0,0 +1,75 @@
+from unittest import mock
+
+from nba_data_pull.inventory.endpoint_inventory import (
+    build_endpoint_inventory,
+    folder_inventory,
+    missing_endpoints,
+)
+
+
+def list_pages(keys):
+    s3_client = mock.MagicMock()
+    s3_client.get_paginator.return_value.paginate.return_value = [
+        {"Contents": [{"Key": key} for key in keys]}
+    ]
+    return s3_client
+
+
+def test_build_endpoint_inventory_from_flat_listing():
+    """Test that files are grouped by folder and entity from a single listing"""
+    s3_client = list_pages(
+        [
+            "data/nba/GAME/REGULAR_SEASON/0022400001/0022400001_advanced.csv",
+            "data/nba/GAME/REGULAR_SEASON/0022400001/0022400001_usage.parquet",
+            "data/nba/GAME/REGULAR_SEASON/0022400002/0022400002_usage.csv",
+            "data/nba/PLAYER/1/1_common_info.csv",
+        ]
+    )
+
+    inventory = build_endpoint_inventory("test-bucket", s3_client=s3_client)
+
+    assert "Delimiter" not in s3_client.get_paginator().paginate.call_args.kwargs
+    assert inventory["GAME"]["REGULAR_SEASON"] == {
+        "0022400001": ["advanced", "usage"],
+        "0022400002": ["usage"],
+    }
+    assert folder_inventory(inventory, {"GAME": {"PLAYOFFS": []}, "PLAYER": []}) == {
+        "GAME": {"PLAYOFFS": []},
+        "PLAYER": ["1"],
+    }
+
+
+def test_missing_endpoints_only_expects_endpoints_seen_that_season():
+    """Test that an endpoint missing from every game of a season is not requested"""
+    inventory = {
+        "GAME": {
+            "REGULAR_SEASON": {
+                "0022400001": ["advanced", "usage"],
+                "0022400002": ["usage"],
+                "0029900001": ["usage"],
+            }
+        }
+    }
+
+    missing = missing_endpoints(inventory, "GAME", ["advanced", "usage", "tracking"])
+
+    assert missing == {("GAME", "REGULAR_SEASON"): {"0022400002": ["advanced"]}}
+
+
+def test_missing_endpoints_are_expected_per_folder():
+    """Test that a table saved under one season type is not expected under the others"""
+    inventory = {
+        "SEASON": {
+            "PER_GAME": {
+                "REGULAR_SEASON": {"202425": ["player_stats", "salaries"]},
+                "PLAYOFFS": {"202425": ["player_stats"]},
+            },
+            "PER_POSSESSION": {
+                "REGULAR_SEASON": {"202425": ["player_stats"]},
+            },
+        }
+    }
+
+    missing = missing_endpoints(inventory, "SEASON", ["player_stats", "salaries"])
+
+    assert missing == {}
@@ -0,0 +1,47 @@
+import io
+from unittest import mock
+
+import yaml
+
+from nba_data_pull.inventory.incremental import (
+    apply_new_completions,
+    merge_inventory,
+)
+
+
+def test_merge_inventory_adds_new_ids():
+    """Test that completions are merged into the matching inventory lists"""
+    inventory = {
+        "GAME": {"REGULAR_SEASON": ["0022400001"], "PLAYOFFS": []},
+        "PLAYER": ["1"],
+    }
+    completions = {"GAME": {"REGULAR_SEASON": ["0022400002", "0022400001"]}}
+
+    merge_inventory(inventory, completions)
+
+    assert inventory["GAME"]["REGULAR_SEASON"] == ["0022400001", "0022400002"]
+    assert inventory["PLAYER"] == ["1"]
+
+
+def test_apply_new_completions_starts_after_watermark():
+    """Test that only completion files after the watermark are listed and applied"""
+    s3_client = mock.MagicMock()
+    s3_client.get_paginator.return_value.paginate.return_value = [
+        {"Contents": [{"Key": "data/meta/completions/20250102_PLAYER.yaml"}]}
+    ]
+    s3_client.get_object.return_value = {
+        "Body": io.BytesIO(yaml.dump({"PLAYER": ["2"]}).encode("utf-8"))
+    }
+    inventory = {"PLAYER": ["1"]}
+
+    watermark = apply_new_completions(
+        inventory,
+        "test-bucket",
+        s3_client,
+        watermark="data/meta/completions/20250101_GAME.yaml",
+    )
+
+    paginate_kwargs = s3_client.get_paginator.return_value.paginate.call_args[1]
+    assert paginate_kwargs["StartAfter"] == "data/meta/completions/20250101_GAME.yaml"
+    assert watermark == "data/meta/completions/20250102_PLAYER.yaml"
+    assert inventory["PLAYER"] == ["1", "2"]
@@ -0,0 +1,41 @@
+from nba_data_pull.inventory.inventory_index import (
+    InventoryIndex,
+    season_year_from_game_id,
+    unique_ids,
+)
+
+
+def test_missing_keeps_order_and_drops_duplicates():
+    """Test that missing ids are returned once, in candidate order"""
+    index = InventoryIndex({"PLAYER": ["1", "3"], "GAME": {"REGULAR_SEASON": []}})
+
+    assert index.missing(("PLAYER",), [4, "2", "1", "4"]) == ["4", "2"]
+    assert index.missing(("GAME", "REGULAR_SEASON"), ["0022400001"]) == ["0022400001"]
+
+
+def test_diff_reports_per_season_counts():
+    """Test that diff splits expected ids by season"""
+    index = InventoryIndex(
+        {"GAME": {"REGULAR_SEASON": ["0022300001", "0022400001", "0029900001"]}}
+    )
+
+    diff = index.diff(
+        ("GAME", "REGULAR_SEASON"),
+        {2023: ["0022300001", "0022300002"], 2024: ["0022400001"]},
+    )
+
+    assert diff.missing == ["0022300002"]
+    assert diff.extra == ["0029900001"]
+    assert diff.per_season["2023"] == {"expected": 2, "present": 1, "missing": 1}
+    assert season_year_from_game_id("0029900001") == 1999
+
+
+def test_unique_ids_merges_seasons_for_a_set_diff():
+    """Test that per-season ids are merged once and diffed against the inventory"""
+    index = InventoryIndex({"PLAYER": ["1", "3", "legacy"]})
+
+    merged = unique_ids({"2023": ["4", "1", "2"], "2024": [2, 5, 4]})
+
+    assert merged.tolist() == [4, 1, 2, 5]
+    assert index.missing_ids(("PLAYER",), merged) == ["4", "2", "5"]
+    assert unique_ids({}).tolist() == []
@@ -0,0 +1,103 @@
+from unittest import mock
+
+import pytest
+
+from nba_data_pull.inventory.metadata_store import (
+    MetadataStore,
+    MetaFormat,
+    dumps,
+    loads,
+    with_format,
+)
+
+
+@pytest.fixture
+def sample_inventory():
+    return {
+        "GAME": {"REGULAR_SEASON": ["0022400001", "0022400002"], "PLAYOFFS": []},
+        "PLAYER": ["1", "2"],
+        "SEASON": {"PER_GAME": {"REGULAR_SEASON": ["202425"]}},
+    }
+
+
+@pytest.mark.parametrize(
+    "fmt", [MetaFormat.yaml, MetaFormat.jsonl, MetaFormat.jsonl_gz]
+)
+def test_round_trip(sample_inventory, fmt):
+    """Test that every built-in format reads back the same dictionary"""
+    assert loads(dumps(sample_inventory, fmt), fmt) == sample_inventory
+
+
+def test_load_falls_back_to_yaml(sample_inventory):
+    """Test that the YAML file is read when the compact file does not exist"""
+    s3_client = mock.MagicMock()
+    s3_client.exceptions.NoSuchKey = KeyError
+    yaml_body = dumps(sample_inventory, MetaFormat.yaml)
+    s3_client.get_object.side_effect = [
+        KeyError("data/meta/inventory.jsonl.gz"),
+        {"Body": mock.MagicMock(read=mock.MagicMock(return_value=yaml_body))},
+    ]
+    store = MetadataStore("test-bucket", s3_client)
+
+    assert store.load("data/meta/inventory.yaml") == sample_inventory
+    assert s3_client.get_object.call_args.kwargs["Key"] == "data/meta/inventory.yaml"
+
+
+def test_save_exports_yaml(sample_inventory):
+    """Test that saving writes the compact file and a YAML copy"""
+    s3_client = mock.MagicMock()
+    store = MetadataStore("test-bucket", s3_client, fmt=MetaFormat.jsonl)
+
+    keys = store.save(sample_inventory, "data/meta/inventory.yaml")
+
+    assert keys == ["data/meta/inventory.jsonl", "data/meta/inventory.yaml"]
+    assert with_format(keys[0], MetaFormat.msgpack) == "data/meta/inventory.msgpack"
+
+
+def test_copy_uses_server_side_copies():
+    """Test that every saved format of a file is copied without downloading it"""
+    s3_client = mock.MagicMock()
+    store = MetadataStore("test-bucket", s3_client)
+
+    keys = store.copy(
+        "data/meta/inventory.yaml",
+        "data/logs/inventory_logs/2025-01-01/inventory.yaml",
+        existing=["data/meta/inventory.jsonl.gz", "data/meta/inventory.yaml"],
+    )
+
+    assert keys == [
+        "data/logs/inventory_logs/2025-01-01/inventory.yaml",
+        "data/logs/inventory_logs/2025-01-01/inventory.jsonl.gz",
+    ]
+    s3_client.get_object.assert_not_called()
+    assert s3_client.copy_object.call_args_list[1].kwargs["CopySource"] == {
+        "Bucket": "test-bucket",
+        "Key": "data/meta/inventory.jsonl.gz",
+    }
+
+
+def test_prune_archives_deletes_old_dates():
+    """Test that only dated archive folders past the retention are deleted"""
+    from datetime import date
+
+    prefix = "data/logs/inventory_logs/"
+    s3_client = mock.MagicMock()
+    s3_client.get_paginator.return_value.paginate.side_effect = [
+        [
+            {
+                "CommonPrefixes": [
+                    {"Prefix": f"{prefix}2025-01-01/"},
+                    {"Prefix": f"{prefix}2025-03-01/"},
+                    {"Prefix": f"{prefix}notes/"},
+                ]
+            }
+        ],
+        [{"Contents": [{"Key": f"{prefix}2025-01-01/inventory.yaml"}]}],
+    ]
+    store = MetadataStore("test-bucket", s3_client)
+
+    pruned = store.prune_archives(prefix, keep_days=30, today=date(2025, 3, 10))
+
+    assert pruned == [f"{prefix}2025-01-01/"]
+    delete = s3_client.delete_objects.call_args.kwargs["Delete"]
+    assert delete["Objects"] == [{"Key": f"{prefix}2025-01-01/inventory.yaml"}]
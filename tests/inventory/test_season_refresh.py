@@ -0,0 +1,52 @@
+from datetime import date
+
+from nba_data_pull.inventory.season_refresh import (
+    AggregateRefresh,
+    refresh_groups,
+    update_refresh_state,
+)
+
+TODAY = date(2025, 1, 15)
+
+
+def test_refresh_groups_follow_game_dates_and_cadence():
+    """Test that aggregates refresh on new games and synergy waits for its cadence"""
+    entry = {
+        "nonsynergy": {"game_date": "2025-01-13", "refreshed": "2025-01-14"},
+        "synergy": {"game_date": "2025-01-13", "refreshed": "2025-01-14"},
+    }
+
+    assert refresh_groups(entry, "2025-01-13", TODAY) == []
+    assert refresh_groups(entry, "2025-01-14", TODAY) == ["nonsynergy"]
+    assert refresh_groups(entry, "2025-01-14", TODAY, synergy_days=1) == [
+        "nonsynergy",
+        "synergy",
+    ]
+    assert refresh_groups(
+        entry, "2025-01-13", TODAY, cadence=AggregateRefresh.always
+    ) == ["nonsynergy"]
+    assert refresh_groups(None, "2025-01-14", TODAY) == ["nonsynergy", "synergy"]
+    # No games played yet, e.g. playoffs during the regular season
+    assert refresh_groups(None, None, TODAY) == []
+
+
+def test_update_refresh_state_only_marks_saved_seasons():
+    """Test that planned refreshes are recorded only for folders saved in full"""
+    planned = {
+        "per_game": {
+            "regular_season": {
+                "202425": {"last_game_date": "2025-01-14", "groups": ["nonsynergy"]}
+            },
+            "playoffs": {
+                "202425": {"last_game_date": "2025-01-14", "groups": ["nonsynergy"]}
+            },
+        }
+    }
+    completed = {"per_game": {"regular_season": ["202425"], "playoffs": []}}
+
+    state = update_refresh_state({}, planned, completed, TODAY)
+
+    assert state["per_game"]["regular_season"]["202425"] == {
+        "nonsynergy": {"game_date": "2025-01-14", "refreshed": "2025-01-15"}
+    }
+    assert state["per_game"]["playoffs"] == {}
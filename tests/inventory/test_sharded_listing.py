@@ -0,0 +1,67 @@
+from nba_data_pull.inventory.sharded_listing import ShardedLister, sharded_inventory
+
+
+class FakeS3:
+    """Delimiter listing over a fixed set of keys, with real pagination"""
+
+    def __init__(self, keys):
+        self.keys = sorted(keys)
+        self.calls = []
+
+    def list_objects_v2(self, Bucket, Prefix, Delimiter, MaxKeys, **kwargs):
+        self.calls.append(Prefix)
+        folders = sorted(
+            {
+                Prefix + key[len(Prefix) :].split(Delimiter)[0] + Delimiter
+                for key in self.keys
+                if key.startswith(Prefix) and Delimiter in key[len(Prefix) :]
+            }
+        )
+        start = int(kwargs.get("ContinuationToken", 0))
+        page = folders[start : start + MaxKeys]
+        truncated = start + MaxKeys < len(folders)
+        response = {
+            "CommonPrefixes": [{"Prefix": folder} for folder in page],
+            "IsTruncated": truncated,
+        }
+        if truncated:
+            response["NextContinuationToken"] = str(start + MaxKeys)
+        return response
+
+
+def test_sharded_inventory_matches_serial_listing():
+    """Test that large prefixes are split by id digits and merged into the inventory"""
+    game_ids = [f"00224{i:05d}" for i in range(1, 60)]
+    player_ids = [str(i) for i in range(1600, 1650)]
+    keys = [f"data/nba/GAME/REGULAR_SEASON/{g}/{g}_usage.csv" for g in game_ids]
+    keys += [f"data/nba/PLAYER/{p}/{p}_common_info.csv" for p in player_ids]
+    s3 = FakeS3(keys)
+
+    lister = ShardedLister(s3_client=s3, workers=4, page_size=10)
+    inventory = sharded_inventory(
+        {"GAME": {"REGULAR_SEASON": [], "PLAYOFFS": []}, "PLAYER": []},
+        bucket="test-bucket",
+        lister=lister,
+    )
+
+    assert inventory["GAME"]["REGULAR_SEASON"] == game_ids
+    assert inventory["GAME"]["PLAYOFFS"] == []
+    assert inventory["PLAYER"] == player_ids
+
+    timings = {timing.prefix: timing for timing in lister.timings}
+    assert timings["data/nba/PLAYER/"].folders == len(player_ids)
+    assert timings["data/nba/PLAYER/"].shards > 1
+    assert timings["data/nba/GAME/PLAYOFFS/"].requests == 1
+
+
+def test_sharded_inventory_keeps_id_equal_to_split_shard():
+    """Test that a short id is kept when the shard named after it is split"""
+    player_ids = ["2", "2544"] + [str(i) for i in range(200000, 200030)]
+    keys = [f"data/nba/PLAYER/{p}/{p}_common_info.csv" for p in player_ids]
+    lister = ShardedLister(s3_client=FakeS3(keys), workers=4, page_size=10)
+
+    inventory = sharded_inventory({"PLAYER": []}, bucket="test-bucket", lister=lister)
+
+    assert sorted(inventory["PLAYER"]) == sorted(player_ids)
+    timings = {timing.prefix: timing for timing in lister.timings}
+    assert timings["data/nba/PLAYER/"].shards > 10
@@ -0,0 +1,112 @@
+import hashlib
+import importlib.util
+import sys
+import threading
+from pathlib import Path
+from time import sleep
+from unittest import mock
+
+import pytest
+
+SCRIPT = Path(__file__).parents[2] / "scripts" / "upload_local.py"
+
+
+@pytest.fixture
+def upload_local():
+    """Loads scripts/upload_local.py with the boto3 submodules it imports mocked"""
+    with mock.patch.dict(
+        sys.modules,
+        {
+            "boto3.s3": mock.MagicMock(),
+            "boto3.s3.transfer": mock.MagicMock(),
+            "botocore.config": mock.MagicMock(),
+        },
+    ):
+        spec = importlib.util.spec_from_file_location("upload_local", SCRIPT)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    module.s3 = mock.MagicMock()
+    return module
+
+
+def list_pages(objects):
+    """Paginator that returns the objects directly under the requested prefix"""
+
+    def paginate(Bucket, Prefix, Delimiter):
+        return [
+            {
+                "Contents": [
+                    {"Key": key, "Size": size, "ETag": f'"{etag}"'}
+                    for key, (size, etag) in objects.items()
+                    if key.startswith(Prefix) and "/" not in key[len(Prefix) :]
+                ]
+            }
+        ]
+
+    return mock.MagicMock(paginate=mock.MagicMock(side_effect=paginate))
+
+
+def test_upload_folder_lists_per_folder_and_skips_existing(upload_local, tmp_path):
+    """Test that each folder is listed on its own and unchanged files are skipped"""
+    (tmp_path / "GAME").mkdir()
+    (tmp_path / "GAME" / "same.csv").write_bytes(b"a,b\n1,2\n")
+    (tmp_path / "GAME" / "new.csv").write_bytes(b"a,b\n")
+    (tmp_path / "PLAYER").mkdir()
+    (tmp_path / "PLAYER" / "changed.csv").write_bytes(b"x\n")
+    paginator = list_pages(
+        {
+            "data/GAME/same.csv": (8, hashlib.md5(b"a,b\n1,2\n").hexdigest()),
+            "data/PLAYER/changed.csv": (2, hashlib.md5(b"y\n").hexdigest()),
+        }
+    )
+    upload_local.s3.get_paginator.return_value = paginator
+
+    stats = upload_local.upload_folder_to_s3(tmp_path, "test-bucket", "data/")
+
+    prefixes = sorted(call.kwargs["Prefix"] for call in paginator.paginate.mock_calls)
+    assert prefixes == ["data/GAME/", "data/PLAYER/"]
+    uploaded = sorted(call.args[2] for call in upload_local.s3.upload_file.mock_calls)
+    assert uploaded == ["data/GAME/new.csv", "data/PLAYER/changed.csv"]
+    assert stats["uploaded"] == 2
+    assert stats["skipped"] == 1
+
+
+def test_upload_folder_skips_hidden_files_only(upload_local, tmp_path):
+    """Test that hidden files are skipped but files in hidden folders are uploaded"""
+    (tmp_path / ".DS_Store").write_bytes(b"x")
+    (tmp_path / ".cache").mkdir()
+    (tmp_path / ".cache" / "table.csv").write_bytes(b"a\n")
+    upload_local.s3.get_paginator.return_value = list_pages({})
+
+    stats = upload_local.upload_folder_to_s3(tmp_path, "test-bucket", "data/")
+
+    uploaded = [call.args[2] for call in upload_local.s3.upload_file.mock_calls]
+    assert uploaded == ["data/.cache/table.csv"]
+    assert stats["uploaded"] == 1
+
+
+def test_upload_folder_bounds_files_in_flight(upload_local, tmp_path):
+    """Test that no more than `window` files are queued or uploading at once"""
+    for i in range(12):
+        (tmp_path / f"{i}.csv").write_bytes(b"1\n")
+    upload_local.s3.get_paginator.return_value = list_pages({})
+
+    lock = threading.Lock()
+    running = {"now": 0, "max": 0}
+
+    def slow_upload(*args):
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+        sleep(0.01)
+        with lock:
+            running["now"] -= 1
+        return True
+
+    with mock.patch.object(upload_local, "upload_file", side_effect=slow_upload):
+        stats = upload_local.upload_folder_to_s3(
+            tmp_path, "test-bucket", "data/", workers=8, window=3
+        )
+
+    assert stats["uploaded"] == 12
+    assert running["max"] <= 3
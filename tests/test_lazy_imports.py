@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+from nba_data_pull.lazy_imports import ImportProfiler, lazy_import
+
+
+def test_lazy_import_defers_execution(tmp_path, monkeypatch):
+    """Test that a lazy module only runs when an attribute is used"""
+    (tmp_path / "lazy_example.py").write_text(
+        "import builtins\nbuiltins.ran = True\nVALUE = 1\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_example", raising=False)
+    import builtins
+
+    monkeypatch.setattr(builtins, "ran", False, raising=False)
+    module = lazy_import("lazy_example")
+    assert builtins.ran is False
+
+    assert module.VALUE == 1
+    assert builtins.ran is True
+    monkeypatch.delitem(sys.modules, "lazy_example")
+
+
+def test_import_profiler_times_new_imports(tmp_path, monkeypatch):
+    """Test that imports made while the profiler runs are timed with their children"""
+    (tmp_path / "profiled_parent.py").write_text("import profiled_child\n")
+    (tmp_path / "profiled_child.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = ImportProfiler().start()
+    try:
+        import profiled_parent  # noqa: F401
+    finally:
+        profiler.stop()
+        monkeypatch.delitem(sys.modules, "profiled_parent")
+        monkeypatch.delitem(sys.modules, "profiled_child")
+
+    parent_seconds, parent_self = profiler.timings["profiled_parent"]
+    child_seconds, _ = profiler.timings["profiled_child"]
+    assert parent_seconds >= child_seconds
+    assert abs(parent_self - (parent_seconds - child_seconds)) < 1e-6
+    assert profiler.total == parent_seconds
+
+
+def test_cli_modules_skip_ingest_imports():
+    """Test that loading the pull and compaction CLIs does not import nbastatpy"""
+    code = (
+        "import sys\n"
+        "import nba_data_pull.compaction.compact\n"
+        "import nba_data_pull.data_pull.get_data\n"
+        "print('nbastatpy' in sys.modules)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"